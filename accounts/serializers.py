@@ -117,6 +117,7 @@ class PasswordChangeSerializer(serializers.Serializer):
 class UserStatsSerializer(serializers.Serializer):
     total_analyses = serializers.IntegerField()
     completed_analyses = serializers.IntegerField()
+    ingesting_analyses = serializers.IntegerField()
     pending_analyses = serializers.IntegerField()
     processing_analyses = serializers.IntegerField()
     failed_analyses = serializers.IntegerField()
@@ -27,6 +27,7 @@ class ProfileService:
         stats: dict[str, int] = {
             "total_analyses": analyses.count(),
             "completed_analyses": analyses.filter(status="completed").count(),
+            "ingesting_analyses": analyses.filter(status="ingesting").count(),
             "pending_analyses": analyses.filter(status="pending").count(),
             "processing_analyses": analyses.filter(status="processing").count(),
             "failed_analyses": analyses.filter(status="failed").count(),
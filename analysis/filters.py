@@ -1,37 +1,74 @@
+import json
 import logging
+from uuid import UUID
 
 import django_filters
-from django.db.models import Max, Q
-
-from patients.services import patient_service
+from rest_framework import filters
+from django.db import connections
+from django.db.models import Exists, OuterRef, Q
+from django.db.models.expressions import RawSQL
+from rest_framework.exceptions import ValidationError
+
+from larvixon_site.settings import USE_PATIENT_MIRROR
+from patients.services import patient_mirror, patient_service
 from patients.errors import PatientServiceError
-from .models import VideoAnalysis
+from .models import AnalysisResult, VideoAnalysis
+from .pagination import KeysetPagination
+from .services.patient_projection import PatientProjectionService
+from .services.substance_catalog import SubstanceCatalog
 
 logger: logging.Logger = logging.getLogger(__name__)
 
+PATIENT_FILTERS = ("first_name", "last_name", "pesel")
+
+# Above this many GUIDs the set is sent as one array/JSON parameter and
+# joined as a derived table rather than spelled out as ``IN (%s, %s, ...)``.
+GUID_IN_LIST_LIMIT = 500
+
+
+def guid_in(using: str, field: str, guids: list[UUID]) -> Q:
+    """``field`` is one of ``guids``, in the cheapest form the database takes."""
+    vendor = connections[using].vendor
+    if len(guids) <= GUID_IN_LIST_LIMIT or vendor not in ("postgresql", "sqlite"):
+        return Q(**{f"{field}__in": guids})
+    if vendor == "postgresql":
+        values = RawSQL("SELECT unnest(%s::uuid[])", ([str(g) for g in guids],))
+    else:
+        # SQLite stores UUIDField as 32 hex characters.
+        values = RawSQL(
+            "SELECT value FROM json_each(%s)", (json.dumps([g.hex for g in guids]),)
+        )
+    return Q(**{f"{field}__in": values})
+
+
+def has_result(**lookups) -> Exists:
+    """
+    Whether the analysis has a result matching ``lookups``.
+
+    A correlated EXISTS instead of a join, so an analysis with several
+    matching results is still returned once and nothing has to be grouped.
+    """
+    return Exists(AnalysisResult.objects.filter(analysis_id=OuterRef("pk"), **lookups))
+
 
 class VideoAnalysisFilter(django_filters.FilterSet):
     substance_name = django_filters.CharFilter(
-        field_name="analysis_results__substance__name_en",
-        lookup_expr="icontains",
+        method="filter_by_substance_name",
         label="Substance Name (English, partial match)",
     )
 
     substance_name_pl = django_filters.CharFilter(
-        field_name="analysis_results__substance__name_pl",
-        lookup_expr="icontains",
+        method="filter_by_substance_name",
         label="Substance Name (Polish, partial match)",
     )
 
     min_confidence = django_filters.NumberFilter(
-        field_name="analysis_results__confidence_score",
-        lookup_expr="gte",
+        method="filter_by_confidence",
         label="Minimum Confidence Score",
     )
 
     max_confidence = django_filters.NumberFilter(
-        field_name="analysis_results__confidence_score",
-        lookup_expr="lte",
+        method="filter_by_confidence",
         label="Maximum Confidence Score",
     )
 
@@ -45,18 +82,40 @@ class VideoAnalysisFilter(django_filters.FilterSet):
         label="Substance Name (Polish) for Min Score Filter (e.g., kokaina,95.5)",
     )
 
+    top_substance_name = django_filters.CharFilter(
+        method="filter_by_top_substance_name",
+        label="Top Substance Name (English, partial match)",
+    )
+
+    top_substance_name_pl = django_filters.CharFilter(
+        method="filter_by_top_substance_name",
+        label="Top Substance Name (Polish, partial match)",
+    )
+
+    min_top_confidence = django_filters.NumberFilter(
+        field_name="top_confidence",
+        lookup_expr="gte",
+        label="Minimum Top Confidence Score",
+    )
+
+    max_top_confidence = django_filters.NumberFilter(
+        field_name="top_confidence",
+        lookup_expr="lte",
+        label="Maximum Top Confidence Score",
+    )
+
     first_name = django_filters.CharFilter(
-        method="filter_by_patient_first_name",
+        method="collect_patient_filter",
         label="Patient First Name",
     )
 
     last_name = django_filters.CharFilter(
-        method="filter_by_patient_last_name",
+        method="collect_patient_filter",
         label="Patient Last Name",
     )
 
     pesel = django_filters.CharFilter(
-        method="filter_by_patient_pesel",
+        method="collect_patient_filter",
         label="Patient PESEL",
     )
 
@@ -69,8 +128,23 @@ class VideoAnalysisFilter(django_filters.FilterSet):
             "created_at": ["date__gte", "date__lte"],
             "completed_at": ["date__gte", "date__lte"],
             "actual_substance": ["exact", "icontains"],
+            "top_substance": ["exact"],
         }
 
+    def filter_by_substance_name(self, queryset, name, value):
+        field = "name_pl" if name == "substance_name_pl" else "name_en"
+        substance_ids = SubstanceCatalog.search_ids(value, field)
+        return queryset.filter(has_result(substance_id__in=substance_ids))
+
+    def filter_by_confidence(self, queryset, name, value):
+        lookup = "gte" if name == "min_confidence" else "lte"
+        return queryset.filter(has_result(**{f"confidence_score__{lookup}": value}))
+
+    def filter_by_top_substance_name(self, queryset, name, value):
+        field = "name_pl" if name == "top_substance_name_pl" else "name_en"
+        substance_ids = SubstanceCatalog.search_ids(value, field)
+        return queryset.filter(top_substance_id__in=substance_ids)
+
     def filter_by_substance_and_min_score(self, queryset, name, value):
         # example: 'cocaine,95.5'
         try:
@@ -82,17 +156,16 @@ class VideoAnalysisFilter(django_filters.FilterSet):
             )
             return queryset
 
-        annotated_qs = queryset.annotate(
-            max_confidence_for_substance=Max(
-                "analysis_results__confidence_score",
-                filter=Q(
-                    analysis_results__substance__name_en__icontains=substance_name.strip()
+        # "Best score for the substance >= min" is "some result scores >= min".
+        return queryset.filter(
+            has_result(
+                substance_id__in=SubstanceCatalog.search_ids(
+                    substance_name.strip(), "name_en"
                 ),
+                confidence_score__gte=min_score,
             )
         )
 
-        return annotated_qs.filter(max_confidence_for_substance__gte=min_score)
-
     def filter_by_pl_substance_and_min_score(self, queryset, name, value):
         # example: 'kokaina,95.5'
         try:
@@ -104,73 +177,170 @@ class VideoAnalysisFilter(django_filters.FilterSet):
             )
             return queryset
 
-        annotated_qs = queryset.annotate(
-            max_confidence_for_substance=Max(
-                "analysis_results__confidence_score",
-                filter=Q(
-                    analysis_results__substance__name_pl__icontains=substance_name.strip()
+        # "Best score for the substance >= min" is "some result scores >= min".
+        return queryset.filter(
+            has_result(
+                substance_id__in=SubstanceCatalog.search_ids(
+                    substance_name.strip(), "name_pl"
                 ),
+                confidence_score__gte=min_score,
             )
         )
 
-        return annotated_qs.filter(max_confidence_for_substance__gte=min_score)
+    def collect_patient_filter(self, queryset, name, value):
+        # Applied together in filter_queryset, with a single remote search.
+        return queryset
 
-    def filter_by_patient_first_name(self, queryset, name, value):
-        if not value:
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        terms = {name: self.form.cleaned_data.get(name) for name in PATIENT_FILTERS}
+        if not any(terms.values()):
             return queryset
+        return self.filter_by_patient(queryset, **terms)
+
+    def filter_by_patient(self, queryset, **terms):
+        if USE_PATIENT_MIRROR:
+            # Answered by the database as a semi-join on the local mirror.
+            matching = patient_mirror.search_queryset(**terms)
+            return queryset.filter(patient_guid__in=matching.values("guid"))
 
         try:
-            patients = patient_service.search_patients(first_name=value)
+            patients = patient_service.search_patients(**terms)
         except PatientServiceError as e:
-            logger.error(f"Patient service error during first name search: {e}")
+            logger.error(f"Patient service error during patient search: {e}")
             raise
 
-        if not patients:
-            return queryset.none()
-
-        patient_guids = [p["id"] for p in patients if p.get("id")]
+        patient_guids = []
+        for patient in patients:
+            try:
+                patient_guids.append(UUID(str(patient.get("id"))))
+            except ValueError:
+                logger.warning(f"Skipping patient with invalid id: {patient.get('id')}")
 
         if not patient_guids:
             return queryset.none()
 
-        return queryset.filter(patient_guid__in=patient_guids)
+        return queryset.filter(guid_in(queryset.db, "patient_guid", patient_guids))
 
-    def filter_by_patient_last_name(self, queryset, name, value):
-        if not value:
-            return queryset
 
-        try:
-            patients = patient_service.search_patients(last_name=value)
-        except PatientServiceError as e:
-            logger.error(f"Patient service error during last name search: {e}")
-            raise
+class StableOrderingFilter(filters.OrderingFilter):
+    """
+    OrderingFilter that appends ``id`` as a tiebreaker, so rows sharing a
+    value in the requested field keep the same order from page to page.
+    """
 
-        if not patients:
-            return queryset.none()
+    def get_ordering(self, request, queryset, view):
+        ordering = list(super().get_ordering(request, queryset, view) or [])
+        if ordering and ordering[-1].lstrip("-") not in ("id", "pk"):
+            ordering.append("-id" if ordering[0].startswith("-") else "id")
+        return ordering
 
-        patient_guids = [p["id"] for p in patients if p.get("id")]
-
-        if not patient_guids:
-            return queryset.none()
+    def filter_queryset(self, request, queryset, view):
+        ordering = self.get_ordering(request, queryset, view)
+        if not ordering:
+            return queryset
+        queryset = PatientProjectionService.with_patient_attributes(
+            queryset, [field.lstrip("-") for field in ordering]
+        )
+        # NULLs sort last in both directions, as in keyset pagination, so
+        # both pagination modes return the same sequence.
+        return queryset.order_by(
+            *(
+                KeysetPagination.order_term(
+                    queryset, field.lstrip("-"), field.startswith("-")
+                )
+                for field in ordering
+            )
+        )
 
-        return queryset.filter(patient_guid__in=patient_guids)
 
-    def filter_by_patient_pesel(self, queryset, name, value):
-        if not value:
-            return queryset
+class SubstanceConditionFilter(filters.BaseFilterBackend):
+    """
+    Several substance conditions combined in one request, e.g.
 
-        try:
-            patients = patient_service.search_patients(pesel=value)
-        except PatientServiceError as e:
-            logger.error(f"Patient service error during PESEL search: {e}")
-            raise
+        ?substance=cocaine,0.9&substance=morphine,,0.5&substance_match=any
 
-        if not patients:
-            return queryset.none()
+    Each ``substance`` (English name) or ``substance_pl`` (Polish name) value
+    is ``name[,min score[,max score]]`` and matches analyses with a result for
+    a substance whose name contains ``name``, scored within the range.
+    ``substance_match`` is ``all`` (default) or ``any``. Every condition
+    compiles to its own EXISTS, so the whole filter stays one query with no
+    join fan-out and no GROUP BY.
+    """
 
-        patient_guids = [p["id"] for p in patients if p.get("id")]
+    name_params = {"substance": "name_en", "substance_pl": "name_pl"}
+    match_param = "substance_match"
 
-        if not patient_guids:
-            return queryset.none()
+    def parse_condition(self, param: str, value: str) -> Exists:
+        parts = [part.strip() for part in value.split(",")]
+        if not parts[0] or len(parts) > 3:
+            raise ValidationError(
+                {param: [f"Expected name[,min score[,max score]], got '{value}'."]}
+            )
+        min_text, max_text = (parts[1:] + ["", ""])[:2]
+        try:
+            low = float(min_text) if min_text else None
+            high = float(max_text) if max_text else None
+        except ValueError:
+            raise ValidationError({param: [f"Invalid score in '{value}'."]})
+        if low is not None and high is not None and low > high:
+            raise ValidationError({param: [f"Empty score range in '{value}'."]})
+
+        lookups: dict = {
+            "substance_id__in": SubstanceCatalog.search_ids(
+                parts[0], self.name_params[param]
+            )
+        }
+        if low is not None:
+            lookups["confidence_score__gte"] = low
+        if high is not None:
+            lookups["confidence_score__lte"] = high
+        return has_result(**lookups)
+
+    def filter_queryset(self, request, queryset, view):
+        conditions = [
+            self.parse_condition(param, value)
+            for param in self.name_params
+            for value in request.query_params.getlist(param)
+        ]
+        if not conditions:
+            return queryset
 
-        return queryset.filter(patient_guid__in=patient_guids)
+        match = request.query_params.get(self.match_param, "all")
+        if match == "all":
+            return queryset.filter(*conditions)
+        if match == "any":
+            combined = conditions[0]
+            for condition in conditions[1:]:
+                combined = combined | condition
+            return queryset.filter(combined)
+        raise ValidationError({self.match_param: ["Expected 'all' or 'any'."]})
+
+    def get_schema_operation_parameters(self, view):
+        condition = "name[,min score[,max score]]; may be repeated"
+        return [
+            {
+                "name": "substance",
+                "required": False,
+                "in": "query",
+                "description": f"Substance condition (English name): {condition}",
+                "schema": {"type": "array", "items": {"type": "string"}},
+                "explode": True,
+            },
+            {
+                "name": "substance_pl",
+                "required": False,
+                "in": "query",
+                "description": f"Substance condition (Polish name): {condition}",
+                "schema": {"type": "array", "items": {"type": "string"}},
+                "explode": True,
+            },
+            {
+                "name": self.match_param,
+                "required": False,
+                "in": "query",
+                "description": "Whether all (default) or any substance condition "
+                "must match",
+                "schema": {"type": "string", "enum": ["all", "any"]},
+            },
+        ]
@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from analysis.models import VideoAnalysis
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill top_substance/top_confidence from the stored results, in id-ordered "
+        "batches so a large table is never locked at once."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of analyses updated per transaction.",
+        )
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Recompute every analysis, not only those without a top prediction.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        batch_size = options["batch_size"]
+        analyses = VideoAnalysis.objects.filter(status=VideoAnalysis.Status.COMPLETED)
+        if not options["all"]:
+            analyses = analyses.filter(top_substance__isnull=True)
+
+        last_id = 0
+        updated = 0
+        while True:
+            ids = list(
+                analyses.filter(id__gt=last_id)
+                .order_by("id")
+                .values_list("id", flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            last_id = ids[-1]
+            with transaction.atomic():
+                updated += VideoAnalysis.objects.filter(
+                    id__in=ids
+                ).refresh_top_prediction()
+            self.stdout.write(f"Updated {updated} analyses (up to id {last_id})")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Top prediction backfilled for {updated} analyses.")
+        )
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.5 on 2026-10-16 20:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analysis", "0013_change_patient_to_patient_guid"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="videoanalysis",
+            name="video_metadata",
+            field=models.JSONField(
+                blank=True,
+                help_text="Container properties read while ingesting the video",
+                null=True,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="videoanalysis",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("ingesting", "Ingesting"),
+                    ("pending", "Pending"),
+                    ("processing", "Processing"),
+                    ("completed", "Completed"),
+                    ("failed", "Failed"),
+                ],
+                default="pending",
+                max_length=20,
+            ),
+        ),
+    ]
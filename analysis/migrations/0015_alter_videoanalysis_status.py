@@ -0,0 +1,29 @@
+# Generated by Django 5.2.5 on 2026-10-16 20:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analysis", "0014_videoanalysis_ingest"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="videoanalysis",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("uploading", "Uploading"),
+                    ("ingesting", "Ingesting"),
+                    ("pending", "Pending"),
+                    ("processing", "Processing"),
+                    ("completed", "Completed"),
+                    ("failed", "Failed"),
+                ],
+                default="pending",
+                max_length=20,
+            ),
+        ),
+    ]
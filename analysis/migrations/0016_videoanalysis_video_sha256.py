@@ -0,0 +1,31 @@
+# Generated by Django 5.2.5 on 2026-10-16 21:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analysis", "0015_alter_videoanalysis_status"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="videoanalysis",
+            name="video_sha256",
+            field=models.CharField(
+                blank=True,
+                help_text="SHA-256 of the video content, used to detect re-uploads",
+                max_length=64,
+                null=True,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="videoanalysis",
+            index=models.Index(
+                fields=["user", "video_sha256"], name="analysis_user_sha256_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.5 on 2026-10-16 22:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analysis", "0016_videoanalysis_video_sha256"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="videoanalysis",
+            name="heartbeat_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="Last sign of life from the worker processing the analysis",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="videoanalysis",
+            name="processing_attempts",
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="videoanalysis",
+            name="started_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="When the current processing run started",
+                null=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.5 on 2026-10-16 22:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analysis", "0017_videoanalysis_processing_heartbeat"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="videoanalysis",
+            name="video_expired_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="When the video was removed after VIDEO_LIFETIME_DAYS",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="videoanalysis",
+            name="video_reclaimed_bytes",
+            field=models.BigIntegerField(
+                blank=True,
+                help_text="Storage freed when the expired video was removed",
+                null=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.5 on 2026-10-16 22:50
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analysis", "0018_videoanalysis_video_expiry"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="videoanalysis",
+            index=models.Index(
+                fields=["user", "-created_at", "-id"],
+                name="analysis_user_created_id_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.5 on 2026-10-16 22:55
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analysis", "0019_videoanalysis_user_created_id_idx"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="analysisresult",
+            index=models.Index(
+                fields=["substance", "confidence_score"],
+                name="result_substance_score_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="videoanalysis",
+            index=models.Index(
+                fields=["user", "status", "-created_at"],
+                name="analysis_user_status_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="videoanalysis",
+            index=models.Index(
+                condition=models.Q(
+                    ("status__in", ["uploading", "ingesting", "pending", "processing"])
+                ),
+                fields=["status", "heartbeat_at"],
+                name="analysis_active_status_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.5 on 2026-10-16 23:03
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analysis", "0020_analysis_query_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="videoanalysis",
+            name="top_confidence",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="videoanalysis",
+            name="top_substance",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="analysis.substance",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="videoanalysis",
+            index=models.Index(
+                fields=["user", "top_substance", "-top_confidence"],
+                name="analysis_user_top_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="videoanalysis",
+            index=models.Index(
+                fields=["user", "-top_confidence"], name="analysis_user_top_conf_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.5 on 2026-10-17 00:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analysis", "0021_videoanalysis_top_prediction"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="videoanalysis",
+            name="requeue_count",
+            field=models.PositiveSmallIntegerField(
+                default=0, help_text="Times the reaper resent a task that was lost"
+            ),
+        ),
+        migrations.AddField(
+            model_name="videoanalysis",
+            name="task_id",
+            field=models.CharField(
+                blank=True,
+                default="",
+                help_text="Celery id of the last ingest or processing task sent",
+                max_length=36,
+            ),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.5 on 2026-10-17 00:55
+
+import analysis.models
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analysis", "0022_videoanalysis_task_dispatch"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="videoanalysis",
+            name="analysis_user_top_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="videoanalysis",
+            name="analysis_user_top_conf_idx",
+        ),
+        migrations.AddIndex(
+            model_name="videoanalysis",
+            index=analysis.models.NullsLastIndex(
+                models.F("user"),
+                models.F("top_substance"),
+                models.OrderBy(
+                    models.F("top_confidence"), descending=True, nulls_last=True
+                ),
+                models.OrderBy(models.F("id"), descending=True),
+                name="analysis_user_top_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="videoanalysis",
+            index=analysis.models.NullsLastIndex(
+                models.F("user"),
+                models.OrderBy(
+                    models.F("top_confidence"), descending=True, nulls_last=True
+                ),
+                models.OrderBy(models.F("id"), descending=True),
+                name="analysis_user_top_conf_idx",
+            ),
+        ),
+    ]
@@ -1,21 +1,125 @@
 from django.core.validators import FileExtensionValidator
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Iterable
 from django.db import models
 from accounts.models import User
 from accounts.utils import user_thumbnail_upload_to, user_video_upload_to
 
 
+class NullsLastIndex(models.Index):
+    """
+    Index with ``desc(nulls_last=True)`` columns, matching how lists sort
+    nullable fields. SQLite cannot index NULLS LAST, but it already sorts
+    NULLs last when descending, so there the columns are plain DESC.
+    """
+
+    def create_sql(self, model, schema_editor, using="", **kwargs):
+        index = self
+        if schema_editor.connection.vendor == "sqlite":
+            index = self.clone()
+            index.expressions = tuple(
+                (
+                    models.OrderBy(expression.expression, descending=True)
+                    if isinstance(expression, models.OrderBy) and expression.descending
+                    else expression
+                )
+                for expression in self.expressions
+            )
+        return super(NullsLastIndex, index).create_sql(
+            model, schema_editor, using=using, **kwargs
+        )
+
+
+class VideoAnalysisQuerySet(models.QuerySet):
+    def transition(
+        self, source: str | Iterable[str], target: str, **fields: Any
+    ) -> int:
+        """
+        Move rows from any of the ``source`` statuses to ``target`` in one UPDATE.
+
+        Only rows still in a source status are written, so a concurrent writer
+        that already moved a row on cannot be overwritten, and only the status
+        bookkeeping columns in STATUS_UPDATE_FIELDS may be set alongside it.
+        Returns the number of rows that changed.
+        """
+        unexpected = set(fields) - VideoAnalysis.STATUS_UPDATE_FIELDS
+        if unexpected:
+            # Status writes must never clobber columns the user edits.
+            raise ValueError(f"Not a status column: {', '.join(sorted(unexpected))}")
+        sources = [source] if isinstance(source, str) else list(source)
+        for status in sources:
+            if target not in VideoAnalysis.TRANSITIONS[status]:
+                raise ValueError(f"Invalid status transition {status} -> {target}")
+        return self.filter(status__in=sources).update(status=target, **fields)
+
+    def refresh_top_prediction(self) -> int:
+        """
+        Recompute ``top_substance``/``top_confidence`` from the stored results.
+
+        One UPDATE with correlated subqueries, so it is safe to run inside the
+        transaction that wrote or removed the results. Rows without results
+        get NULLs. Returns the number of rows written.
+        """
+        top = AnalysisResult.objects.filter(analysis=models.OuterRef("pk")).order_by(
+            "-confidence_score", "substance_id"
+        )
+        return self.update(
+            top_substance=models.Subquery(top.values("substance_id")[:1]),
+            top_confidence=models.Subquery(top.values("confidence_score")[:1]),
+        )
+
+
 class VideoAnalysis(models.Model):
     """
     Model to track user's video analysis history.
     """
 
     class Status(models.TextChoices):
+        UPLOADING = "uploading", "Uploading"
+        INGESTING = "ingesting", "Ingesting"
         PENDING = "pending", "Pending"
         PROCESSING = "processing", "Processing"
         COMPLETED = "completed", "Completed"
         FAILED = "failed", "Failed"
 
+    # PROCESSING -> PROCESSING lets a redelivered task take over a run whose
+    # worker died; PROCESSING -> PENDING is the stuck-job reaper requeueing it.
+    TRANSITIONS: dict[str, set[str]] = {
+        Status.UPLOADING: {Status.INGESTING, Status.FAILED},
+        Status.INGESTING: {Status.PENDING, Status.COMPLETED, Status.FAILED},
+        Status.PENDING: {Status.PROCESSING, Status.FAILED},
+        Status.PROCESSING: {
+            Status.PROCESSING,
+            Status.PENDING,
+            Status.COMPLETED,
+            Status.FAILED,
+        },
+        Status.COMPLETED: set(),
+        Status.FAILED: {Status.PENDING},
+    }
+
+    # Columns owned by the worker; everything else may be edited by the user
+    # at any time and is never part of a status update.
+    STATUS_UPDATE_FIELDS = frozenset(
+        {
+            "error_message",
+            "started_at",
+            "heartbeat_at",
+            "processing_attempts",
+            "task_id",
+            "requeue_count",
+            "completed_at",
+            "top_substance",
+            "top_confidence",
+            # Written once by ingest, or copied from a duplicate upload.
+            "video",
+            "thumbnail",
+            "video_metadata",
+            "video_sha256",
+        }
+    )
+
+    objects = VideoAnalysisQuerySet.as_manager()
+
     id: models.BigAutoField = models.BigAutoField(primary_key=True)
     description: models.TextField = models.TextField(blank=True, default="")
 
@@ -43,10 +147,51 @@ class VideoAnalysis(models.Model):
         choices=Status.choices,
         default=Status.PENDING,
     )
+    video_sha256: models.CharField = models.CharField(
+        max_length=64,
+        blank=True,
+        null=True,
+        help_text="SHA-256 of the video content, used to detect re-uploads",
+    )
+    video_expired_at: models.DateTimeField = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When the video was removed after VIDEO_LIFETIME_DAYS",
+    )
+    video_reclaimed_bytes: models.BigIntegerField = models.BigIntegerField(
+        null=True,
+        blank=True,
+        help_text="Storage freed when the expired video was removed",
+    )
+    video_metadata: models.JSONField = models.JSONField(
+        blank=True,
+        null=True,
+        help_text="Container properties read while ingesting the video",
+    )
     error_message: models.TextField = models.TextField(
         blank=True, null=True, help_text="Error details when analysis fails"
     )
     created_at: models.DateTimeField = models.DateTimeField(auto_now_add=True)
+    started_at: models.DateTimeField = models.DateTimeField(
+        null=True, blank=True, help_text="When the current processing run started"
+    )
+    heartbeat_at: models.DateTimeField = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Last sign of life from the worker processing the analysis",
+    )
+    processing_attempts: models.PositiveSmallIntegerField = (
+        models.PositiveSmallIntegerField(default=0)
+    )
+    task_id: models.CharField = models.CharField(
+        max_length=36,
+        blank=True,
+        default="",
+        help_text="Celery id of the last ingest or processing task sent",
+    )
+    requeue_count: models.PositiveSmallIntegerField = models.PositiveSmallIntegerField(
+        default=0, help_text="Times the reaper resent a task that was lost"
+    )
     completed_at: models.DateTimeField = models.DateTimeField(null=True, blank=True)
 
     actual_substance: models.CharField = models.CharField(
@@ -54,19 +199,113 @@ class VideoAnalysis(models.Model):
     )
     user_feedback: models.TextField = models.TextField(blank=True)
 
+    # Copy of the highest-confidence result, kept in step with the results by
+    # refresh_top_prediction so lists can filter and sort without a join.
+    top_substance: models.ForeignKey["Substance | None", "Substance | None"] = (
+        models.ForeignKey(
+            "Substance",
+            on_delete=models.SET_NULL,
+            null=True,
+            blank=True,
+            related_name="+",
+        )
+    )
+    top_confidence: models.FloatField = models.FloatField(null=True, blank=True)
+
     if TYPE_CHECKING:
         analysis_results: Any
 
+    def transition_to(
+        self, target: str, expected: str | Iterable[str], **fields: Any
+    ) -> bool:
+        """
+        Move this analysis from an ``expected`` status to ``target``.
+
+        Issues a single conditional UPDATE of the status columns and returns
+        whether it applied. On success the instance is updated to match; on
+        failure it is left as it was and the caller should re-read the row.
+        """
+        applied = bool(
+            VideoAnalysis.objects.filter(pk=self.pk).transition(
+                expected, target, **fields
+            )
+        )
+        if applied:
+            self.status = target
+            expressions = []
+            for name, value in fields.items():
+                if hasattr(value, "resolve_expression"):
+                    expressions.append(name)
+                else:
+                    setattr(self, name, value)
+            if expressions:
+                self.refresh_from_db(fields=expressions)
+        return applied
+
+    def _is_file_shared(self, field_name: str, name: str) -> bool:
+        """Whether another analysis reuses this stored file after deduplication."""
+        return (
+            VideoAnalysis.objects.filter(**{field_name: name})
+            .exclude(pk=self.pk)
+            .exists()
+        )
+
     def delete(self, *args, **kwargs):
-        if self.video and self.video.name:
+        if (
+            self.video
+            and self.video.name
+            and not self._is_file_shared("video", self.video.name)
+        ):
             self.video.delete(save=False)
-        if self.thumbnail and self.thumbnail.name:
+        if (
+            self.thumbnail
+            and self.thumbnail.name
+            and not self._is_file_shared("thumbnail", self.thumbnail.name)
+        ):
             self.thumbnail.delete(save=False)
 
         return super().delete(*args, **kwargs)
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["user", "video_sha256"], name="analysis_user_sha256_idx"
+            ),
+            # Serves the default history ordering and its keyset pagination.
+            models.Index(
+                fields=["user", "-created_at", "-id"],
+                name="analysis_user_created_id_idx",
+            ),
+            # Filtering and sorting on the top prediction. Lists sort NULLs
+            # last, so the index does too.
+            NullsLastIndex(
+                models.F("user"),
+                models.F("top_substance"),
+                models.F("top_confidence").desc(nulls_last=True),
+                models.F("id").desc(),
+                name="analysis_user_top_idx",
+            ),
+            NullsLastIndex(
+                models.F("user"),
+                models.F("top_confidence").desc(nulls_last=True),
+                models.F("id").desc(),
+                name="analysis_user_top_conf_idx",
+            ),
+            # History filtered by status, newest first.
+            models.Index(
+                fields=["user", "status", "-created_at"],
+                name="analysis_user_status_idx",
+            ),
+            # Only the few unfinished analyses, for the stuck-job reaper.
+            models.Index(
+                fields=["status", "heartbeat_at"],
+                name="analysis_active_status_idx",
+                condition=models.Q(
+                    status__in=["uploading", "ingesting", "pending", "processing"]
+                ),
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.id} - {self.created_at} - {self.patient_guid or 'None'}"
@@ -104,6 +343,13 @@ class AnalysisResult(models.Model):
 
     class Meta:
         unique_together = ("analysis", "substance")
+        indexes = [
+            # Substance filters with a confidence range.
+            models.Index(
+                fields=["substance", "confidence_score"],
+                name="result_substance_score_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return (
@@ -0,0 +1,203 @@
+import base64
+import json
+import operator
+from datetime import date, time
+from functools import reduce
+from typing import Any
+
+from django.db.models import F, Field, Q, QuerySet
+from django.db.models.expressions import OrderBy
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from larvixon_site.settings import DEFAULT_PAGE_SIZE
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over the queryset's ordering, with ``id`` as the last
+    tiebreaker.
+
+    Each page is a range scan that starts right after the last row of the
+    previous one, so deep pages cost the same as the first and no COUNT(*) is
+    needed. The cursor holds the last row's value for every ordering field and
+    is opaque to clients. NULLs of nullable fields and annotations sort last
+    in both directions, in page-number mode too (see ``order_term``).
+    """
+
+    cursor_query_param = "cursor"
+    page_size = DEFAULT_PAGE_SIZE
+    invalid_cursor_message = "Invalid cursor"
+
+    def get_ordering(self, queryset: QuerySet) -> list[tuple[str, bool]]:
+        """The ordering as ``(field, descending)`` pairs, ending with ``id``."""
+        keys: list[tuple[str, bool]] = []
+        ordering = list(queryset.query.order_by) or list(queryset.model._meta.ordering)
+        for term in ordering:
+            if isinstance(term, OrderBy) and isinstance(term.expression, F):
+                field, descending = term.expression.name, term.descending
+            else:
+                field, descending = str(term).lstrip("-"), str(term).startswith("-")
+            field = "id" if field == "pk" else field
+            keys.append((field, descending))
+            if field == "id":
+                return keys
+        keys.append(("id", keys[0][1] if keys else True))
+        return keys
+
+    @staticmethod
+    def get_field(queryset: QuerySet, name: str) -> Field:
+        """The model field or annotation the page is ordered by."""
+        if name in queryset.query.annotations:
+            return queryset.query.annotations[name].output_field
+        return queryset.model._meta.get_field(name)
+
+    @classmethod
+    def is_nullable(cls, queryset: QuerySet, field: str) -> bool:
+        # Annotations such as patient attributes may be NULL whatever their
+        # output field says.
+        return (
+            field in queryset.query.annotations or cls.get_field(queryset, field).null
+        )
+
+    @classmethod
+    def order_term(
+        cls, queryset: QuerySet, field: str, descending: bool
+    ) -> str | OrderBy:
+        """``field`` as an ordering term, with NULLs last if it can hold any."""
+        if not cls.is_nullable(queryset, field):
+            return f"-{field}" if descending else field
+        if descending:
+            return F(field).desc(nulls_last=True)
+        return F(field).asc(nulls_last=True)
+
+    @staticmethod
+    def describe(keys: list[tuple[str, bool]]) -> list[str]:
+        return [f"{'-' if descending else ''}{field}" for field, descending in keys]
+
+    def encode_cursor(self, keys: list[tuple[str, bool]], row: Any) -> str:
+        values = []
+        for field, _ in keys:
+            value = getattr(row, field)
+            if isinstance(value, (date, time)):
+                value = value.isoformat()
+            elif value is not None and not isinstance(value, (int, float, str)):
+                value = str(value)
+            values.append(value)
+        payload = {"o": self.describe(keys), "v": values}
+        return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+    def decode_cursor(
+        self, queryset: QuerySet, keys: list[tuple[str, bool]]
+    ) -> list[Any] | None:
+        encoded = self.request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            if payload["o"] != self.describe(keys):
+                raise ValueError("cursor was issued for another ordering")
+            if len(payload["v"]) != len(keys):
+                raise ValueError("cursor does not match the ordering")
+            return [
+                (
+                    value
+                    if value is None
+                    else self.get_field(queryset, field).to_python(value)
+                )
+                for (field, _), value in zip(keys, payload["v"])
+            ]
+        except (TypeError, ValueError, KeyError, json.JSONDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    @classmethod
+    def after(
+        cls, queryset: QuerySet, keys: list[tuple[str, bool]], values: list[Any]
+    ) -> Q:
+        """
+        Rows that come after ``values`` in the page ordering: for some field,
+        equal on every earlier one and past this one, where NULLs are past
+        every value.
+        """
+        branches = []
+        same = Q()
+        for (field, descending), value in zip(keys, values):
+            if value is not None:
+                past = Q(**{f"{field}__{'lt' if descending else 'gt'}": value})
+                if cls.is_nullable(queryset, field):
+                    past |= Q(**{f"{field}__isnull": True})
+                branches.append(same & past)
+            # Nothing sorts past a NULL, so a NULL only narrows the ties.
+            same &= Q(
+                **({field: value} if value is not None else {f"{field}__isnull": True})
+            )
+        if not branches:
+            return Q(pk__in=[])
+        condition = reduce(operator.or_, branches)
+
+        field, descending = keys[0]
+        if values[0] is not None and not cls.is_nullable(queryset, field):
+            # A plain bound on the leading field lets the database seek into
+            # its index and check the tiebreak only on the rows it reads.
+            bound = Q(**{f"{field}__{'lte' if descending else 'gte'}": values[0]})
+            condition = bound & condition
+        return condition
+
+    def get_page_queryset(self, queryset: QuerySet, request) -> QuerySet:
+        """The query for the requested page, with one look-ahead row."""
+        self.request = request
+        keys = self.get_ordering(queryset)
+        queryset = queryset.order_by(
+            *(self.order_term(queryset, field, desc) for field, desc in keys)
+        )
+
+        values = self.decode_cursor(queryset, keys)
+        if values is not None:
+            queryset = queryset.filter(self.after(queryset, keys, values))
+        return queryset[: self.page_size + 1]
+
+    def paginate_queryset(self, queryset, request, view=None):
+        rows = list(self.get_page_queryset(queryset, request))
+        self.has_next = len(rows) > self.page_size
+        page = rows[: self.page_size]
+        self.next_cursor = (
+            self.encode_cursor(self.get_ordering(queryset), page[-1])
+            if self.has_next
+            else None
+        )
+        return page
+
+    def get_next_link(self) -> str | None:
+        if self.next_cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+
+class AnalysisPagination(PageNumberPagination):
+    """
+    Page-number pagination, or keyset pagination when the request asks for it
+    with ``?pagination=cursor`` or carries a ``cursor`` from a previous page.
+    """
+
+    mode_query_param = "pagination"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset: KeysetPagination | None = None
+        if (
+            request.query_params.get(self.mode_query_param) == "cursor"
+            or KeysetPagination.cursor_query_param in request.query_params
+        ):
+            self.keyset = KeysetPagination()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -3,6 +3,7 @@ from rest_framework import serializers
 from drf_spectacular.utils import extend_schema_field
 from drf_spectacular.types import OpenApiTypes
 from .models import Substance, VideoAnalysis, AnalysisResult
+from .services.substance_catalog import SubstanceCatalog
 
 
 class SubstanceSerializer(serializers.ModelSerializer):
@@ -13,13 +14,20 @@ class SubstanceSerializer(serializers.ModelSerializer):
 
 
 class AnalysisResultSerializer(serializers.ModelSerializer):
-    substance = SubstanceSerializer(read_only=True)
+    substance = serializers.SerializerMethodField()
 
     class Meta:  # type: ignore[misc]
         model = AnalysisResult
         fields = ("id", "substance", "confidence_score", "detected_at")
         read_only_fields = ("id", "substance", "confidence_score", "detected_at")
 
+    @extend_schema_field(SubstanceSerializer)
+    def get_substance(self, obj):
+        entry = SubstanceCatalog.get(obj.substance_id)
+        if entry is None:
+            return None
+        return entry.as_dict()
+
 
 class VideoAnalysisSerializer(serializers.ModelSerializer):
     """
@@ -34,6 +42,8 @@ class VideoAnalysisSerializer(serializers.ModelSerializer):
 
     patient_details = serializers.SerializerMethodField()
 
+    top_substance = serializers.SerializerMethodField()
+
     patient_guid = serializers.UUIDField(
         required=False,
         allow_null=True,
@@ -53,19 +63,27 @@ class VideoAnalysisSerializer(serializers.ModelSerializer):
             "video_name",
             "video",
             "thumbnail",
+            "video_metadata",
             "created_at",
+            "started_at",
             "completed_at",
             "analysis_results",
+            "top_substance",
+            "top_confidence",
             "actual_substance",
             "user_feedback",
         )
         read_only_fields = (
             "id",
             "user",
+            "status",
             "created_at",
+            "started_at",
             "completed_at",
             "analysis_results",
+            "top_confidence",
             "error_message",
+            "video_metadata",
         )
 
     @extend_schema_field(OpenApiTypes.STR)
@@ -74,6 +92,15 @@ class VideoAnalysisSerializer(serializers.ModelSerializer):
             return None
         return obj.video.name.split("/")[-1]
 
+    @extend_schema_field(SubstanceSerializer)
+    def get_top_substance(self, obj):
+        if obj.top_substance_id is None:
+            return None
+        entry = SubstanceCatalog.get(obj.top_substance_id)
+        if entry is None:
+            return None
+        return entry.as_dict()
+
     @extend_schema_field(OpenApiTypes.OBJECT)
     def get_patient_details(self, obj):
         if not obj.patient_guid:
@@ -83,6 +110,17 @@ class VideoAnalysisSerializer(serializers.ModelSerializer):
         return patient_details_map.get(str(obj.patient_guid))
 
 
+class PatientGroupSerializer(serializers.Serializer):
+    """Analyses of one patient, as listed with ``group_by=patient``."""
+
+    patient_guid = serializers.UUIDField(allow_null=True)
+    patient_first_name = serializers.CharField(allow_null=True)
+    patient_last_name = serializers.CharField(allow_null=True)
+    patient_birth_date = serializers.DateField(allow_null=True)
+    analysis_count = serializers.IntegerField()
+    last_analysis_at = serializers.DateTimeField()
+
+
 class VideoAnalysisIdSerializer(serializers.ModelSerializer):
     class Meta:  # type: ignore[misc]
         model = VideoAnalysis
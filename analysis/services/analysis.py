@@ -1,24 +1,47 @@
 import logging
 from datetime import timedelta
 
+from django.db import transaction
+from django.db.models import Prefetch, QuerySet
 from django.utils import timezone
 
-from larvixon_site.settings import VIDEO_LIFETIME_DAYS
+from larvixon_site.settings import USE_PATIENT_MIRROR, VIDEO_LIFETIME_DAYS
 from accounts.models import User
-from analysis.models import VideoAnalysis
+from analysis.models import AnalysisResult, VideoAnalysis
 from analysis.errors import (
     AnalysisNotFoundError,
     AnalysisNotFailedError,
     AnalysisTooOldError,
     AnalysisVideoNotFoundError,
 )
-from patients.services import patient_service
+from patients.services import patient_mirror, patient_service
+from patients.services.base_patient_service import BasePatientService
+from videoprocessor.services.task_dispatch import TaskDispatch
 from videoprocessor.tasks import process_video_task
 
 logger: logging.Logger = logging.getLogger(__name__)
 
 
 class AnalysisService:
+    @staticmethod
+    def get_user_analyses(user) -> QuerySet[VideoAnalysis]:
+        """
+        Analyses of ``user`` with everything VideoAnalysisSerializer renders
+        loaded up front, so a page costs the same number of queries for any
+        number of rows and results. Substances are not joined; the serializers
+        read them from the SubstanceCatalog.
+        """
+        return (
+            VideoAnalysis.objects.filter(user=user)
+            .select_related("user")
+            .prefetch_related(
+                Prefetch(
+                    "analysis_results",
+                    queryset=AnalysisResult.objects.order_by("-confidence_score"),
+                )
+            )
+        )
+
     @staticmethod
     def get_user_analysis(pk: int, user) -> VideoAnalysis:
         try:
@@ -27,6 +50,11 @@ class AnalysisService:
             logger.info(f"Analysis {pk} not found for user {user.id}")
             raise AnalysisNotFoundError()
 
+    @staticmethod
+    def get_patient_directory() -> BasePatientService:
+        """Where list and detail views read patient details from."""
+        return patient_mirror if USE_PATIENT_MIRROR else patient_service
+
     @staticmethod
     def get_patients_details_map(analyses: list[VideoAnalysis]) -> dict:
         patient_guids: list[str] = [
@@ -37,7 +65,9 @@ class AnalysisService:
             return {}
 
         try:
-            return patient_service.get_patients_by_guids(patient_guids)
+            return AnalysisService.get_patient_directory().get_patients_by_guids(
+                patient_guids
+            )
         except Exception:
             logger.error(
                 "Failed to fetch patient details for analyses",
@@ -51,8 +81,10 @@ class AnalysisService:
             return {}
 
         try:
-            patient_details = patient_service.get_patient_by_guid(
-                str(analysis.patient_guid)
+            patient_details = (
+                AnalysisService.get_patient_directory().get_patient_by_guid(
+                    str(analysis.patient_guid)
+                )
             )
             if patient_details:
                 return {str(analysis.patient_guid): patient_details}
@@ -72,7 +104,7 @@ class AnalysisService:
 
         AnalysisService._reset_analysis_for_retry(analysis)
 
-        process_video_task.delay(analysis.id)
+        TaskDispatch.send(process_video_task, analysis.id)
 
         return analysis
 
@@ -90,9 +122,22 @@ class AnalysisService:
 
     @staticmethod
     def _reset_analysis_for_retry(analysis: VideoAnalysis) -> None:
-        analysis.analysis_results.all().delete()
-        analysis.status = VideoAnalysis.Status.PENDING
-        analysis.error_message = None
-        analysis.completed_at = None
-        analysis.save()
+        # Guarded on FAILED, so of two concurrent retries only one gets through.
+        with transaction.atomic():
+            if not analysis.transition_to(
+                VideoAnalysis.Status.PENDING,
+                VideoAnalysis.Status.FAILED,
+                error_message=None,
+                started_at=None,
+                heartbeat_at=timezone.now(),
+                completed_at=None,
+                # A retry gets the full attempt budget back; otherwise the
+                # reaper fails it on its first stall.
+                processing_attempts=0,
+                requeue_count=0,
+                top_substance=None,
+                top_confidence=None,
+            ):
+                raise AnalysisNotFailedError()
+            analysis.analysis_results.all().delete()
         logger.info(f"Analysis {analysis.id} reset for retry")
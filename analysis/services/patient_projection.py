@@ -0,0 +1,138 @@
+import logging
+from datetime import datetime, timedelta
+from typing import Iterable
+
+from django.db import transaction
+from django.db.models import Count, Exists, F, Max, OuterRef, QuerySet, Subquery
+from django.utils import timezone
+
+from analysis.models import VideoAnalysis
+from larvixon_site.settings import (
+    PATIENT_PROJECTION_BATCH_SIZE,
+    PATIENT_PROJECTION_MAX_AGE_SECONDS,
+)
+from patients.models import PatientRecord
+from patients.services import patient_mirror, patient_service
+from patients.services.api_patient_service import APIPatientService
+from patients.services.base_patient_service import BasePatientService
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# Annotation name -> PatientRecord column, as exposed for ordering.
+PATIENT_ATTRIBUTES = {
+    "patient_last_name": "last_name",
+    "patient_first_name": "first_name",
+    "patient_birth_date": "birth_date",
+}
+
+
+class PatientProjectionService:
+    """
+    Patient attributes of analyses, read from the local PatientRecord table
+    so the database can sort and group analyses by patient.
+
+    ``refresh`` keeps the rows of patients referenced by analyses current,
+    fetching them from the patient service in bulk batches. Analyses whose
+    patient is not in the table yet sort after all others.
+    """
+
+    @staticmethod
+    def with_patient_attributes(
+        queryset: QuerySet[VideoAnalysis], names: Iterable[str] | None = None
+    ) -> QuerySet:
+        """
+        Annotate the patient attributes in ``names`` (all by default); other
+        names are ignored. Each one is a correlated subquery, so only the
+        ones a query orders or groups by should be added.
+        """
+        records = PatientRecord.objects.filter(guid=OuterRef("patient_guid"))
+        wanted = PATIENT_ATTRIBUTES if names is None else set(names)
+        return queryset.annotate(
+            **{
+                name: Subquery(records.values(column)[:1])
+                for name, column in PATIENT_ATTRIBUTES.items()
+                if name in wanted and name not in queryset.query.annotations
+            }
+        )
+
+    @staticmethod
+    def group_by_patient(queryset: QuerySet[VideoAnalysis]) -> QuerySet:
+        """One row per patient of ``queryset``, ordered by patient name."""
+        return (
+            PatientProjectionService.with_patient_attributes(
+                queryset.order_by().prefetch_related(None).select_related(None)
+            )
+            .values("patient_guid", *PATIENT_ATTRIBUTES)
+            .annotate(
+                analysis_count=Count("id"),
+                last_analysis_at=Max("created_at"),
+            )
+            .order_by(
+                F("patient_last_name").asc(nulls_last=True),
+                F("patient_first_name").asc(nulls_last=True),
+                F("patient_guid").asc(nulls_last=True),
+            )
+        )
+
+    @staticmethod
+    def stale_guids(now: datetime | None = None) -> QuerySet:
+        """Patients of analyses that are missing from the table or outdated."""
+        cutoff = (now or timezone.now()) - timedelta(
+            seconds=PATIENT_PROJECTION_MAX_AGE_SECONDS
+        )
+        fresh = PatientRecord.objects.filter(
+            guid=OuterRef("patient_guid"), synced_at__gte=cutoff
+        )
+        return (
+            VideoAnalysis.objects.filter(patient_guid__isnull=False)
+            .filter(~Exists(fresh))
+            .values_list("patient_guid", flat=True)
+            .order_by("patient_guid")
+            .distinct()
+        )
+
+    @staticmethod
+    def refresh(
+        source: BasePatientService | None = None,
+        batch_size: int = PATIENT_PROJECTION_BATCH_SIZE,
+    ) -> dict[str, int]:
+        """Refetch stale patients, one bulk lookup and upsert per batch."""
+        source = source or patient_service
+        # The cached lookup may answer with data up to the cache's hard TTL
+        # old, which would then be stored as freshly synced.
+        fetch = (
+            source.refresh_patients
+            if isinstance(source, APIPatientService)
+            else source.get_patients_by_guids
+        )
+        stats = {"batches": 0, "patients": 0, "missing": 0}
+
+        # Keyset over GUIDs, so patients the service does not know are not
+        # asked for again in the same run.
+        last_guid = None
+        while True:
+            guids = PatientProjectionService.stale_guids()
+            if last_guid is not None:
+                guids = guids.filter(patient_guid__gt=last_guid)
+            batch = list(guids[:batch_size])
+            if not batch:
+                break
+            last_guid = batch[-1]
+
+            patients = fetch([str(g) for g in batch])
+            records = [
+                record
+                for record in map(patient_mirror.to_record, patients.values())
+                if record is not None
+            ]
+            with transaction.atomic():
+                patient_mirror.upsert(records, with_source_updated_at=False)
+            stats["batches"] += 1
+            stats["patients"] += len(records)
+            stats["missing"] += len(batch) - len(records)
+
+        logger.info(
+            f"Refreshed {stats['patients']} patients in {stats['batches']} batches, "
+            f"{stats['missing']} not found"
+        )
+        return stats
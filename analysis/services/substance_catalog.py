@@ -0,0 +1,150 @@
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass
+
+from django.core.cache import cache
+from django.db import connection
+
+from analysis.models import Substance
+from larvixon_site.settings import SUBSTANCE_CATALOG_CHECK_SECONDS
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+VERSION_KEY = "substance_catalog:version"
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    id: int
+    name_en: str
+    name_pl: str | None
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+class SubstanceCatalog:
+    """
+    Process-wide, read-mostly copy of the ``Substance`` table.
+
+    Every process keeps its own snapshot and compares it with a version stamp
+    in the shared cache at most every SUBSTANCE_CATALOG_CHECK_SECONDS. Saving
+    or deleting a substance bumps the stamp once the transaction commits, so
+    other processes reload without a restart. Writes that bypass model
+    signals (``update()``, ``bulk_create()``) must call ``bump`` themselves.
+
+    The snapshot is never loaded inside an atomic block, where it could pick
+    up rows that are later rolled back; lookups then go to the database.
+    """
+
+    _lock = threading.Lock()
+    _version: int | None = None
+    _checked_at: float = 0.0
+    _by_id: dict[int, CatalogEntry] = {}
+    _by_name: dict[str, CatalogEntry] = {}
+
+    @staticmethod
+    def _entry(substance: Substance) -> CatalogEntry:
+        return CatalogEntry(
+            id=substance.id, name_en=substance.name_en, name_pl=substance.name_pl
+        )
+
+    @staticmethod
+    def current_version() -> int:
+        return int(cache.get_or_set(VERSION_KEY, 0, timeout=None) or 0)
+
+    @classmethod
+    def _snapshot(cls) -> dict[int, CatalogEntry] | None:
+        now = time.monotonic()
+        if (
+            cls._version is not None
+            and now - cls._checked_at < SUBSTANCE_CATALOG_CHECK_SECONDS
+        ):
+            return cls._by_id
+
+        try:
+            version = cls.current_version()
+        except Exception as e:
+            logger.warning(f"Substance catalog version unavailable: {e}")
+            return None
+
+        with cls._lock:
+            if version == cls._version:
+                cls._checked_at = now
+                return cls._by_id
+
+            if connection.in_atomic_block:
+                return None
+
+            entries = [cls._entry(s) for s in Substance.objects.all()]
+            cls._by_id = {entry.id: entry for entry in entries}
+            cls._by_name = {entry.name_en: entry for entry in entries}
+            cls._version = version
+            cls._checked_at = now
+            logger.debug(
+                f"Loaded {len(entries)} substances into catalog version {version}"
+            )
+            return cls._by_id
+
+    @classmethod
+    def get(cls, substance_id: int) -> CatalogEntry | None:
+        by_id = cls._snapshot()
+        if by_id is not None:
+            entry = by_id.get(substance_id)
+            if entry is not None:
+                return entry
+
+        substance = Substance.objects.filter(id=substance_id).first()
+        return cls._entry(substance) if substance else None
+
+    @classmethod
+    def ids_for_names(cls, names: list[str]) -> dict[str, int]:
+        """Ids of the substances with the given English names that exist."""
+        if cls._snapshot() is not None:
+            found = {
+                name: cls._by_name[name].id for name in names if name in cls._by_name
+            }
+            if len(found) == len(set(names)):
+                return found
+
+        return dict(
+            Substance.objects.filter(name_en__in=names).values_list("name_en", "id")
+        )
+
+    @classmethod
+    def search_ids(cls, term: str, field: str = "name_en") -> list[int]:
+        """Ids of substances whose ``field`` contains ``term``, ignoring case."""
+        by_id = cls._snapshot()
+        if by_id is None:
+            return list(
+                Substance.objects.filter(**{f"{field}__icontains": term}).values_list(
+                    "id", flat=True
+                )
+            )
+
+        needle = term.casefold()
+        return [
+            entry.id
+            for entry in by_id.values()
+            if needle in (getattr(entry, field) or "").casefold()
+        ]
+
+    @classmethod
+    def bump(cls) -> None:
+        """Make every process reload the catalog on its next version check."""
+        try:
+            cls.current_version()
+            cache.incr(VERSION_KEY)
+        except Exception as e:
+            logger.warning(f"Could not bump substance catalog version: {e}")
+        cls.clear()
+
+    @classmethod
+    def clear(cls) -> None:
+        """Drop this process's snapshot."""
+        with cls._lock:
+            cls._version = None
+            cls._checked_at = 0.0
+            cls._by_id = {}
+            cls._by_name = {}
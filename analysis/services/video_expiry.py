@@ -0,0 +1,140 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Sequence
+
+from django.core.files.storage import default_storage
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from analysis.models import VideoAnalysis
+from larvixon_site.settings import (
+    VIDEO_EXPIRY_BATCH_SIZE,
+    VIDEO_EXPIRY_DELETE_WORKERS,
+    VIDEO_EXPIRY_MAX_BATCHES,
+    VIDEO_LIFETIME_DAYS,
+)
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+EXPIRABLE_STATUSES = (VideoAnalysis.Status.COMPLETED, VideoAnalysis.Status.FAILED)
+
+
+class VideoExpiryService:
+    """
+    Removes stored videos of finished analyses older than VIDEO_LIFETIME_DAYS.
+
+    Works in id-ordered batches: the blobs of a batch are deleted in parallel,
+    then the rows whose blob is gone get their ``video`` cleared in one
+    UPDATE. A run that is interrupted leaves the remaining rows untouched, and
+    deleting a blob that is already gone is harmless, so the next run simply
+    picks up where this one stopped. Thumbnails and results are kept.
+    """
+
+    @staticmethod
+    def get_cutoff(now: datetime | None = None) -> datetime:
+        return (now or timezone.now()) - timedelta(days=int(VIDEO_LIFETIME_DAYS))
+
+    @staticmethod
+    def expired_analyses(cutoff: datetime) -> QuerySet[VideoAnalysis]:
+        return (
+            VideoAnalysis.objects.filter(
+                created_at__lt=cutoff, status__in=EXPIRABLE_STATUSES
+            )
+            .exclude(video="")
+            .exclude(video__isnull=True)
+        )
+
+    @staticmethod
+    def delete_blob(name: str) -> int:
+        """Delete one stored video and return its size in bytes."""
+        try:
+            size = default_storage.size(name)
+        except Exception:
+            # Already removed by an interrupted earlier run.
+            size = 0
+        default_storage.delete(name)
+        return size
+
+    @staticmethod
+    def expire_batch(
+        batch: Sequence[tuple[Any, Any]], cutoff: datetime, now: datetime
+    ) -> tuple[int, int]:
+        """Expire one batch of ``(id, video name)`` rows; returns (videos, bytes)."""
+        names = {name for _, name in batch}
+        # Deduplicated uploads share a blob; keep it while a live analysis uses it.
+        shared = set(
+            VideoAnalysis.objects.filter(video__in=names)
+            .exclude(pk__in=VideoExpiryService.expired_analyses(cutoff).values("pk"))
+            .values_list("video", flat=True)
+        )
+        to_delete = sorted(names - shared)
+
+        sizes: dict[str, int] = {name: 0 for name in shared}
+        with ThreadPoolExecutor(max_workers=VIDEO_EXPIRY_DELETE_WORKERS) as pool:
+            futures = {
+                name: pool.submit(VideoExpiryService.delete_blob, name)
+                for name in to_delete
+            }
+            for name, future in futures.items():
+                try:
+                    sizes[name] = future.result()
+                except Exception as e:
+                    logger.error(f"Failed to delete expired video {name}: {e}")
+
+        expired = []
+        counted: set[str] = set()
+        for analysis_id, name in batch:
+            if name not in sizes:
+                continue
+            # A blob shared by several expired rows is counted once.
+            reclaimed = 0 if name in counted else sizes[name]
+            counted.add(name)
+            expired.append(
+                VideoAnalysis(
+                    id=analysis_id,
+                    video=None,
+                    video_expired_at=now,
+                    video_reclaimed_bytes=reclaimed,
+                )
+            )
+        VideoAnalysis.objects.bulk_update(
+            expired, ["video", "video_expired_at", "video_reclaimed_bytes"]
+        )
+        return len(expired), sum(a.video_reclaimed_bytes for a in expired)
+
+    @staticmethod
+    def expire_videos(
+        now: datetime | None = None,
+        batch_size: int = VIDEO_EXPIRY_BATCH_SIZE,
+        max_batches: int = VIDEO_EXPIRY_MAX_BATCHES,
+    ) -> dict[str, int]:
+        """Expire at most ``max_batches`` batches of videos past their lifetime."""
+        now = now or timezone.now()
+        cutoff = VideoExpiryService.get_cutoff(now)
+        stats = {"batches": 0, "videos": 0, "reclaimed_bytes": 0}
+
+        # Keyset over ids, so rows whose deletion failed are retried next run
+        # instead of being picked again in this one.
+        last_id = 0
+        for _ in range(max_batches):
+            batch = list(
+                VideoExpiryService.expired_analyses(cutoff)
+                .filter(id__gt=last_id)
+                .order_by("id")
+                .values_list("id", "video")[:batch_size]
+            )
+            if not batch:
+                break
+            last_id = batch[-1][0]
+
+            videos, reclaimed = VideoExpiryService.expire_batch(batch, cutoff, now)
+            stats["batches"] += 1
+            stats["videos"] += videos
+            stats["reclaimed_bytes"] += reclaimed
+
+        logger.info(
+            f"Expired {stats['videos']} videos in {stats['batches']} batches, "
+            f"reclaimed {stats['reclaimed_bytes']} bytes"
+        )
+        return stats
@@ -0,0 +1,15 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from analysis.services.substance_catalog import SubstanceCatalog
+from .models import Substance
+
+
+@receiver(post_save, sender=Substance)
+@receiver(post_delete, sender=Substance)
+def bump_substance_catalog(sender, instance, **kwargs):
+    """
+    Signal handler to publish substance changes to every process's catalog.
+    """
+    transaction.on_commit(SubstanceCatalog.bump)
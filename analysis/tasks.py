@@ -0,0 +1,16 @@
+from celery import shared_task
+
+from analysis.services.patient_projection import PatientProjectionService
+from analysis.services.video_expiry import VideoExpiryService
+
+
+@shared_task
+def expire_videos_task() -> dict[str, int]:
+    """Delete stored videos of analyses older than VIDEO_LIFETIME_DAYS."""
+    return VideoExpiryService.expire_videos()
+
+
+@shared_task
+def refresh_patient_projection_task() -> dict[str, int]:
+    """Refetch, in bulk, the patients of analyses that are missing or outdated."""
+    return PatientProjectionService.refresh()
@@ -481,11 +481,19 @@ class AnalysisViewsTest(APITestCase):
     def test_update_analysis_invalid_data(self):
         detail_url = reverse("analysis:analysis-detail", args=[self.analysis1.id])
         payload = {
-            "status": "an-invalid-choice",
+            "patient_guid": "not-a-guid",
         }
         response = self.client.patch(detail_url, payload)
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
-        self.assertIn("status", response.data)
+        self.assertIn("patient_guid", response.data)
+
+    def test_update_analysis_ignores_status(self):
+        detail_url = reverse("analysis:analysis-detail", args=[self.analysis3.id])
+        response = self.client.patch(detail_url, {"status": "completed"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.analysis3.refresh_from_db()
+        self.assertEqual(self.analysis3.status, VideoAnalysis.Status.PENDING)
 
     # --- ID List Endpoint Tests ---
 
@@ -0,0 +1,145 @@
+from datetime import timedelta
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from tests.common import TestFixtures
+from ..models import User, VideoAnalysis
+
+
+class CursorPaginationTest(APITestCase):
+    def setUp(self):
+        user_data = TestFixtures.get_test_user_data()
+        self.user = User.objects.create_user(
+            username=user_data["username"],
+            email=user_data["email"],
+            password=user_data["password"],
+        )
+        self.client.force_authenticate(user=self.user)
+
+        # Several analyses share each timestamp and description, and a third
+        # of them were never completed, so ties and NULLs are both exercised.
+        now = timezone.now()
+        self.analyses = []
+        for i in range(20):
+            analysis = VideoAnalysis.objects.create(
+                user=self.user, description=f"analysis {i % 3}"
+            )
+            self.analyses.append(analysis)
+            VideoAnalysis.objects.filter(id=analysis.id).update(
+                created_at=now - timedelta(minutes=i // 4),
+                completed_at=None if i % 3 == 0 else now - timedelta(hours=i % 5),
+            )
+
+        patcher = patch(
+            "patients.services.patient_service.patient_service.get_patients_by_guids",
+            return_value={},
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def walk(self, url_name: str, **params) -> list[int]:
+        ids: list[int] = []
+        response = self.client.get(
+            reverse(url_name), {"pagination": "cursor", **params}
+        )
+        while True:
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn("count", response.data)
+            ids.extend(r["id"] for r in response.data["results"])
+            if response.data["next"] is None:
+                return ids
+            response = self.client.get(response.data["next"])
+
+    def test_cursor_walk_visits_every_analysis_once(self):
+        ids = self.walk("analysis:analysis-list")
+
+        expected = VideoAnalysis.objects.order_by("-created_at", "-id")
+        self.assertEqual(ids, list(expected.values_list("id", flat=True)))
+
+    def test_cursor_walk_is_stable_for_other_orderings(self):
+        for ordering in ["description", "-description", "completed_at", "-status"]:
+            with self.subTest(ordering=ordering):
+                ids = self.walk("analysis:analysis-id-list", ordering=ordering)
+                self.assertEqual(len(ids), len(self.analyses))
+                self.assertEqual(set(ids), {a.id for a in self.analyses})
+
+    def test_nulls_sort_last(self):
+        ids = self.walk("analysis:analysis-id-list", ordering="-completed_at")
+
+        never_completed = {a.id for i, a in enumerate(self.analyses) if i % 3 == 0}
+        self.assertEqual(set(ids[-len(never_completed) :]), never_completed)
+
+    def walk_pages(self, url_name: str, **params) -> list[int]:
+        ids: list[int] = []
+        response = self.client.get(reverse(url_name), params)
+        while True:
+            self.assertEqual(response.status_code, 200)
+            ids.extend(r["id"] for r in response.data["results"])
+            if response.data["next"] is None:
+                return ids
+            response = self.client.get(response.data["next"])
+
+    def test_both_modes_return_the_same_sequence(self):
+        for ordering in [
+            "-completed_at",
+            "completed_at",
+            "description,-completed_at",
+            "-description,completed_at,created_at",
+        ]:
+            with self.subTest(ordering=ordering):
+                self.assertEqual(
+                    self.walk("analysis:analysis-id-list", ordering=ordering),
+                    self.walk_pages("analysis:analysis-id-list", ordering=ordering),
+                )
+
+    def test_secondary_ordering_is_kept_across_pages(self):
+        ids = self.walk("analysis:analysis-id-list", ordering="description,-created_at")
+
+        rows = VideoAnalysis.objects.in_bulk(ids)
+        keys = [(rows[i].description, -rows[i].created_at.timestamp()) for i in ids]
+        self.assertEqual(keys, sorted(keys))
+        self.assertEqual(len(ids), len(self.analyses))
+
+    def test_new_analysis_does_not_shift_next_page(self):
+        url = reverse("analysis:analysis-list")
+        first = self.client.get(url, {"pagination": "cursor"})
+        VideoAnalysis.objects.create(user=self.user, description="newest")
+
+        second = self.client.get(first.data["next"])
+
+        seen = {r["id"] for r in first.data["results"]}
+        self.assertFalse(seen & {r["id"] for r in second.data["results"]})
+
+    def test_cursor_mode_skips_count(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse("analysis:analysis-list"), {"pagination": "cursor"})
+
+        self.assertFalse(
+            any("COUNT(" in q["sql"].upper() for q in queries.captured_queries)
+        )
+
+    def test_page_number_mode_is_default(self):
+        response = self.client.get(reverse("analysis:analysis-list"), {"page": 2})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], len(self.analyses))
+        self.assertIn("previous", response.data)
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get(reverse("analysis:analysis-list"), {"cursor": "x"})
+        self.assertEqual(response.status_code, 404)
+
+    def test_cursor_from_another_ordering_is_rejected(self):
+        url = reverse("analysis:analysis-id-list")
+        first = self.client.get(url, {"pagination": "cursor"})
+        (cursor,) = parse_qs(urlparse(first.data["next"]).query)["cursor"]
+
+        response = self.client.get(url, {"cursor": cursor, "ordering": "description"})
+
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,98 @@
+import tracemalloc
+import uuid
+from unittest.mock import patch
+
+from django.conf import settings
+from django.test import tag
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from tests.common import TestFixtures
+from ..models import User, VideoAnalysis
+
+
+LARGE_HISTORY = 10_000
+SMALL_HISTORY = 100
+
+
+@tag("benchmark")
+class AnalysisListScalingBenchmark(APITestCase):
+    """
+    The list endpoint must cost the same for a user with 10k analyses as for
+    one with a hundred: only the requested page is loaded and enriched. The
+    query count per page is covered by test_query_counts.
+
+    Seeding 10k rows is slow, so CI runs with ``--exclude-tag=benchmark``;
+    run it with ``python manage.py test --tag=benchmark``.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.small_user = cls.create_user_with_history(SMALL_HISTORY)
+        cls.large_user = cls.create_user_with_history(LARGE_HISTORY)
+
+    @staticmethod
+    def create_user_with_history(count: int) -> User:
+        user_data = TestFixtures.get_test_user_data()
+        user = User.objects.create_user(
+            username=user_data["username"],
+            email=user_data["email"],
+            password=user_data["password"],
+        )
+        VideoAnalysis.objects.bulk_create(
+            [
+                VideoAnalysis(
+                    user=user,
+                    description=f"analysis {i}",
+                    patient_guid=uuid.uuid4(),
+                    status=VideoAnalysis.Status.COMPLETED,
+                )
+                for i in range(count)
+            ],
+            batch_size=1000,
+        )
+        return user
+
+    def setUp(self):
+        patcher = patch(
+            "patients.services.patient_service.patient_service.get_patients_by_guids",
+            return_value={},
+        )
+        self.get_patients_by_guids = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def peak_memory(self, user: User) -> int:
+        """Peak bytes allocated while rendering the first page for ``user``."""
+        self.client.force_authenticate(user=user)
+        url = reverse("analysis:analysis-list")
+        self.client.get(url)  # warm up
+
+        tracemalloc.start()
+        try:
+            response = self.client.get(url)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["results"]), settings.DEFAULT_PAGE_SIZE)
+        return peak
+
+    def test_patient_lookup_is_page_scoped(self):
+        self.client.force_authenticate(user=self.large_user)
+
+        response = self.client.get(reverse("analysis:analysis-list"), {"page": 3})
+
+        self.assertEqual(response.data["count"], LARGE_HISTORY)
+        self.get_patients_by_guids.assert_called_once()
+        guids = self.get_patients_by_guids.call_args.args[0]
+        self.assertEqual(
+            set(guids), {r["patient_guid"] for r in response.data["results"]}
+        )
+
+    def test_memory_is_flat(self):
+        small_peak = self.peak_memory(self.small_user)
+        large_peak = self.peak_memory(self.large_user)
+
+        # Loading the whole history would be ~100x the small user's peak.
+        self.assertLess(large_peak, small_peak * 2)
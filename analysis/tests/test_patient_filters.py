@@ -0,0 +1,74 @@
+import uuid
+from unittest.mock import patch
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from tests.common import TestFixtures
+from ..models import User, VideoAnalysis
+
+
+class PatientFilterTest(APITestCase):
+    def setUp(self):
+        user_data = TestFixtures.get_test_user_data()
+        self.user = User.objects.create_user(
+            username=user_data["username"],
+            email=user_data["email"],
+            password=user_data["password"],
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse("analysis:analysis-id-list")
+
+        self.guids = [uuid.uuid4() for _ in range(5)]
+        self.analyses = [
+            VideoAnalysis.objects.create(user=self.user, patient_guid=guid)
+            for guid in self.guids
+        ]
+        VideoAnalysis.objects.create(user=self.user)
+
+        patcher = patch(
+            "patients.services.patient_service.patient_service.search_patients"
+        )
+        self.search_patients = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def found(self, guids) -> list[dict]:
+        return [{"id": str(guid)} for guid in guids]
+
+    def get_ids(self, **params) -> set[int]:
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return {r["id"] for r in response.data["results"]}
+
+    def test_patient_terms_are_sent_in_one_search(self):
+        self.search_patients.return_value = self.found(self.guids[:2])
+
+        ids = self.get_ids(first_name="Jan", last_name="Kowalski", pesel="900101")
+
+        self.search_patients.assert_called_once_with(
+            first_name="Jan", last_name="Kowalski", pesel="900101"
+        )
+        self.assertEqual(ids, {a.id for a in self.analyses[:2]})
+
+    def test_no_patient_terms_skip_the_search(self):
+        self.get_ids(status="pending")
+        self.search_patients.assert_not_called()
+
+    def test_no_matching_patients_returns_nothing(self):
+        self.search_patients.return_value = [{"id": None}, {"id": "not-a-guid"}]
+        self.assertEqual(self.get_ids(last_name="Nowak"), set())
+
+    def test_large_guid_set_is_sent_as_one_parameter(self):
+        unrelated = [uuid.uuid4() for _ in range(20)]
+        self.search_patients.return_value = self.found(self.guids[1:4] + unrelated)
+
+        with patch("analysis.filters.GUID_IN_LIST_LIMIT", 2):
+            with CaptureQueriesContext(connection) as queries:
+                ids = self.get_ids(last_name="Kowalski")
+
+        self.assertEqual(ids, {a.id for a in self.analyses[1:4]})
+        sql = " ".join(q["sql"] for q in queries.captured_queries)
+        expected = {"postgresql": "unnest(", "sqlite": "json_each("}
+        self.assertIn(expected[connection.vendor], sql)
@@ -0,0 +1,224 @@
+import uuid
+from datetime import date, timedelta
+from unittest.mock import Mock, patch
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from patients.models import PatientRecord
+from patients.services.api_patient_service import APIPatientService
+from patients.services.base_patient_service import BasePatientService
+from patients.services.patient_cache import PatientCache
+from tests.common import TestFixtures
+from ..models import User, VideoAnalysis
+from ..services.patient_projection import PatientProjectionService
+
+
+def patient(guid, first_name: str, last_name: str, birth_date: str) -> dict:
+    return {
+        "id": str(guid),
+        "first_name": first_name,
+        "last_name": last_name,
+        "birth_date": birth_date,
+        "pesel": None,
+    }
+
+
+class PatientProjectionTest(APITestCase):
+    def setUp(self):
+        user_data = TestFixtures.get_test_user_data()
+        self.user = User.objects.create_user(
+            username=user_data["username"],
+            email=user_data["email"],
+            password=user_data["password"],
+        )
+        self.client.force_authenticate(user=self.user)
+
+        self.guids = {name: uuid.uuid4() for name in ("nowak", "adamska", "zielinski")}
+        self.directory = {
+            self.guids["nowak"]: patient(
+                self.guids["nowak"], "Jan", "Nowak", "1980-05-01"
+            ),
+            self.guids["adamska"]: patient(
+                self.guids["adamska"], "Anna", "Adamska", "1995-01-01"
+            ),
+            self.guids["zielinski"]: patient(
+                self.guids["zielinski"], "Piotr", "Zieliński", "1970-12-31"
+            ),
+        }
+        self.source = Mock(spec=BasePatientService)
+        self.source.get_patients_by_guids.side_effect = lambda guids: {
+            g: self.directory[uuid.UUID(g)]
+            for g in guids
+            if uuid.UUID(g) in self.directory
+        }
+
+        self.analyses = {}
+        for name, count in (("nowak", 2), ("adamska", 1), ("zielinski", 3)):
+            self.analyses[name] = [
+                VideoAnalysis.objects.create(
+                    user=self.user, patient_guid=self.guids[name]
+                )
+                for _ in range(count)
+            ]
+        self.unknown = VideoAnalysis.objects.create(
+            user=self.user, patient_guid=uuid.uuid4()
+        )
+        self.no_patient = VideoAnalysis.objects.create(user=self.user)
+
+        patcher = patch(
+            "patients.services.patient_service.patient_service.get_patients_by_guids",
+            return_value={},
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_refresh_fetches_patients_in_bulk_batches(self):
+        stats = PatientProjectionService.refresh(self.source, batch_size=2)
+
+        self.assertEqual(stats, {"batches": 2, "patients": 3, "missing": 1})
+        self.assertEqual(self.source.get_patients_by_guids.call_count, 2)
+        self.source.get_patient_by_guid.assert_not_called()
+        self.assertEqual(
+            PatientRecord.objects.get(guid=self.guids["zielinski"]).birth_date,
+            date(1970, 12, 31),
+        )
+
+    def test_refresh_skips_fresh_patients(self):
+        PatientProjectionService.refresh(self.source)
+        self.source.get_patients_by_guids.reset_mock()
+
+        PatientProjectionService.refresh(self.source)
+
+        # Only the GUID the service does not know is asked for again.
+        (call,) = self.source.get_patients_by_guids.call_args_list
+        self.assertEqual(call.args[0], [str(self.unknown.patient_guid)])
+
+    def test_refresh_updates_outdated_patients(self):
+        PatientProjectionService.refresh(self.source)
+        PatientRecord.objects.filter(guid=self.guids["nowak"]).update(
+            synced_at=timezone.now() - timedelta(days=1)
+        )
+        self.directory[self.guids["nowak"]]["last_name"] = "Nowak-Kowalska"
+
+        PatientProjectionService.refresh(self.source)
+
+        record = PatientRecord.objects.get(guid=self.guids["nowak"])
+        self.assertEqual(record.last_name, "Nowak-Kowalska")
+
+    @patch("patients.services.api_patient_service.requests.post")
+    def test_refresh_bypasses_the_lookup_cache(self, mock_post):
+        self.addCleanup(cache.clear)
+        guid = str(self.guids["nowak"])
+        PatientCache.set(f"patient:{guid}", patient(guid, "Jan", "Stary", "1980-05-01"))
+        mock_post.return_value = Mock(
+            status_code=200,
+            json=Mock(
+                return_value={
+                    "entry": [
+                        {
+                            "resource": {
+                                "id": guid,
+                                "name": [{"family": "Nowak", "given": ["Jan"]}],
+                            }
+                        }
+                    ]
+                }
+            ),
+        )
+
+        PatientProjectionService.refresh(APIPatientService("http://patients.test"))
+
+        self.assertEqual(PatientRecord.objects.get(guid=guid).last_name, "Nowak")
+
+    def test_plain_listing_skips_patient_subqueries(self):
+        for url in ("analysis:analysis-list", "analysis:analysis-id-list"):
+            with self.subTest(url=url):
+                with CaptureQueriesContext(connection) as queries:
+                    self.client.get(reverse(url), {"ordering": "-created_at"})
+
+                sql = " ".join(q["sql"] for q in queries.captured_queries)
+                self.assertNotIn("patients_patientrecord", sql)
+
+    def test_ordering_adds_only_the_requested_attribute(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.get_ids(ordering="patient_birth_date")
+
+        sql = " ".join(q["sql"] for q in queries.captured_queries)
+        self.assertIn('"birth_date"', sql)
+        self.assertNotIn('"last_name"', sql)
+
+    def get_ids(self, **params) -> list[int]:
+        response = self.client.get(reverse("analysis:analysis-id-list"), params)
+        self.assertEqual(response.status_code, 200)
+        ids = [r["id"] for r in response.data["results"]]
+        while response.data["next"]:
+            response = self.client.get(response.data["next"])
+            ids.extend(r["id"] for r in response.data["results"])
+        return ids
+
+    def patients_of(self, ids: list[int]) -> list[str | None]:
+        """Patient of each analysis in ``ids``, with repeats collapsed."""
+        names = {a.id: name for name, group in self.analyses.items() for a in group}
+        patients: list[str | None] = []
+        for analysis_id in ids:
+            name = names.get(analysis_id)
+            if not patients or patients[-1] != name:
+                patients.append(name)
+        return patients
+
+    def test_order_by_patient_last_name(self):
+        PatientProjectionService.refresh(self.source)
+
+        for mode in ({}, {"pagination": "cursor"}):
+            with self.subTest(**mode):
+                ids = self.get_ids(ordering="patient_last_name", **mode)
+                self.assertEqual(len(ids), 8)
+                # Analyses without a known patient come last.
+                self.assertEqual(
+                    self.patients_of(ids), ["adamska", "nowak", "zielinski", None]
+                )
+
+    def test_order_by_patient_birth_date_descending(self):
+        PatientProjectionService.refresh(self.source)
+
+        ids = self.get_ids(ordering="-patient_birth_date", pagination="cursor")
+
+        self.assertEqual(self.patients_of(ids), ["adamska", "nowak", "zielinski", None])
+
+    def test_group_by_patient(self):
+        PatientProjectionService.refresh(self.source)
+
+        response = self.client.get(
+            reverse("analysis:analysis-list"), {"group_by": "patient"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 5)
+        groups = response.data["results"]
+        self.assertEqual(
+            [(g["patient_last_name"], g["analysis_count"]) for g in groups[:3]],
+            [("Adamska", 1), ("Nowak", 2), ("Zieliński", 3)],
+        )
+        self.assertEqual(groups[0]["patient_guid"], str(self.guids["adamska"]))
+        self.assertEqual(groups[0]["patient_birth_date"], "1995-01-01")
+        self.assertEqual({g["patient_last_name"] for g in groups[3:]}, {None})
+
+    def test_group_by_patient_applies_filters(self):
+        PatientProjectionService.refresh(self.source)
+        VideoAnalysis.objects.filter(id=self.analyses["zielinski"][0].id).update(
+            status=VideoAnalysis.Status.COMPLETED
+        )
+
+        response = self.client.get(
+            reverse("analysis:analysis-list"),
+            {"group_by": "patient", "status": "completed"},
+        )
+
+        (group,) = response.data["results"]
+        self.assertEqual(group["patient_last_name"], "Zieliński")
+        self.assertEqual(group["analysis_count"], 1)
@@ -0,0 +1,104 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APITransactionTestCase
+
+from tests.common import TestFixtures
+from ..models import AnalysisResult, Substance, User, VideoAnalysis
+from ..services.substance_catalog import SubstanceCatalog
+
+
+# COUNT(*) for the paginator, the page joined with its user, and the results.
+# Substances come from the in-memory catalog.
+LIST_QUERIES = 3
+# The analysis joined with its user, and its results.
+DETAIL_QUERIES = 2
+
+
+class AnalysisQueryCountTest(APITransactionTestCase):
+    """
+    The number of queries per request must not depend on how many analyses or
+    results are rendered. A failure here usually means a new serializer field
+    reads a relation that the queryset builder does not load.
+
+    Runs outside a wrapping transaction so the substance catalog can load.
+    """
+
+    def setUp(self):
+        cache.clear()
+        SubstanceCatalog.clear()
+        self.addCleanup(SubstanceCatalog.clear)
+        user_data = TestFixtures.get_test_user_data()
+        self.user = User.objects.create_user(
+            username=user_data["username"],
+            email=user_data["email"],
+            password=user_data["password"],
+        )
+        self.client.force_authenticate(user=self.user)
+        self.substances = [
+            Substance.objects.create(name_en=f"substance {i}") for i in range(4)
+        ]
+
+        patcher = patch(
+            "patients.services.patient_service.patient_service.get_patients_by_guids",
+            return_value={},
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        SubstanceCatalog.get(self.substances[0].id)
+
+    def create_analyses(self, count: int) -> list[VideoAnalysis]:
+        analyses = []
+        for i in range(count):
+            analysis = VideoAnalysis.objects.create(
+                user=self.user,
+                description=f"analysis {i}",
+                status=VideoAnalysis.Status.COMPLETED,
+            )
+            AnalysisResult.objects.bulk_create(
+                AnalysisResult(
+                    analysis=analysis,
+                    substance=substance,
+                    confidence_score=10.0 * (j + 1),
+                )
+                for j, substance in enumerate(self.substances)
+            )
+            analyses.append(analysis)
+        return analyses
+
+    def test_list_query_count_is_constant(self):
+        self.create_analyses(1)
+        with self.assertNumQueries(LIST_QUERIES):
+            self.client.get(reverse("analysis:analysis-list"))
+
+        self.create_analyses(5)
+        with self.assertNumQueries(LIST_QUERIES):
+            response = self.client.get(reverse("analysis:analysis-list"))
+
+        self.assertEqual(len(response.data["results"]), 6)
+        self.assertEqual(len(response.data["results"][0]["analysis_results"]), 4)
+
+    def test_detail_query_count_is_constant(self):
+        (analysis,) = self.create_analyses(1)
+
+        with self.assertNumQueries(DETAIL_QUERIES):
+            response = self.client.get(
+                reverse("analysis:analysis-detail", args=[analysis.id])
+            )
+
+        self.assertEqual(response.data["user"], str(self.user))
+        self.assertEqual(
+            response.data["analysis_results"][0]["substance"]["name_en"],
+            "substance 3",
+        )
+
+    def test_results_are_ordered_by_confidence(self):
+        (analysis,) = self.create_analyses(1)
+
+        response = self.client.get(
+            reverse("analysis:analysis-detail", args=[analysis.id])
+        )
+
+        scores = [r["confidence_score"] for r in response.data["analysis_results"]]
+        self.assertEqual(scores, sorted(scores, reverse=True))
@@ -0,0 +1,119 @@
+import unittest
+from datetime import timedelta
+
+from django.db import connection
+from django.db.models import QuerySet
+from django.test import TestCase
+from django.utils import timezone
+
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from tests.common import TestFixtures
+from ..models import AnalysisResult, Substance, User, VideoAnalysis
+from ..pagination import KeysetPagination
+
+
+@unittest.skipUnless(
+    connection.vendor == "postgresql", "Query plans are checked on PostgreSQL only"
+)
+class AnalysisQueryPlanTest(TestCase):
+    """
+    EXPLAIN the hot analysis queries and check that each one is served by the
+    index added for it. Sequential scans and explicit sorts are disabled for
+    the transaction, since on a near-empty test table the planner would
+    rightly prefer them; what is checked is that the expected index is the
+    cheapest way to answer the query.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        user_data = TestFixtures.get_test_user_data()
+        cls.user = User.objects.create_user(
+            username=user_data["username"],
+            email=user_data["email"],
+            password=user_data["password"],
+        )
+        cls.substance = Substance.objects.create(name_en="cocaine")
+        statuses = list(VideoAnalysis.Status)
+        analyses = VideoAnalysis.objects.bulk_create(
+            VideoAnalysis(user=cls.user, status=statuses[i % len(statuses)])
+            for i in range(200)
+        )
+        AnalysisResult.objects.bulk_create(
+            AnalysisResult(
+                analysis=analysis, substance=cls.substance, confidence_score=i % 100
+            )
+            for i, analysis in enumerate(analyses)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def setUp(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute("SET LOCAL enable_sort = off")
+
+    def assertUsesIndex(self, queryset: QuerySet, index_name: str):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan, msg=plan)
+
+    def test_history_uses_user_created_index(self):
+        self.assertUsesIndex(
+            VideoAnalysis.objects.filter(user=self.user).order_by("-created_at")[:6],
+            "analysis_user_created_id_idx",
+        )
+
+    def test_cursor_page_seeks_user_created_index(self):
+        history = VideoAnalysis.objects.filter(user=self.user).order_by("-created_at")
+        paginator = KeysetPagination()
+        last = history[paginator.page_size - 1]
+        cursor = paginator.encode_cursor([("created_at", True), ("id", True)], last)
+        request = Request(APIRequestFactory().get("/", {"cursor": cursor}))
+
+        page = paginator.get_page_queryset(history, request)
+
+        plan = page.explain()
+        self.assertRegex(plan, r"Index Cond: .*created_at", msg=plan)
+        self.assertIn("analysis_user_created_id_idx", plan, msg=plan)
+        self.assertNotIn("Sort", plan, msg=plan)
+        self.assertNotIn("IS NULL", str(page.query))
+
+    def test_top_confidence_page_uses_nulls_last_index(self):
+        history = VideoAnalysis.objects.filter(user=self.user).order_by(
+            "-top_confidence"
+        )
+        request = Request(APIRequestFactory().get("/"))
+
+        page = KeysetPagination().get_page_queryset(history, request)
+
+        plan = page.explain()
+        self.assertIn("analysis_user_top_conf_idx", plan, msg=plan)
+        self.assertNotIn("Sort", plan, msg=plan)
+
+    def test_status_filtered_history_uses_user_status_index(self):
+        self.assertUsesIndex(
+            VideoAnalysis.objects.filter(
+                user=self.user, status=VideoAnalysis.Status.COMPLETED
+            ).order_by("-created_at")[:6],
+            "analysis_user_status_idx",
+        )
+
+    def test_confidence_range_uses_substance_score_index(self):
+        self.assertUsesIndex(
+            AnalysisResult.objects.filter(
+                substance=self.substance,
+                confidence_score__gte=40,
+                confidence_score__lte=60,
+            ).values("analysis_id"),
+            "result_substance_score_idx",
+        )
+
+    def test_reaper_uses_partial_active_index(self):
+        cutoff = timezone.now() - timedelta(minutes=5)
+        self.assertUsesIndex(
+            VideoAnalysis.objects.filter(
+                status=VideoAnalysis.Status.PROCESSING, heartbeat_at__lt=cutoff
+            ).values_list("id", "processing_attempts")[:100],
+            "analysis_active_status_idx",
+        )
@@ -0,0 +1,113 @@
+from unittest.mock import patch
+
+from django.db.models import F
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from tests.common import TestFixtures
+from ..models import User, VideoAnalysis
+
+
+class StatusUpdateTest(TestCase):
+    def setUp(self):
+        user_data = TestFixtures.get_test_user_data()
+        self.user = User.objects.create_user(
+            username=user_data["username"],
+            email=user_data["email"],
+            password=user_data["password"],
+        )
+        self.analysis = VideoAnalysis.objects.create(
+            user=self.user, description="original"
+        )
+
+    def test_transition_does_not_overwrite_user_edits(self):
+        worker_copy = VideoAnalysis.objects.get(id=self.analysis.id)
+        VideoAnalysis.objects.filter(id=self.analysis.id).update(
+            description="edited", actual_substance="cocaine", user_feedback="wrong"
+        )
+
+        applied = worker_copy.transition_to(
+            VideoAnalysis.Status.FAILED,
+            VideoAnalysis.Status.PENDING,
+            error_message="boom",
+        )
+
+        self.assertTrue(applied)
+        self.analysis.refresh_from_db()
+        self.assertEqual(self.analysis.status, VideoAnalysis.Status.FAILED)
+        self.assertEqual(self.analysis.error_message, "boom")
+        self.assertEqual(self.analysis.description, "edited")
+        self.assertEqual(self.analysis.actual_substance, "cocaine")
+        self.assertEqual(self.analysis.user_feedback, "wrong")
+
+    def test_transition_writes_only_status_columns(self):
+        with self.assertNumQueries(1) as queries:
+            self.analysis.transition_to(
+                VideoAnalysis.Status.PROCESSING, VideoAnalysis.Status.PENDING
+            )
+
+        sql = queries.captured_queries[0]["sql"]
+        self.assertIn('"status"', sql)
+        self.assertNotIn('"description"', sql)
+        self.assertNotIn('"user_feedback"', sql)
+
+    def test_stale_transition_is_not_applied(self):
+        worker_copy = VideoAnalysis.objects.get(id=self.analysis.id)
+        self.analysis.transition_to(
+            VideoAnalysis.Status.FAILED, VideoAnalysis.Status.PENDING
+        )
+
+        applied = worker_copy.transition_to(
+            VideoAnalysis.Status.PROCESSING, VideoAnalysis.Status.PENDING
+        )
+
+        self.assertFalse(applied)
+        self.assertEqual(worker_copy.status, VideoAnalysis.Status.PENDING)
+        self.analysis.refresh_from_db()
+        self.assertEqual(self.analysis.status, VideoAnalysis.Status.FAILED)
+
+    def test_transition_updates_instance(self):
+        self.analysis.transition_to(
+            VideoAnalysis.Status.PROCESSING,
+            VideoAnalysis.Status.PENDING,
+            processing_attempts=F("processing_attempts") + 1,
+        )
+
+        self.assertEqual(self.analysis.status, VideoAnalysis.Status.PROCESSING)
+        self.assertEqual(self.analysis.processing_attempts, 1)
+
+    def test_transition_rejects_user_columns(self):
+        with self.assertRaises(ValueError):
+            self.analysis.transition_to(
+                VideoAnalysis.Status.FAILED,
+                VideoAnalysis.Status.PENDING,
+                description="overwritten",
+            )
+        self.analysis.refresh_from_db()
+        self.assertEqual(self.analysis.description, "original")
+
+    def test_patch_racing_completion_keeps_worker_columns(self):
+        def complete_meanwhile(analysis):
+            # The worker finishes after the view loaded its copy of the row.
+            VideoAnalysis.objects.filter(id=analysis.id).update(
+                status=VideoAnalysis.Status.COMPLETED, top_confidence=0.9
+            )
+            return {}
+
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        with patch(
+            "analysis.services.analysis.AnalysisService.get_patient_details_for_analysis",
+            side_effect=complete_meanwhile,
+        ):
+            response = client.patch(
+                reverse("analysis:analysis-detail", args=[self.analysis.id]),
+                {"user_feedback": "looks right"},
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.analysis.refresh_from_db()
+        self.assertEqual(self.analysis.status, VideoAnalysis.Status.COMPLETED)
+        self.assertEqual(self.analysis.top_confidence, 0.9)
+        self.assertEqual(self.analysis.user_feedback, "looks right")
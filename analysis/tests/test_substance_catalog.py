@@ -0,0 +1,91 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TransactionTestCase
+
+from ..models import AnalysisResult, Substance, User, VideoAnalysis
+from ..serializers import AnalysisResultSerializer
+from ..services.substance_catalog import VERSION_KEY, SubstanceCatalog
+
+
+class SubstanceCatalogTest(TransactionTestCase):
+    """
+    Runs outside a wrapping transaction so the catalog is allowed to load.
+    """
+
+    def setUp(self):
+        cache.clear()
+        SubstanceCatalog.clear()
+        self.addCleanup(SubstanceCatalog.clear)
+
+        self.cocaine = Substance.objects.create(name_en="Cocaine", name_pl="Kokaina")
+        self.morphine = Substance.objects.create(name_en="Morphine", name_pl="Morfina")
+
+    def test_lookups_are_served_from_memory(self):
+        SubstanceCatalog.get(self.cocaine.id)
+
+        with self.assertNumQueries(0):
+            entry = SubstanceCatalog.get(self.cocaine.id)
+            ids = SubstanceCatalog.ids_for_names(["Cocaine", "Morphine"])
+            matches = SubstanceCatalog.search_ids("MORF", "name_pl")
+
+        self.assertEqual(entry.name_pl, "Kokaina")
+        self.assertEqual(
+            ids, {"Cocaine": self.cocaine.id, "Morphine": self.morphine.id}
+        )
+        self.assertEqual(matches, [self.morphine.id])
+
+    def test_saved_substance_is_visible_without_restart(self):
+        SubstanceCatalog.get(self.cocaine.id)
+
+        ketamine = Substance.objects.create(name_en="Ketamine")
+
+        self.assertEqual(
+            SubstanceCatalog.ids_for_names(["Ketamine"]), {"Ketamine": ketamine.id}
+        )
+
+    @patch("analysis.services.substance_catalog.SUBSTANCE_CATALOG_CHECK_SECONDS", 0.0)
+    def test_reloads_when_another_process_bumps_the_version(self):
+        SubstanceCatalog.get(self.cocaine.id)
+        Substance.objects.filter(id=self.cocaine.id).update(name_pl="Koka")
+
+        with self.assertNumQueries(0):
+            self.assertEqual(SubstanceCatalog.get(self.cocaine.id).name_pl, "Kokaina")
+
+        cache.incr(VERSION_KEY)
+
+        self.assertEqual(SubstanceCatalog.get(self.cocaine.id).name_pl, "Koka")
+
+    def test_does_not_load_inside_atomic_block(self):
+        with transaction.atomic():
+            Substance.objects.create(name_en="Ketamine")
+            self.assertIsNotNone(SubstanceCatalog.ids_for_names(["Ketamine"]))
+            transaction.set_rollback(True)
+
+        self.assertIsNone(SubstanceCatalog._version)
+        self.assertEqual(SubstanceCatalog.ids_for_names(["Ketamine"]), {})
+
+    def test_result_serializer_uses_catalog(self):
+        user = User.objects.create_user(
+            username="catalog", email="catalog@example.com", password="password"
+        )
+        analysis = VideoAnalysis.objects.create(user=user)
+        results = [
+            AnalysisResult.objects.create(
+                analysis=analysis, substance=substance, confidence_score=50.0
+            )
+            for substance in (self.cocaine, self.morphine)
+        ]
+        SubstanceCatalog.get(self.cocaine.id)
+
+        with self.assertNumQueries(0):
+            data = AnalysisResultSerializer(results, many=True).data
+
+        self.assertEqual(
+            [row["substance"] for row in data],
+            [
+                {"id": self.cocaine.id, "name_en": "Cocaine", "name_pl": "Kokaina"},
+                {"id": self.morphine.id, "name_en": "Morphine", "name_pl": "Morfina"},
+            ],
+        )
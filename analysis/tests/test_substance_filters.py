@@ -0,0 +1,109 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from tests.common import TestFixtures
+from ..models import AnalysisResult, Substance, User, VideoAnalysis
+
+
+class SubstanceFilterTest(APITestCase):
+    def setUp(self):
+        user_data = TestFixtures.get_test_user_data()
+        self.user = User.objects.create_user(
+            username=user_data["username"],
+            email=user_data["email"],
+            password=user_data["password"],
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse("analysis:analysis-id-list")
+
+        self.cocaine = Substance.objects.create(name_en="cocaine", name_pl="kokaina")
+        self.crack = Substance.objects.create(name_en="crack cocaine")
+        self.morphine = Substance.objects.create(name_en="morphine", name_pl="morfina")
+
+        # Both cocaine and crack cocaine match "cocaine", so a join would
+        # return this analysis twice.
+        self.both_cocaines = self.create_analysis(
+            {self.cocaine: 0.9, self.crack: 0.8, self.morphine: 0.1}
+        )
+        self.cocaine_only = self.create_analysis({self.cocaine: 0.4})
+        self.morphine_only = self.create_analysis({self.morphine: 0.95})
+
+    def create_analysis(self, scores: dict[Substance, float]) -> VideoAnalysis:
+        analysis = VideoAnalysis.objects.create(
+            user=self.user, status=VideoAnalysis.Status.COMPLETED
+        )
+        AnalysisResult.objects.bulk_create(
+            AnalysisResult(analysis=analysis, substance=s, confidence_score=score)
+            for s, score in scores.items()
+        )
+        return analysis
+
+    def get(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return response
+
+    def get_ids(self, **params) -> list[int]:
+        return [r["id"] for r in self.get(**params).data["results"]]
+
+    def test_matching_results_do_not_duplicate_analyses(self):
+        for params in [
+            {"substance_name": "cocaine"},
+            {"min_confidence": 0.5},
+            {"substance_and_score": "cocaine,0.5"},
+            {"substance": "cocaine"},
+        ]:
+            with self.subTest(**params):
+                response = self.get(**params)
+                ids = [r["id"] for r in response.data["results"]]
+                self.assertEqual(len(ids), len(set(ids)))
+                self.assertEqual(response.data["count"], len(ids))
+
+    def test_conditions_are_combined_with_and_by_default(self):
+        ids = self.get_ids(substance=["cocaine", "morphine"])
+        self.assertEqual(ids, [self.both_cocaines.id])
+
+    def test_conditions_can_be_combined_with_or(self):
+        ids = self.get_ids(
+            substance=["cocaine,0.85", "morphine,0.9"], substance_match="any"
+        )
+        self.assertEqual(set(ids), {self.both_cocaines.id, self.morphine_only.id})
+
+    def test_score_range_applies_per_substance(self):
+        self.assertEqual(
+            self.get_ids(substance=["cocaine,0.3,0.5"]), [self.cocaine_only.id]
+        )
+        # Morphine scored at most 0.2, cocaine at least 0.85, on the same analysis.
+        self.assertEqual(
+            self.get_ids(substance=["morphine,,0.2", "cocaine,0.85"]),
+            [self.both_cocaines.id],
+        )
+
+    def test_polish_names(self):
+        ids = self.get_ids(substance_pl=["morf,0.9"])
+        self.assertEqual(ids, [self.morphine_only.id])
+
+    def test_invalid_condition_is_rejected(self):
+        for params in [
+            {"substance": "cocaine,high"},
+            {"substance": ",0.5"},
+            {"substance": "cocaine,0.9,0.1"},
+            {"substance": "cocaine", "substance_match": "some"},
+        ]:
+            with self.subTest(**params):
+                response = self.client.get(self.url, params)
+                self.assertEqual(response.status_code, 400)
+
+    def test_filter_is_a_single_exists_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.get(substance=["cocaine,0.5", "morphine,,0.2"], pagination="cursor")
+
+        (query,) = [
+            q["sql"]
+            for q in queries.captured_queries
+            if "analysis_videoanalysis" in q["sql"]
+        ]
+        self.assertEqual(query.upper().count("EXISTS"), 2)
+        self.assertNotIn("GROUP BY", query.upper())
@@ -0,0 +1,145 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from tests.common import TestFixtures
+from videoprocessor.services.video_dedup_service import VideoDedupService
+from videoprocessor.services.video_processing_service import VideoProcessingService
+from ..models import AnalysisResult, Substance, User, VideoAnalysis
+
+
+def create_user() -> User:
+    user_data = TestFixtures.get_test_user_data()
+    return User.objects.create_user(
+        username=user_data["username"],
+        email=user_data["email"],
+        password=user_data["password"],
+    )
+
+
+class TopPredictionMaintenanceTest(TestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.analysis = VideoAnalysis.objects.create(
+            user=self.user, status=VideoAnalysis.Status.PROCESSING
+        )
+
+    def test_saving_results_sets_top_prediction(self):
+        VideoProcessingService.save_analysis_results(
+            self.analysis, {"morphine": 0.3, "cocaine": 0.9, "ethanol": 0.1}
+        )
+
+        self.analysis.refresh_from_db()
+        self.assertEqual(self.analysis.top_substance.name_en, "cocaine")
+        self.assertEqual(self.analysis.top_confidence, 0.9)
+
+    def test_copied_results_set_top_prediction(self):
+        VideoProcessingService.save_analysis_results(
+            self.analysis, {"morphine": 0.7, "cocaine": 0.2}
+        )
+        self.analysis.status = VideoAnalysis.Status.COMPLETED
+        target = VideoAnalysis.objects.create(user=self.user)
+
+        self.assertTrue(VideoDedupService.copy_results(self.analysis, target))
+
+        target.refresh_from_db()
+        self.assertEqual(target.top_substance.name_en, "morphine")
+        self.assertEqual(target.top_confidence, 0.7)
+
+    def test_refresh_without_results_clears_top_prediction(self):
+        VideoProcessingService.save_analysis_results(self.analysis, {"cocaine": 0.9})
+        self.analysis.analysis_results.all().delete()
+
+        VideoAnalysis.objects.filter(id=self.analysis.id).refresh_top_prediction()
+
+        self.analysis.refresh_from_db()
+        self.assertIsNone(self.analysis.top_substance)
+        self.assertIsNone(self.analysis.top_confidence)
+
+
+class BackfillTopPredictionCommandTest(TestCase):
+    def test_backfills_in_batches(self):
+        user = create_user()
+        substances = [Substance.objects.create(name_en=f"s{i}") for i in range(2)]
+        analyses = VideoAnalysis.objects.bulk_create(
+            VideoAnalysis(user=user, status=VideoAnalysis.Status.COMPLETED)
+            for _ in range(5)
+        )
+        AnalysisResult.objects.bulk_create(
+            AnalysisResult(
+                analysis=analysis,
+                substance=substance,
+                confidence_score=0.1 * (i + 1) + 0.5 * j,
+            )
+            for i, analysis in enumerate(analyses)
+            for j, substance in enumerate(substances)
+        )
+
+        out = StringIO()
+        call_command("backfill_top_prediction", batch_size=2, stdout=out)
+
+        self.assertIn("backfilled for 5 analyses", out.getvalue())
+        for i, analysis in enumerate(analyses):
+            analysis.refresh_from_db()
+            self.assertEqual(analysis.top_substance, substances[1])
+            self.assertAlmostEqual(analysis.top_confidence, 0.1 * (i + 1) + 0.5)
+
+
+class TopPredictionFilterTest(APITestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.client.force_authenticate(user=self.user)
+        self.cocaine = Substance.objects.create(name_en="cocaine", name_pl="kokaina")
+        self.morphine = Substance.objects.create(name_en="morphine", name_pl="morfina")
+        self.analyses = {
+            (substance.name_en, score): VideoAnalysis.objects.create(
+                user=self.user,
+                status=VideoAnalysis.Status.COMPLETED,
+                top_substance=substance,
+                top_confidence=score,
+            )
+            for substance, score in [
+                (self.cocaine, 0.95),
+                (self.cocaine, 0.4),
+                (self.morphine, 0.8),
+            ]
+        }
+
+        patcher = patch(
+            "patients.services.patient_service.patient_service.get_patients_by_guids",
+            return_value={},
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get_ids(self, **params) -> list[int]:
+        response = self.client.get(reverse("analysis:analysis-id-list"), params)
+        self.assertEqual(response.status_code, 200)
+        return [r["id"] for r in response.data["results"]]
+
+    def test_filter_by_top_substance_and_confidence(self):
+        ids = self.get_ids(top_substance_name="coca", min_top_confidence=0.9)
+        self.assertEqual(ids, [self.analyses[("cocaine", 0.95)].id])
+
+        ids = self.get_ids(top_substance_name_pl="morf")
+        self.assertEqual(ids, [self.analyses[("morphine", 0.8)].id])
+
+    def test_order_by_top_confidence(self):
+        ids = self.get_ids(ordering="-top_confidence")
+        expected = [
+            self.analyses[k].id for k in sorted(self.analyses, key=lambda k: -k[1])
+        ]
+        self.assertEqual(ids, expected)
+
+    def test_list_renders_top_prediction(self):
+        response = self.client.get(
+            reverse("analysis:analysis-list"), {"ordering": "-top_confidence"}
+        )
+
+        first = response.data["results"][0]
+        self.assertEqual(first["top_substance"]["name_en"], "cocaine")
+        self.assertEqual(first["top_confidence"], 0.95)
@@ -0,0 +1,150 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import TestCase
+from django.utils import timezone
+
+from tests.common import TestFixtures, cleanup_test_media
+from ..models import User, VideoAnalysis
+from ..services.video_expiry import VideoExpiryService
+from ..tasks import expire_videos_task
+
+
+VIDEO_CONTENT = b"expired video content"
+
+
+class VideoExpiryTest(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        cleanup_test_media()
+        super().tearDownClass()
+
+    def setUp(self):
+        user_data = TestFixtures.get_test_user_data()
+        self.user = User.objects.create_user(
+            username=user_data["username"],
+            email=user_data["email"],
+            password=user_data["password"],
+        )
+
+    def make_analysis(
+        self,
+        age_days: int,
+        status=VideoAnalysis.Status.COMPLETED,
+        video_name: str | None = None,
+    ) -> VideoAnalysis:
+        analysis = VideoAnalysis.objects.create(user=self.user, status=status)
+        if video_name is None:
+            analysis.video.save("video.mp4", ContentFile(VIDEO_CONTENT), save=True)
+        else:
+            analysis.video.name = video_name
+            analysis.save()
+        VideoAnalysis.objects.filter(id=analysis.id).update(
+            created_at=timezone.now() - timedelta(days=age_days)
+        )
+        analysis.refresh_from_db()
+        return analysis
+
+    def test_expired_video_is_deleted_and_recorded(self):
+        analysis = self.make_analysis(age_days=30)
+        name = analysis.video.name
+
+        stats = VideoExpiryService.expire_videos()
+
+        self.assertFalse(default_storage.exists(name))
+        analysis.refresh_from_db()
+        self.assertFalse(analysis.video)
+        self.assertIsNotNone(analysis.video_expired_at)
+        self.assertEqual(analysis.video_reclaimed_bytes, len(VIDEO_CONTENT))
+        self.assertEqual(stats["videos"], 1)
+        self.assertEqual(stats["reclaimed_bytes"], len(VIDEO_CONTENT))
+
+    def test_recent_and_unfinished_videos_are_kept(self):
+        recent = self.make_analysis(age_days=1)
+        stuck = self.make_analysis(age_days=30, status=VideoAnalysis.Status.PENDING)
+
+        stats = VideoExpiryService.expire_videos()
+
+        self.assertEqual(stats["videos"], 0)
+        for analysis in (recent, stuck):
+            self.assertTrue(default_storage.exists(analysis.video.name))
+            analysis.refresh_from_db()
+            self.assertTrue(analysis.video)
+
+    def test_blob_shared_with_live_analysis_is_kept(self):
+        expired = self.make_analysis(age_days=30)
+        live = self.make_analysis(age_days=1, video_name=expired.video.name)
+
+        VideoExpiryService.expire_videos()
+
+        self.assertTrue(default_storage.exists(live.video.name))
+        expired.refresh_from_db()
+        self.assertFalse(expired.video)
+        self.assertEqual(expired.video_reclaimed_bytes, 0)
+
+    def test_blob_shared_by_expired_analyses_is_counted_once(self):
+        first = self.make_analysis(age_days=30)
+        second = self.make_analysis(age_days=20, video_name=first.video.name)
+
+        stats = VideoExpiryService.expire_videos()
+
+        self.assertFalse(default_storage.exists(first.video.name))
+        self.assertEqual(stats["videos"], 2)
+        self.assertEqual(stats["reclaimed_bytes"], len(VIDEO_CONTENT))
+        second.refresh_from_db()
+        self.assertFalse(second.video)
+
+    def test_run_is_bounded_and_resumes(self):
+        analyses = [self.make_analysis(age_days=30) for _ in range(5)]
+
+        first = VideoExpiryService.expire_videos(batch_size=2, max_batches=1)
+        second = VideoExpiryService.expire_videos(batch_size=2, max_batches=10)
+
+        self.assertEqual(first["videos"], 2)
+        self.assertEqual(second["videos"], 3)
+        self.assertEqual(second["batches"], 2)
+        for analysis in analyses:
+            analysis.refresh_from_db()
+            self.assertFalse(analysis.video)
+
+    def test_already_deleted_blob_is_still_cleared(self):
+        analysis = self.make_analysis(age_days=30)
+        default_storage.delete(analysis.video.name)
+
+        VideoExpiryService.expire_videos()
+
+        analysis.refresh_from_db()
+        self.assertFalse(analysis.video)
+        self.assertEqual(analysis.video_reclaimed_bytes, 0)
+
+    def test_failed_deletion_leaves_row_for_next_run(self):
+        failing = self.make_analysis(age_days=30)
+        other = self.make_analysis(age_days=30)
+        real_delete = default_storage.delete
+
+        def delete(name):
+            if name == failing.video.name:
+                raise OSError("storage unavailable")
+            real_delete(name)
+
+        with patch.object(default_storage, "delete", side_effect=delete):
+            stats = VideoExpiryService.expire_videos()
+
+        self.assertEqual(stats["videos"], 1)
+        failing.refresh_from_db()
+        other.refresh_from_db()
+        self.assertTrue(failing.video)
+        self.assertFalse(other.video)
+
+        VideoExpiryService.expire_videos()
+        failing.refresh_from_db()
+        self.assertFalse(failing.video)
+
+    def test_task_runs_expiry(self):
+        self.make_analysis(age_days=30)
+
+        stats = expire_videos_task()
+
+        self.assertEqual(stats["videos"], 1)
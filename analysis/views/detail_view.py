@@ -11,8 +11,26 @@ class VideoAnalysisDetailView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = VideoAnalysisSerializer
     permission_classes = [permissions.IsAuthenticated]
 
+    # The only columns a PATCH writes. The status columns belong to the worker,
+    # and rewriting them from the copy loaded at the start of the request
+    # could undo a run that finished meanwhile.
+    editable_fields = (
+        "description",
+        "patient_guid",
+        "actual_substance",
+        "user_feedback",
+    )
+
     def get_queryset(self):
-        return VideoAnalysis.objects.filter(user=self.request.user)
+        if getattr(self, "swagger_fake_view", False):
+            return VideoAnalysis.objects.none()
+        return AnalysisService.get_user_analyses(self.request.user)
+
+    def get_object(self):
+        # The serializer context needs the object too; load it only once.
+        if not hasattr(self, "_object"):
+            self._object = super().get_object()
+        return self._object
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
@@ -22,3 +40,13 @@ class VideoAnalysisDetailView(generics.RetrieveUpdateDestroyAPIView):
         context["patient_details_map"] = patient_details_map
 
         return context
+
+    def perform_update(self, serializer):
+        analysis = serializer.instance
+        changed = [
+            name for name in self.editable_fields if name in serializer.validated_data
+        ]
+        for name in changed:
+            setattr(analysis, name, serializer.validated_data[name])
+        if changed:
+            analysis.save(update_fields=changed)
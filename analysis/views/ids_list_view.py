@@ -1,18 +1,37 @@
 from typing import Any
-from rest_framework import generics, permissions, filters
+from rest_framework import generics, permissions
 from django_filters.rest_framework import DjangoFilterBackend
 from analysis.models import VideoAnalysis
 from ..serializers import VideoAnalysisIdSerializer
-from ..filters import VideoAnalysisFilter
+from ..filters import (
+    StableOrderingFilter,
+    SubstanceConditionFilter,
+    VideoAnalysisFilter,
+)
+from ..pagination import AnalysisPagination
 
 
 class VideoAnalysisIdListView(generics.ListAPIView):
     serializer_class = VideoAnalysisIdSerializer
     permission_classes = [permissions.IsAuthenticated]
-    filter_backends: Any = [DjangoFilterBackend, filters.OrderingFilter]
+    filter_backends: Any = [
+        DjangoFilterBackend,
+        SubstanceConditionFilter,
+        StableOrderingFilter,
+    ]
     filterset_class = VideoAnalysisFilter
+    pagination_class = AnalysisPagination
 
-    ordering_fields = ["description", "created_at", "completed_at", "status"]
+    ordering_fields = [
+        "description",
+        "created_at",
+        "completed_at",
+        "status",
+        "top_confidence",
+        "patient_last_name",
+        "patient_first_name",
+        "patient_birth_date",
+    ]
 
     ordering = ["-created_at"]  # default ordering
 
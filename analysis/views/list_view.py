@@ -1,10 +1,20 @@
 from typing import Any
-from rest_framework import generics, permissions, filters
+from rest_framework import generics, permissions
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
 from analysis.models import VideoAnalysis
 from analysis.services.analysis import AnalysisService
-from ..serializers import VideoAnalysisSerializer
-from ..filters import VideoAnalysisFilter
+from analysis.services.patient_projection import PatientProjectionService
+from ..serializers import PatientGroupSerializer, VideoAnalysisSerializer
+from ..filters import (
+    StableOrderingFilter,
+    SubstanceConditionFilter,
+    VideoAnalysisFilter,
+)
+from ..pagination import AnalysisPagination
 import logging
 
 logger: logging.Logger = logging.getLogger(__name__)
@@ -13,26 +23,76 @@ logger: logging.Logger = logging.getLogger(__name__)
 class VideoAnalysisListView(generics.ListCreateAPIView):
     serializer_class = VideoAnalysisSerializer
     permission_classes = [permissions.IsAuthenticated]
-    filter_backends: Any = [DjangoFilterBackend, filters.OrderingFilter]
+    filter_backends: Any = [
+        DjangoFilterBackend,
+        SubstanceConditionFilter,
+        StableOrderingFilter,
+    ]
     filterset_class = VideoAnalysisFilter
+    pagination_class = AnalysisPagination
 
-    ordering_fields = ["description", "created_at", "completed_at", "status"]
+    ordering_fields = [
+        "description",
+        "created_at",
+        "completed_at",
+        "status",
+        "top_confidence",
+        "patient_last_name",
+        "patient_first_name",
+        "patient_birth_date",
+    ]
 
     ordering = ["-created_at"]  # default ordering
 
     def get_queryset(self):
         if getattr(self, "swagger_fake_view", False):
             return VideoAnalysis.objects.none()
-        return VideoAnalysis.objects.filter(user=self.request.user)
-
-    def get_serializer_context(self):
-        context = super().get_serializer_context()
+        return AnalysisService.get_user_analyses(self.request.user)
 
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="group_by",
+                type=OpenApiTypes.STR,
+                enum=["patient"],
+                location=OpenApiParameter.QUERY,
+                description=(
+                    "Return one entry per patient of the filtered analyses, "
+                    "ordered by patient name, instead of the analyses"
+                ),
+                required=False,
+            )
+        ]
+    )
+    def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
-        patient_details_map = AnalysisService.get_patients_details_map(list(queryset))
-        context["patient_details_map"] = patient_details_map
+        if request.query_params.get("group_by") == "patient":
+            return self.list_patient_groups(queryset)
+
+        page = self.paginate_queryset(queryset)
+        analyses = page if page is not None else list(queryset)
+
+        # Patient data is fetched for the rendered page only, never for the
+        # whole filtered history.
+        context = self.get_serializer_context()
+        context["patient_details_map"] = AnalysisService.get_patients_details_map(
+            analyses
+        )
+        serializer = self.get_serializer_class()(analyses, many=True, context=context)
+
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
 
-        return context
+    def list_patient_groups(self, queryset):
+        groups = PatientProjectionService.group_by_patient(queryset)
+        paginator = PageNumberPagination()
+        page = paginator.paginate_queryset(groups, self.request, view=self)
+        serializer = PatientGroupSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        analysis = serializer.save(user=self.request.user)
+        serializer.context["patient_details_map"] = (
+            AnalysisService.get_patient_details_for_analysis(analysis)
+        )
@@ -4,6 +4,7 @@ import sys
 import os
 import environ
 from celery.schedules import crontab
+from kombu import Exchange, Queue
 from typing import Any
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -37,6 +38,23 @@ if DEBUG is False and not IS_TESTING:
 ML_ENDPOINT_URL: str = env_get(
     "ML_ENDPOINT_URL", default="http://127.0.0.1:8001/predict"
 )
+ML_CONNECT_TIMEOUT_SECONDS: float = env_get.float(
+    "ML_CONNECT_TIMEOUT_SECONDS", default=5.0
+)
+ML_READ_TIMEOUT_SECONDS: float = env_get.float("ML_READ_TIMEOUT_SECONDS", default=600.0)
+ML_MAX_RETRIES: int = env_get.int("ML_MAX_RETRIES", default=3)
+ML_RETRY_BACKOFF_SECONDS: float = env_get.float("ML_RETRY_BACKOFF_SECONDS", default=1.0)
+ML_RETRY_BACKOFF_MAX_SECONDS: float = env_get.float(
+    "ML_RETRY_BACKOFF_MAX_SECONDS", default=30.0
+)
+ML_POOL_SIZE: int = env_get.int("ML_POOL_SIZE", default=4)
+ML_MODEL_VERSION: str = env_get("ML_MODEL_VERSION", default="default")
+ML_PREDICTION_CACHE_ENABLED: bool = env_get.bool(
+    "ML_PREDICTION_CACHE_ENABLED", default=True
+)
+ML_PREDICTION_CACHE_TTL_SECONDS: int = env_get.int(
+    "ML_PREDICTION_CACHE_TTL_SECONDS", default=30 * 24 * 60 * 60
+)
 
 MOCK_ML: bool = env_get("MOCK_ML", default=False)
 DEFAULT_PAGE_SIZE = 6
@@ -52,7 +70,135 @@ CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = "UTC"
 
+# Each pipeline stage gets its own queue so long ML calls cannot starve short
+# ingest or housekeeping tasks, and each queue can be scaled on its own worker.
+CELERY_QUEUE_INGEST = "ingest"
+CELERY_QUEUE_INFERENCE = "inference"
+CELERY_QUEUE_REPORTS = "reports"
+CELERY_QUEUE_MAINTENANCE = "maintenance"
+
+CELERY_TASK_QUEUES = tuple(
+    Queue(name, Exchange(name), routing_key=name)
+    for name in (
+        CELERY_QUEUE_INGEST,
+        CELERY_QUEUE_INFERENCE,
+        CELERY_QUEUE_REPORTS,
+        CELERY_QUEUE_MAINTENANCE,
+    )
+)
+CELERY_TASK_DEFAULT_QUEUE = CELERY_QUEUE_MAINTENANCE
+CELERY_TASK_DEFAULT_EXCHANGE = CELERY_QUEUE_MAINTENANCE
+CELERY_TASK_DEFAULT_ROUTING_KEY = CELERY_QUEUE_MAINTENANCE
+CELERY_TASK_ROUTES = {
+    "videoprocessor.tasks.ingest_video_task": {"queue": CELERY_QUEUE_INGEST},
+    "videoprocessor.tasks.process_video_task": {"queue": CELERY_QUEUE_INFERENCE},
+    "videoprocessor.tasks.reap_stuck_analyses": {"queue": CELERY_QUEUE_MAINTENANCE},
+    "reports.tasks.*": {"queue": CELERY_QUEUE_REPORTS},
+    "analysis.tasks.*": {"queue": CELERY_QUEUE_MAINTENANCE},
+    "patients.tasks.*": {"queue": CELERY_QUEUE_MAINTENANCE},
+}
+
+# Tasks are acknowledged only after they finish, so a crashed worker's message is
+# redelivered instead of lost. Prefetch is one per process by default; the worker
+# profiles in supervisord.conf/docker-compose.yml raise it for short-task queues.
+CELERY_TASK_ACKS_LATE = True
+CELERY_TASK_REJECT_ON_WORKER_LOST = True
+CELERY_WORKER_PREFETCH_MULTIPLIER: int = env_get.int(
+    "CELERY_WORKER_PREFETCH_MULTIPLIER", default=1
+)
+
+CELERY_TASK_SOFT_TIME_LIMIT: int = env_get.int(
+    "CELERY_TASK_SOFT_TIME_LIMIT", default=10 * 60
+)
+CELERY_TASK_TIME_LIMIT: int = env_get.int("CELERY_TASK_TIME_LIMIT", default=15 * 60)
+CELERY_INGEST_SOFT_TIME_LIMIT: int = env_get.int(
+    "CELERY_INGEST_SOFT_TIME_LIMIT", default=5 * 60
+)
+CELERY_INGEST_TIME_LIMIT: int = env_get.int("CELERY_INGEST_TIME_LIMIT", default=6 * 60)
+# Inference limits must outlast every ML retry (read timeout x retries + backoff).
+CELERY_INFERENCE_SOFT_TIME_LIMIT: int = env_get.int(
+    "CELERY_INFERENCE_SOFT_TIME_LIMIT", default=45 * 60
+)
+CELERY_INFERENCE_TIME_LIMIT: int = env_get.int(
+    "CELERY_INFERENCE_TIME_LIMIT", default=50 * 60
+)
+CELERY_TASK_ANNOTATIONS = {
+    "videoprocessor.tasks.ingest_video_task": {
+        "soft_time_limit": CELERY_INGEST_SOFT_TIME_LIMIT,
+        "time_limit": CELERY_INGEST_TIME_LIMIT,
+    },
+    "videoprocessor.tasks.process_video_task": {
+        "soft_time_limit": CELERY_INFERENCE_SOFT_TIME_LIMIT,
+        "time_limit": CELERY_INFERENCE_TIME_LIMIT,
+    },
+}
+
+# With acks_late on Redis, an unacknowledged message is redelivered once the
+# visibility timeout passes, so it has to exceed the longest hard time limit.
+CELERY_BROKER_TRANSPORT_OPTIONS = {
+    "visibility_timeout": max(CELERY_TASK_TIME_LIMIT, CELERY_INFERENCE_TIME_LIMIT)
+    + 10 * 60,
+}
+
 VIDEO_LIFETIME_DAYS: int = env_get.int("VIDEO_LIFETIME_DAYS", default=14)
+VIDEO_EXPIRY_BATCH_SIZE: int = env_get.int("VIDEO_EXPIRY_BATCH_SIZE", default=200)
+VIDEO_EXPIRY_MAX_BATCHES: int = env_get.int("VIDEO_EXPIRY_MAX_BATCHES", default=25)
+VIDEO_EXPIRY_DELETE_WORKERS: int = env_get.int("VIDEO_EXPIRY_DELETE_WORKERS", default=8)
+SUBSTANCE_CATALOG_CHECK_SECONDS: float = env_get.float(
+    "SUBSTANCE_CATALOG_CHECK_SECONDS", default=5.0
+)
+# "redis" shares analysis leases between all workers through REDIS_URL; "local"
+# keeps them in the worker process and is only safe with a single worker.
+ANALYSIS_LEASE_BACKEND: str = env_get(
+    "ANALYSIS_LEASE_BACKEND", default="local" if IS_TESTING else "redis"
+)
+ANALYSIS_LEASE_TTL_SECONDS: float = env_get.float(
+    "ANALYSIS_LEASE_TTL_SECONDS", default=60.0
+)
+ANALYSIS_HEARTBEAT_SECONDS: float = env_get.float(
+    "ANALYSIS_HEARTBEAT_SECONDS", default=30.0
+)
+ANALYSIS_HEARTBEAT_TIMEOUT_SECONDS: int = env_get.int(
+    "ANALYSIS_HEARTBEAT_TIMEOUT_SECONDS", default=5 * 60
+)
+ANALYSIS_MAX_PROCESSING_ATTEMPTS: int = env_get.int(
+    "ANALYSIS_MAX_PROCESSING_ATTEMPTS", default=3
+)
+# INGESTING/PENDING analyses waiting longer than this have their task looked up
+# in the result backend and the broker; only a task that is gone is sent again.
+ANALYSIS_QUEUED_TIMEOUT_SECONDS: int = env_get.int(
+    "ANALYSIS_QUEUED_TIMEOUT_SECONDS", default=30 * 60
+)
+ANALYSIS_MAX_TASK_RESENDS: int = env_get.int("ANALYSIS_MAX_TASK_RESENDS", default=3)
+ANALYSIS_REAPER_INTERVAL_SECONDS: int = env_get.int(
+    "ANALYSIS_REAPER_INTERVAL_SECONDS", default=60
+)
+DEDUP_REUSE_RESULTS: bool = env_get.bool("DEDUP_REUSE_RESULTS", default=True)
+DIRECT_UPLOAD_URL_EXPIRY_SECONDS: int = env_get.int(
+    "DIRECT_UPLOAD_URL_EXPIRY_SECONDS", default=15 * 60
+)
+# UPLOADING analyses older than this are failed by the reaper. Keep it above the
+# URL expiry so a client that finished its PUT still has time to complete.
+DIRECT_UPLOAD_ABANDONED_AFTER_SECONDS: int = env_get.int(
+    "DIRECT_UPLOAD_ABANDONED_AFTER_SECONDS", default=60 * 60
+)
+
+# ACTIVE chunked upload sessions without a new chunk for this long are expired
+# by the reaper and their staged bytes are deleted.
+CHUNKED_UPLOAD_ABANDONED_AFTER_SECONDS: int = env_get.int(
+    "CHUNKED_UPLOAD_ABANDONED_AFTER_SECONDS", default=24 * 60 * 60
+)
+
+CELERY_BEAT_SCHEDULE = {
+    "reap-stuck-analyses": {
+        "task": "videoprocessor.tasks.reap_stuck_analyses",
+        "schedule": timedelta(seconds=ANALYSIS_REAPER_INTERVAL_SECONDS),
+    },
+    "expire-videos": {
+        "task": "analysis.tasks.expire_videos_task",
+        "schedule": crontab(minute=15),
+    },
+}
 
 PATIENT_SERVICE_URL: str = env_get(
     "PATIENT_SERVICE_URL", default="http://localhost:8001/api/v1"
@@ -60,6 +206,50 @@ PATIENT_SERVICE_URL: str = env_get(
 MOCK_PATIENT_SERVICE: bool = env_get("MOCK_PATIENT_SERVICE", default=False)
 PATIENT_API_TOKEN: str = env_get("PATIENT_API_TOKEN", default="default-token")
 
+# Patient lookups are fresh for the soft TTL; until the hard TTL they are still
+# served while a background task refetches them. Patients the service does not
+# know are remembered for the negative TTL.
+PATIENT_CACHE_SOFT_TTL_SECONDS: int = env_get.int(
+    "PATIENT_CACHE_SOFT_TTL_SECONDS", default=60
+)
+PATIENT_CACHE_HARD_TTL_SECONDS: int = env_get.int(
+    "PATIENT_CACHE_HARD_TTL_SECONDS", default=60 * 60
+)
+PATIENT_CACHE_NEGATIVE_TTL_SECONDS: int = env_get.int(
+    "PATIENT_CACHE_NEGATIVE_TTL_SECONDS", default=30
+)
+
+# Local copy of the patient directory. When enabled, patient filters and list
+# enrichment read the mirror instead of calling the patient service, and beat
+# pulls changed records every PATIENT_MIRROR_SYNC_INTERVAL_SECONDS.
+USE_PATIENT_MIRROR: bool = env_get.bool("USE_PATIENT_MIRROR", default=False)
+PATIENT_MIRROR_SYNC_INTERVAL_SECONDS: int = env_get.int(
+    "PATIENT_MIRROR_SYNC_INTERVAL_SECONDS", default=300
+)
+PATIENT_MIRROR_SYNC_PAGE_SIZE: int = env_get.int(
+    "PATIENT_MIRROR_SYNC_PAGE_SIZE", default=200
+)
+# Patients referenced by analyses are also kept in the mirror table, refreshed
+# in batches, so the analysis list can sort and group by patient attributes.
+PATIENT_PROJECTION_BATCH_SIZE: int = env_get.int(
+    "PATIENT_PROJECTION_BATCH_SIZE", default=200
+)
+PATIENT_PROJECTION_MAX_AGE_SECONDS: int = env_get.int(
+    "PATIENT_PROJECTION_MAX_AGE_SECONDS", default=3600
+)
+PATIENT_PROJECTION_REFRESH_INTERVAL_SECONDS: int = env_get.int(
+    "PATIENT_PROJECTION_REFRESH_INTERVAL_SECONDS", default=300
+)
+CELERY_BEAT_SCHEDULE["refresh-patient-projection"] = {
+    "task": "analysis.tasks.refresh_patient_projection_task",
+    "schedule": timedelta(seconds=PATIENT_PROJECTION_REFRESH_INTERVAL_SECONDS),
+}
+if USE_PATIENT_MIRROR:
+    CELERY_BEAT_SCHEDULE["sync-patient-mirror"] = {
+        "task": "patients.tasks.sync_patient_mirror_task",
+        "schedule": timedelta(seconds=PATIENT_MIRROR_SYNC_INTERVAL_SECONDS),
+    }
+
 REDIS_URL: str = env_get("REDIS_URL", default="redis://localhost:6379/1")
 
 # Application definition
@@ -91,6 +281,7 @@ INSTALLED_APPS = [
     "analysis",
     "reports",
     "patients",
+    "videoprocessor",
     "storages",
 ]
 
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from patients.services.patient_cache import PatientCache
+
+
+class Command(BaseCommand):
+    help = "Show patient lookup cache hit/stale/miss counters."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--reset-stats",
+            action="store_true",
+            help="Reset the hit, stale and miss counters.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        if options["reset_stats"]:
+            PatientCache.reset_stats()
+            self.stdout.write(self.style.SUCCESS("Patient cache stats reset."))
+
+        for name, value in PatientCache.get_stats().items():
+            self.stdout.write(f"{name}: {value}")
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from larvixon_site.settings import PATIENT_MIRROR_SYNC_PAGE_SIZE
+from patients.services import patient_mirror, patient_service
+
+
+class Command(BaseCommand):
+    help = "Copy patients from the patient service into the local mirror."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Reload every patient and drop those the service no longer has.",
+        )
+        parser.add_argument(
+            "--page-size",
+            type=int,
+            default=PATIENT_MIRROR_SYNC_PAGE_SIZE,
+            help="Number of patients requested per page.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        stats = patient_mirror.sync(
+            patient_service, full=options["full"], page_size=options["page_size"]
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Synced {stats['patients']} patients in {stats['pages']} pages, "
+                f"removed {stats['removed']}."
+            )
+        )
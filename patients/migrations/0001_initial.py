@@ -0,0 +1,56 @@
+# Generated by Django 5.2.5 on 2026-10-16 23:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="PatientRecord",
+            fields=[
+                ("guid", models.UUIDField(primary_key=True, serialize=False)),
+                (
+                    "pesel",
+                    models.CharField(
+                        blank=True, db_index=True, max_length=11, null=True
+                    ),
+                ),
+                ("first_name", models.CharField(blank=True, max_length=100)),
+                ("last_name", models.CharField(blank=True, max_length=100)),
+                ("birth_date", models.DateField(blank=True, null=True)),
+                ("gender", models.CharField(blank=True, max_length=20, null=True)),
+                ("phone", models.CharField(blank=True, max_length=50, null=True)),
+                ("email", models.CharField(blank=True, max_length=254, null=True)),
+                (
+                    "address_line",
+                    models.CharField(blank=True, max_length=255, null=True),
+                ),
+                ("city", models.CharField(blank=True, max_length=100, null=True)),
+                ("postal_code", models.CharField(blank=True, max_length=20, null=True)),
+                ("country", models.CharField(blank=True, max_length=50, null=True)),
+                (
+                    "source_updated_at",
+                    models.DateTimeField(
+                        blank=True,
+                        db_index=True,
+                        help_text="meta.lastUpdated of the record in the patient service",
+                        null=True,
+                    ),
+                ),
+                ("synced_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["last_name", "first_name"], name="patient_name_idx"
+                    ),
+                    models.Index(fields=["first_name"], name="patient_first_name_idx"),
+                ],
+            },
+        ),
+    ]
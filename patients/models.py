@@ -0,0 +1,69 @@
+from django.db import models
+
+
+class PatientRecord(models.Model):
+    """
+    Local mirror of a patient from the external patient service.
+
+    Kept current by PatientMirrorService.sync, so patient filters and list
+    enrichment can be answered from the database when USE_PATIENT_MIRROR is
+    enabled. The service stays the source of truth.
+    """
+
+    guid = models.UUIDField(primary_key=True)
+    pesel: models.CharField = models.CharField(
+        max_length=11, blank=True, null=True, db_index=True
+    )
+    first_name: models.CharField = models.CharField(max_length=100, blank=True)
+    last_name: models.CharField = models.CharField(max_length=100, blank=True)
+    birth_date: models.DateField = models.DateField(null=True, blank=True)
+    gender: models.CharField = models.CharField(max_length=20, blank=True, null=True)
+    phone: models.CharField = models.CharField(max_length=50, blank=True, null=True)
+    email: models.CharField = models.CharField(max_length=254, blank=True, null=True)
+    address_line: models.CharField = models.CharField(
+        max_length=255, blank=True, null=True
+    )
+    city: models.CharField = models.CharField(max_length=100, blank=True, null=True)
+    postal_code: models.CharField = models.CharField(
+        max_length=20, blank=True, null=True
+    )
+    country: models.CharField = models.CharField(max_length=50, blank=True, null=True)
+    source_updated_at: models.DateTimeField = models.DateTimeField(
+        null=True,
+        blank=True,
+        db_index=True,
+        help_text="meta.lastUpdated of the record in the patient service",
+    )
+    synced_at: models.DateTimeField = models.DateTimeField(auto_now=True)
+
+    # Fields of the patient dicts returned by the patient services.
+    DETAIL_FIELDS = (
+        "pesel",
+        "first_name",
+        "last_name",
+        "birth_date",
+        "gender",
+        "phone",
+        "email",
+        "address_line",
+        "city",
+        "postal_code",
+        "country",
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["last_name", "first_name"], name="patient_name_idx"),
+            models.Index(fields=["first_name"], name="patient_first_name_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.guid} - {self.first_name} {self.last_name}"
+
+    def as_dict(self) -> dict:
+        """The record in the shape returned by ``BasePatientService``."""
+        patient = {"id": str(self.guid)}
+        patient.update({field: getattr(self, field) for field in self.DETAIL_FIELDS})
+        if self.birth_date is not None:
+            patient["birth_date"] = self.birth_date.isoformat()
+        return patient
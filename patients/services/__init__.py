@@ -1 +1,5 @@
-from .patient_service import get_patient_service, patient_service
+from .patient_service import (
+    get_patient_service,
+    patient_mirror,
+    patient_service,
+)
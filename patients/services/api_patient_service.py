@@ -1,7 +1,7 @@
 import requests
-from typing import List
+from datetime import datetime
+from typing import Iterator, List
 import logging
-from django.core.cache import cache
 
 from larvixon_site.settings import (
     PATIENT_API_TOKEN,
@@ -11,15 +11,20 @@ from patients.errors import (
     PatientServiceResponseError,
 )
 from patients.services.base_patient_service import BasePatientService
+from patients.services.patient_cache import STALE, PatientCache
 
 logger: logging.Logger = logging.getLogger(__name__)
 
 PESEL_ID = "http://hl7.org/fhir/sid/pesel"
 TIMEOUT_SECONDS = 90
-CACHE_TIME_SECONDS = 60
 
 
 class APIPatientService(BasePatientService):
+    """
+    Patient lookups against the FHIR patient service, cached by PatientCache.
+    Stale cache entries are returned at once and refetched by a Celery task.
+    """
+
     def __init__(self, base_url: str) -> None:
         self.base_url = base_url
 
@@ -29,17 +34,40 @@ class APIPatientService(BasePatientService):
             "x-api-token": PATIENT_API_TOKEN,
         }
 
+    @staticmethod
+    def _search_key(
+        first_name: str | None, last_name: str | None, pesel: str | None
+    ) -> str:
+        return f"patient_search:first_name={first_name or ''}:last_name={last_name or ''}:pesel={pesel or ''}"
+
+    @staticmethod
+    def _patient_key(guid: str) -> str:
+        return f"patient:{guid}"
+
     def search_patients(
         self,
         first_name: str | None = None,
         last_name: str | None = None,
         pesel: str | None = None,
     ) -> List[dict]:
-        cache_key = f"patient_search:first_name={first_name or ''}:last_name={last_name or ''}:pesel={pesel or ''}"
-        cached = cache.get(cache_key)
-        if cached is not None:
-            return cached
+        cache_key = self._search_key(first_name, last_name, pesel)
+        cached = PatientCache.get(cache_key)
+        if cached.outcome == STALE and PatientCache.claim_refresh(cache_key):
+            self._schedule_refresh(
+                "refresh_cached_search_task", first_name, last_name, pesel
+            )
+        if cached.found:
+            return cached.value
+
+        return self.refresh_search(first_name, last_name, pesel)
 
+    def refresh_search(
+        self,
+        first_name: str | None = None,
+        last_name: str | None = None,
+        pesel: str | None = None,
+    ) -> List[dict]:
+        """Run the search against the service and cache the result."""
         try:
             url: str = f"{self.base_url}/api/patients"
             params = {}
@@ -63,7 +91,7 @@ class APIPatientService(BasePatientService):
                 resource: dict = entry.get("resource", {})
                 patients.append(self._parse_fhir_patient(resource))
 
-            cache.set(cache_key, patients, CACHE_TIME_SECONDS)
+            PatientCache.set(self._search_key(first_name, last_name, pesel), patients)
 
             return patients
 
@@ -79,10 +107,12 @@ class APIPatientService(BasePatientService):
             ) from e
 
     def get_patient_by_guid(self, guid: str) -> dict | None:
-        cache_key = f"patient:{guid}"
-        cached = cache.get(cache_key)
-        if cached is not None:
-            return cached
+        cache_key = self._patient_key(guid)
+        cached = PatientCache.get(cache_key)
+        if cached.outcome == STALE and PatientCache.claim_refresh(cache_key):
+            self._schedule_refresh("refresh_cached_patients_task", [guid])
+        if cached.found:
+            return cached.value
 
         try:
             url: str = f"{self.base_url}/api/patients/{guid}"
@@ -90,13 +120,14 @@ class APIPatientService(BasePatientService):
                 url, timeout=TIMEOUT_SECONDS, headers=self.api_headers
             )
             if response.status_code == 404:
+                PatientCache.set(cache_key, None)
                 return None
             response.raise_for_status()
 
             data = response.json()
             patient = self._parse_fhir_patient(data)
 
-            cache.set(cache_key, patient, CACHE_TIME_SECONDS)
+            PatientCache.set(cache_key, patient)
 
             return patient
         except requests.exceptions.RequestException as e:
@@ -115,23 +146,38 @@ class APIPatientService(BasePatientService):
             return {}
 
         results = {}
-        cache_keys = {guid: f"patient:{guid}" for guid in guids}
-        cached_patients = cache.get_many(cache_keys.values())
+        cache_keys = {guid: self._patient_key(guid) for guid in guids}
+        cached_patients = PatientCache.get_many(list(cache_keys.values()))
 
         uncached_guids = []
+        stale_guids = []
         for guid, cache_key in cache_keys.items():
-            cached = cached_patients.get(cache_key)
-            if cached is not None:
-                results[guid] = cached
-            else:
+            cached = cached_patients[cache_key]
+            if not cached.found:
                 uncached_guids.append(guid)
+                continue
+            if cached.value is not None:
+                results[guid] = cached.value
+            if cached.outcome == STALE and PatientCache.claim_refresh(cache_key):
+                stale_guids.append(guid)
+
+        if stale_guids:
+            self._schedule_refresh("refresh_cached_patients_task", stale_guids)
 
         if not uncached_guids:
             return results
 
+        results.update(self.refresh_patients(uncached_guids))
+        return results
+
+    def refresh_patients(self, guids: List[str]) -> dict[str, dict]:
+        """
+        Fetch ``guids`` in one request and cache them. GUIDs the service does
+        not return are cached as negative entries.
+        """
         try:
             url: str = f"{self.base_url}/api/patients/search-by-guids"
-            payload = {"guids": uncached_guids}
+            payload = {"guids": guids}
 
             response: requests.Response = requests.post(
                 url, json=payload, timeout=TIMEOUT_SECONDS, headers=self.api_headers
@@ -141,7 +187,7 @@ class APIPatientService(BasePatientService):
             data = response.json()
             entries: list = data.get("entry", [])
 
-            cache_batch = {}
+            results = {}
             for entry in entries:
                 resource: dict = entry.get("resource", {})
                 patient = self._parse_fhir_patient(resource)
@@ -149,11 +195,13 @@ class APIPatientService(BasePatientService):
 
                 if patient_guid:
                     results[str(patient_guid)] = patient
-                    cache_key = f"patient:{patient_guid}"
-                    cache_batch[cache_key] = patient
 
-            if cache_batch:
-                cache.set_many(cache_batch, CACHE_TIME_SECONDS)
+            PatientCache.set_many(
+                {
+                    self._patient_key(guid): results.get(guid)
+                    for guid in {*guids, *results}
+                }
+            )
 
             return results
 
@@ -168,6 +216,65 @@ class APIPatientService(BasePatientService):
                 f"Unexpected error processing patient data: {e}"
             ) from e
 
+    @staticmethod
+    def _schedule_refresh(task_name: str, *args) -> None:
+        # Import here to avoid circular import
+        from patients import tasks
+
+        try:
+            getattr(tasks, task_name).delay(*args)
+        except Exception as e:
+            logger.warning(f"Could not schedule patient cache refresh: {e}")
+
+    def iter_updated_patients(
+        self, since: datetime | None, page_size: int
+    ) -> Iterator[List[dict]]:
+        url: str | None = f"{self.base_url}/api/patients"
+        params: dict[str, str] = {"_count": str(page_size), "_sort": "_lastUpdated"}
+        if since is not None:
+            params["_lastUpdated"] = f"ge{since.isoformat()}"
+
+        first_page = True
+        while url:
+            try:
+                response: requests.Response = requests.get(
+                    url,
+                    # The next link of a FHIR bundle already carries the query.
+                    params=params if first_page else None,
+                    timeout=TIMEOUT_SECONDS,
+                    headers=self.api_headers,
+                )
+                response.raise_for_status()
+                data = response.json()
+            except requests.exceptions.RequestException as e:
+                logger.error(f"Error communicating with Patient Service: {e}")
+                raise PatientServiceUnavailableError(
+                    f"Patient service unavailable: {e}"
+                ) from e
+            except ValueError as e:
+                logger.error(f"Invalid response while listing changed patients: {e}")
+                raise PatientServiceResponseError(
+                    f"Unexpected error processing patient data: {e}"
+                ) from e
+
+            patients: list = []
+            for entry in data.get("entry", []):
+                resource: dict = entry.get("resource", {})
+                patient = self._parse_fhir_patient(resource)
+                patient["last_updated"] = resource.get("meta", {}).get("lastUpdated")
+                patients.append(patient)
+            yield patients
+
+            url = next(
+                (
+                    link.get("url")
+                    for link in data.get("link", [])
+                    if link.get("relation") == "next"
+                ),
+                None,
+            )
+            first_page = False
+
     def _parse_fhir_patient(self, fhir_resource: dict) -> dict:
         pesel = None
         identifiers = fhir_resource.get("identifier", [])
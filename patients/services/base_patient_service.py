@@ -1,6 +1,7 @@
 from uuid import UUID
 from abc import ABC, abstractmethod
-from typing import List
+from datetime import datetime
+from typing import Iterator, List
 import logging
 
 from patients.errors import (
@@ -31,6 +32,17 @@ class BasePatientService(ABC):
         """Get multiple patients by their GUIDs."""
         pass
 
+    @abstractmethod
+    def iter_updated_patients(
+        self, since: datetime | None, page_size: int
+    ) -> Iterator[List[dict]]:
+        """
+        Pages of patients changed at or after ``since`` (all when None), oldest
+        change first. Each patient also carries ``last_updated``, the time of
+        its latest change in the service, as an ISO 8601 string.
+        """
+        pass
+
     def validate_uuid(self, guid: str) -> None:
         """Validate that the provided GUID is a valid UUID."""
         try:
@@ -0,0 +1,164 @@
+import logging
+from datetime import datetime
+from typing import Iterator, List
+from uuid import UUID
+
+from django.db import transaction
+from django.db.models import Max, QuerySet
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from larvixon_site.settings import PATIENT_MIRROR_SYNC_PAGE_SIZE
+from patients.models import PatientRecord
+from patients.services.base_patient_service import BasePatientService
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+class MirrorPatientService(BasePatientService):
+    """
+    Patient lookups answered from the local PatientRecord mirror.
+
+    ``sync`` pulls the records changed since the newest ``source_updated_at``
+    already mirrored, so each run only transfers what changed. Records removed
+    from the service are only dropped by a full sync.
+    """
+
+    def search_queryset(
+        self,
+        first_name: str | None = None,
+        last_name: str | None = None,
+        pesel: str | None = None,
+    ) -> QuerySet[PatientRecord]:
+        records = PatientRecord.objects.all()
+        if first_name:
+            records = records.filter(first_name__icontains=first_name)
+        if last_name:
+            records = records.filter(last_name__icontains=last_name)
+        if pesel:
+            records = records.filter(pesel__contains=pesel)
+        return records
+
+    def search_patients(
+        self,
+        first_name: str | None = None,
+        last_name: str | None = None,
+        pesel: str | None = None,
+    ) -> List[dict]:
+        records = self.search_queryset(first_name, last_name, pesel)
+        return [record.as_dict() for record in records]
+
+    def get_patient_by_guid(self, guid: str) -> dict | None:
+        self.validate_uuid(guid)
+        record = PatientRecord.objects.filter(guid=guid).first()
+        return record.as_dict() if record else None
+
+    def get_patients_by_guids(self, guids: List[str]) -> dict[str, dict]:
+        if not guids:
+            return {}
+        records = PatientRecord.objects.filter(guid__in=guids)
+        return {str(record.guid): record.as_dict() for record in records}
+
+    def iter_updated_patients(
+        self, since: datetime | None, page_size: int
+    ) -> Iterator[List[dict]]:
+        records = PatientRecord.objects.order_by("source_updated_at", "guid")
+        if since is not None:
+            records = records.filter(source_updated_at__gte=since)
+
+        page: List[dict] = []
+        for record in records.iterator(chunk_size=page_size):
+            patient = record.as_dict()
+            patient["last_updated"] = (
+                record.source_updated_at.isoformat()
+                if record.source_updated_at
+                else None
+            )
+            page.append(patient)
+            if len(page) == page_size:
+                yield page
+                page = []
+        if page:
+            yield page
+
+    @staticmethod
+    def get_checkpoint() -> datetime | None:
+        return PatientRecord.objects.aggregate(latest=Max("source_updated_at"))[
+            "latest"
+        ]
+
+    @staticmethod
+    def to_record(patient: dict) -> PatientRecord | None:
+        try:
+            guid = UUID(str(patient.get("id")))
+        except ValueError:
+            logger.warning(f"Skipping patient with invalid id: {patient.get('id')}")
+            return None
+
+        fields = {field: patient.get(field) for field in PatientRecord.DETAIL_FIELDS}
+        fields["first_name"] = fields["first_name"] or ""
+        fields["last_name"] = fields["last_name"] or ""
+        try:
+            fields["birth_date"] = parse_date(fields["birth_date"] or "")
+        except ValueError:
+            fields["birth_date"] = None
+        return PatientRecord(
+            guid=guid,
+            source_updated_at=parse_datetime(patient.get("last_updated") or ""),
+            **fields,
+        )
+
+    @staticmethod
+    def upsert(
+        records: list[PatientRecord], with_source_updated_at: bool = True
+    ) -> None:
+        """
+        Insert or update ``records``. Lookups by GUID do not report when a
+        patient last changed, so their refreshes keep the stored
+        ``source_updated_at`` and with it the sync checkpoint.
+        """
+        update_fields = [*PatientRecord.DETAIL_FIELDS, "synced_at"]
+        if with_source_updated_at:
+            update_fields.append("source_updated_at")
+        PatientRecord.objects.bulk_create(
+            records,
+            update_conflicts=True,
+            unique_fields=["guid"],
+            update_fields=update_fields,
+        )
+
+    def sync(
+        self,
+        source: BasePatientService,
+        full: bool = False,
+        page_size: int = PATIENT_MIRROR_SYNC_PAGE_SIZE,
+    ) -> dict[str, int]:
+        """
+        Copy changed patients from ``source`` into the mirror, one transaction
+        per page. A full sync reloads everything and removes the records the
+        service no longer returns.
+        """
+        started = timezone.now()
+        since = None if full else self.get_checkpoint()
+        stats = {"pages": 0, "patients": 0, "removed": 0}
+
+        # Pages come oldest change first, so an interrupted run leaves a
+        # checkpoint the next run can safely resume from.
+        for page in source.iter_updated_patients(since, page_size):
+            records = [r for r in map(self.to_record, page) if r is not None]
+            with transaction.atomic():
+                self.upsert(records)
+            stats["pages"] += 1
+            stats["patients"] += len(records)
+
+        if full:
+            stats["removed"], _ = PatientRecord.objects.filter(
+                synced_at__lt=started
+            ).delete()
+
+        logger.info(
+            f"Synced {stats['patients']} patients in {stats['pages']} pages"
+            + (f", removed {stats['removed']}" if full else "")
+            + (f" (changed since {since.isoformat()})" if since else "")
+        )
+        return stats
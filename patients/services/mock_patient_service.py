@@ -1,4 +1,5 @@
-from typing import List
+from datetime import datetime
+from typing import Iterator, List
 import logging
 
 from patients.services.base_patient_service import BasePatientService
@@ -36,13 +37,17 @@ class MockPatientService(BasePatientService):
         mock_patient = self._get_mock_patient()
 
         if first_name or last_name or pesel:
+            # Like the real service, every given term has to match.
             if (
-                first_name
-                and first_name.lower() in mock_patient["first_name"].lower()
-                or last_name
-                and last_name.lower() in mock_patient["last_name"].lower()
-                or pesel
-                and pesel in mock_patient["pesel"]
+                (
+                    not first_name
+                    or first_name.lower() in mock_patient["first_name"].lower()
+                )
+                and (
+                    not last_name
+                    or last_name.lower() in mock_patient["last_name"].lower()
+                )
+                and (not pesel or pesel in mock_patient["pesel"])
             ):
                 return [mock_patient]
             return []
@@ -64,3 +69,13 @@ class MockPatientService(BasePatientService):
                 results[guid] = mock_patient
 
         return results
+
+    def iter_updated_patients(
+        self, since: datetime | None, page_size: int
+    ) -> Iterator[List[dict]]:
+        mock_patient = self._get_mock_patient()
+        mock_patient["last_updated"] = "2025-01-01T00:00:00+00:00"
+        if since is None or since <= datetime.fromisoformat(
+            mock_patient["last_updated"]
+        ):
+            yield [mock_patient]
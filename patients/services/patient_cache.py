@@ -0,0 +1,150 @@
+import time
+from typing import Any, Iterable
+
+from django.core.cache import cache
+
+from larvixon_site.settings import (
+    PATIENT_CACHE_HARD_TTL_SECONDS,
+    PATIENT_CACHE_NEGATIVE_TTL_SECONDS,
+    PATIENT_CACHE_SOFT_TTL_SECONDS,
+)
+
+CACHE_PREFIX = "patient_cache"
+HITS_KEY = f"{CACHE_PREFIX}:hits"
+STALE_KEY = f"{CACHE_PREFIX}:stale"
+MISSES_KEY = f"{CACHE_PREFIX}:misses"
+NEGATIVE_HITS_KEY = f"{CACHE_PREFIX}:negative_hits"
+
+HIT = "hit"
+STALE = "stale"
+MISS = "miss"
+
+
+class CacheEntry:
+    """A cached lookup: ``value`` is None for a patient the service lacks."""
+
+    def __init__(self, outcome: str, value: Any = None) -> None:
+        self.outcome = outcome
+        self.value = value
+
+    @property
+    def found(self) -> bool:
+        return self.outcome != MISS
+
+
+class PatientCache:
+    """
+    Stale-while-revalidate cache for patient service lookups.
+
+    An entry is fresh for PATIENT_CACHE_SOFT_TTL_SECONDS and is then served as
+    stale, while the caller refreshes it in the background, until
+    PATIENT_CACHE_HARD_TTL_SECONDS. Lookups of patients the service does not
+    know are stored as negative entries for PATIENT_CACHE_NEGATIVE_TTL_SECONDS
+    and are never stale. Each lookup counts as a hit, stale or miss.
+    """
+
+    @staticmethod
+    def _count(key: str, delta: int = 1) -> None:
+        if delta <= 0:
+            return
+        try:
+            cache.incr(key, delta)
+        except ValueError:
+            cache.add(key, 0, timeout=None)
+            cache.incr(key, delta)
+
+    @staticmethod
+    def _entry(stored: dict | None, now: float) -> CacheEntry:
+        if stored is None:
+            return CacheEntry(MISS)
+        if now < stored["fresh_until"]:
+            return CacheEntry(HIT, stored["value"])
+        # A negative entry that is past its TTL is never served.
+        if stored["value"] is None:
+            return CacheEntry(MISS)
+        return CacheEntry(STALE, stored["value"])
+
+    @staticmethod
+    def _record(entries: Iterable[CacheEntry]) -> None:
+        counts = {HITS_KEY: 0, STALE_KEY: 0, MISSES_KEY: 0, NEGATIVE_HITS_KEY: 0}
+        for entry in entries:
+            if entry.outcome == MISS:
+                counts[MISSES_KEY] += 1
+            elif entry.outcome == STALE:
+                counts[STALE_KEY] += 1
+            else:
+                counts[HITS_KEY] += 1
+                if entry.value is None:
+                    counts[NEGATIVE_HITS_KEY] += 1
+        for key, delta in counts.items():
+            PatientCache._count(key, delta)
+
+    @staticmethod
+    def get(key: str) -> CacheEntry:
+        entry = PatientCache._entry(cache.get(key), time.time())
+        PatientCache._record([entry])
+        return entry
+
+    @staticmethod
+    def get_many(keys: list[str]) -> dict[str, CacheEntry]:
+        now = time.time()
+        stored = cache.get_many(keys)
+        entries = {key: PatientCache._entry(stored.get(key), now) for key in keys}
+        PatientCache._record(entries.values())
+        return entries
+
+    @staticmethod
+    def _stored(value: Any) -> tuple[dict, int]:
+        if value is None:
+            ttl = PATIENT_CACHE_NEGATIVE_TTL_SECONDS
+            return {"value": None, "fresh_until": time.time() + ttl}, ttl
+        return {
+            "value": value,
+            "fresh_until": time.time() + PATIENT_CACHE_SOFT_TTL_SECONDS,
+        }, PATIENT_CACHE_HARD_TTL_SECONDS
+
+    @staticmethod
+    def set(key: str, value: Any) -> None:
+        """Store ``value``; None records that the service has no such patient."""
+        stored, ttl = PatientCache._stored(value)
+        cache.set(key, stored, timeout=ttl)
+
+    @staticmethod
+    def set_many(values: dict[str, Any]) -> None:
+        by_ttl: dict[int, dict[str, dict]] = {}
+        for key, value in values.items():
+            stored, ttl = PatientCache._stored(value)
+            by_ttl.setdefault(ttl, {})[key] = stored
+        for ttl, batch in by_ttl.items():
+            cache.set_many(batch, timeout=ttl)
+
+    @staticmethod
+    def claim_refresh(key: str) -> bool:
+        """
+        Whether the caller should refresh the stale entry ``key``. Only the
+        first caller within the soft TTL gets True, so a burst of requests
+        schedules one refresh.
+        """
+        return cache.add(
+            f"{CACHE_PREFIX}:refreshing:{key}",
+            1,
+            timeout=PATIENT_CACHE_SOFT_TTL_SECONDS,
+        )
+
+    @staticmethod
+    def get_stats() -> dict[str, int | float]:
+        hits = cache.get(HITS_KEY, 0)
+        stale = cache.get(STALE_KEY, 0)
+        misses = cache.get(MISSES_KEY, 0)
+        total = hits + stale + misses
+        return {
+            "hits": hits,
+            "negative_hits": cache.get(NEGATIVE_HITS_KEY, 0),
+            "stale": stale,
+            "misses": misses,
+            "hit_rate": round((hits + stale) / total, 4) if total else 0.0,
+        }
+
+    @staticmethod
+    def reset_stats() -> None:
+        cache.delete_many([HITS_KEY, STALE_KEY, MISSES_KEY, NEGATIVE_HITS_KEY])
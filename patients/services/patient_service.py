@@ -7,6 +7,7 @@ from larvixon_site.settings import (
 
 from patients.services.api_patient_service import APIPatientService
 from patients.services.base_patient_service import BasePatientService
+from patients.services.mirror_patient_service import MirrorPatientService
 from patients.services.mock_patient_service import MockPatientService
 
 logger: logging.Logger = logging.getLogger(__name__)
@@ -23,3 +24,4 @@ def get_patient_service() -> BasePatientService:
 
 
 patient_service: BasePatientService = get_patient_service()
+patient_mirror = MirrorPatientService()
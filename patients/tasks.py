@@ -0,0 +1,28 @@
+from celery import shared_task
+
+from patients.services.api_patient_service import APIPatientService
+from patients.services.patient_service import patient_mirror, patient_service
+
+
+@shared_task
+def sync_patient_mirror_task() -> dict[str, int]:
+    """Copy patients changed since the last sync into the local mirror."""
+    return patient_mirror.sync(patient_service)
+
+
+@shared_task
+def refresh_cached_patients_task(guids: list[str]) -> int:
+    """Refetch stale cached patients in one bulk lookup."""
+    if not isinstance(patient_service, APIPatientService):
+        return 0
+    return len(patient_service.refresh_patients(guids))
+
+
+@shared_task
+def refresh_cached_search_task(
+    first_name: str | None, last_name: str | None, pesel: str | None
+) -> int:
+    """Rerun a patient search whose cached result went stale."""
+    if not isinstance(patient_service, APIPatientService):
+        return 0
+    return len(patient_service.refresh_search(first_name, last_name, pesel))
@@ -0,0 +1,180 @@
+import time
+from io import StringIO
+from unittest.mock import Mock, patch
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+
+from patients.services.api_patient_service import APIPatientService
+from patients.services.patient_cache import PatientCache
+from patients.tasks import refresh_cached_patients_task
+
+GUID = "ab758f9b-0298-4823-b144-ae0db20bc215"
+MISSING_GUID = "0d9c1b0e-7f7e-4d43-9d54-4c1d6a4c0a11"
+
+
+def fhir_patient(guid: str, last_name: str) -> dict:
+    return {
+        "resourceType": "Patient",
+        "id": guid,
+        "name": [{"family": last_name, "given": ["Jan"]}],
+    }
+
+
+def response(status_code: int = 200, data: dict | None = None) -> Mock:
+    mock_response = Mock()
+    mock_response.status_code = status_code
+    mock_response.json.return_value = data or {}
+    return mock_response
+
+
+@patch("patients.services.patient_cache.PATIENT_CACHE_SOFT_TTL_SECONDS", 60)
+@patch("patients.services.patient_cache.PATIENT_CACHE_HARD_TTL_SECONDS", 3600)
+@patch("patients.services.patient_cache.PATIENT_CACHE_NEGATIVE_TTL_SECONDS", 30)
+class PatientCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.service = APIPatientService("http://patients.test")
+
+        self.now = time.time()
+        clock = patch("patients.services.patient_cache.time")
+        clock.start().time.side_effect = lambda: self.now
+        self.addCleanup(clock.stop)
+
+        get = patch("patients.services.api_patient_service.requests.get")
+        self.get = get.start()
+        self.addCleanup(get.stop)
+        post = patch("patients.services.api_patient_service.requests.post")
+        self.post = post.start()
+        self.addCleanup(post.stop)
+
+        self.refresh_patients = patch(
+            "patients.tasks.refresh_cached_patients_task.delay"
+        ).start()
+        self.refresh_search = patch(
+            "patients.tasks.refresh_cached_search_task.delay"
+        ).start()
+        self.addCleanup(patch.stopall)
+
+    def stats(self) -> tuple[int | float, int | float, int | float]:
+        stats = PatientCache.get_stats()
+        return stats["hits"], stats["stale"], stats["misses"]
+
+    def test_fresh_entry_is_a_hit(self):
+        self.get.return_value = response(data=fhir_patient(GUID, "Kowalski"))
+
+        first = self.service.get_patient_by_guid(GUID)
+        self.now += 59
+        second = self.service.get_patient_by_guid(GUID)
+
+        self.assertEqual(first, second)
+        self.get.assert_called_once()
+        self.refresh_patients.assert_not_called()
+        self.assertEqual(self.stats(), (1, 0, 1))
+
+    def test_stale_entry_is_served_while_refreshed_once(self):
+        self.get.return_value = response(data=fhir_patient(GUID, "Kowalski"))
+        self.service.get_patient_by_guid(GUID)
+        self.now += 61
+
+        for _ in range(3):
+            patient = self.service.get_patient_by_guid(GUID)
+            self.assertEqual(patient["last_name"], "Kowalski")
+
+        self.get.assert_called_once()
+        self.refresh_patients.assert_called_once_with([GUID])
+        self.assertEqual(self.stats(), (0, 3, 1))
+
+    def test_refresh_task_makes_the_entry_fresh(self):
+        self.get.return_value = response(data=fhir_patient(GUID, "Kowalski"))
+        self.service.get_patient_by_guid(GUID)
+        self.now += 61
+        self.post.return_value = response(
+            data={"entry": [{"resource": fhir_patient(GUID, "Nowak")}]}
+        )
+
+        with patch("patients.tasks.patient_service", self.service):
+            refresh_cached_patients_task([GUID])
+
+        self.assertEqual(self.service.get_patient_by_guid(GUID)["last_name"], "Nowak")
+        self.assertEqual(self.stats(), (1, 0, 1))
+
+    def test_not_found_is_cached_briefly(self):
+        self.get.return_value = response(status_code=404)
+
+        self.assertIsNone(self.service.get_patient_by_guid(MISSING_GUID))
+        self.assertIsNone(self.service.get_patient_by_guid(MISSING_GUID))
+        self.assertEqual(self.get.call_count, 1)
+        self.assertEqual(PatientCache.get_stats()["negative_hits"], 1)
+
+        self.now += 31
+        self.service.get_patient_by_guid(MISSING_GUID)
+
+        self.assertEqual(self.get.call_count, 2)
+        self.refresh_patients.assert_not_called()
+
+    def test_bulk_lookup_caches_missing_guids(self):
+        self.post.return_value = response(
+            data={"entry": [{"resource": fhir_patient(GUID, "Kowalski")}]}
+        )
+
+        first = self.service.get_patients_by_guids([GUID, MISSING_GUID])
+        second = self.service.get_patients_by_guids([GUID, MISSING_GUID])
+
+        self.assertEqual(list(first), [GUID])
+        self.assertEqual(first, second)
+        self.post.assert_called_once()
+        self.assertEqual(self.stats(), (2, 0, 2))
+
+    def test_bulk_lookup_refreshes_stale_guids_in_background(self):
+        other_guid = "5f0e6d3c-2b1a-4c9d-8e7f-6a5b4c3d2e1f"
+        self.post.return_value = response(
+            data={"entry": [{"resource": fhir_patient(GUID, "Kowalski")}]}
+        )
+        self.service.get_patients_by_guids([GUID])
+        self.now += 61
+        self.post.return_value = response(
+            data={"entry": [{"resource": fhir_patient(other_guid, "Nowak")}]}
+        )
+
+        results = self.service.get_patients_by_guids([GUID, other_guid])
+
+        self.assertEqual(set(results), {GUID, other_guid})
+        # Only the uncached GUID is fetched inline.
+        self.assertEqual(self.post.call_args.kwargs["json"], {"guids": [other_guid]})
+        self.refresh_patients.assert_called_once_with([GUID])
+
+    def test_stale_search_is_refreshed_in_background(self):
+        self.get.return_value = response(
+            data={"entry": [{"resource": fhir_patient(GUID, "Kowalski")}]}
+        )
+        self.service.search_patients(last_name="Kow")
+        self.now += 61
+
+        patients = self.service.search_patients(last_name="Kow")
+
+        self.assertEqual(patients[0]["last_name"], "Kowalski")
+        self.get.assert_called_once()
+        self.refresh_search.assert_called_once_with(None, "Kow", None)
+
+    def test_failed_scheduling_still_serves_stale_entry(self):
+        self.get.return_value = response(data=fhir_patient(GUID, "Kowalski"))
+        self.service.get_patient_by_guid(GUID)
+        self.now += 61
+        self.refresh_patients.side_effect = ConnectionError("broker down")
+
+        patient = self.service.get_patient_by_guid(GUID)
+
+        self.assertEqual(patient["last_name"], "Kowalski")
+
+    def test_command_prints_and_resets_stats(self):
+        self.get.return_value = response(status_code=404)
+        self.service.get_patient_by_guid(MISSING_GUID)
+
+        out = StringIO()
+        call_command("patient_cache", "--reset-stats", stdout=out)
+
+        self.assertIn("misses: 0", out.getvalue())
+        self.assertEqual(self.stats(), (0, 0, 0))
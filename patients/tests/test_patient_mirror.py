@@ -0,0 +1,226 @@
+import json
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlencode, urlparse
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from analysis.models import VideoAnalysis
+from patients.models import PatientRecord
+from patients.services.api_patient_service import APIPatientService
+from patients.services.mirror_patient_service import MirrorPatientService
+from tests.common import TestFixtures
+from accounts.models import User
+
+
+class FHIRStub:
+    """
+    Minimal FHIR patient endpoint: ``_lastUpdated=ge...`` filtering, sorting
+    by last update and ``_count`` paging with bundle ``next`` links.
+    """
+
+    def __init__(self):
+        self.patients: dict[str, dict] = {}
+        self.requests: list[dict] = []
+        self.clock = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.handle(self)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def put(self, first_name: str, last_name: str, pesel: str, guid=None) -> str:
+        self.clock += timedelta(minutes=1)
+        guid = guid or str(uuid.uuid4())
+        self.patients[guid] = {
+            "resourceType": "Patient",
+            "id": guid,
+            "meta": {"lastUpdated": self.clock.isoformat()},
+            "identifier": [{"system": "http://hl7.org/fhir/sid/pesel", "value": pesel}],
+            "name": [{"family": last_name, "given": [first_name]}],
+            "birthDate": "1990-01-01",
+        }
+        return guid
+
+    def handle(self, request: BaseHTTPRequestHandler):
+        url = urlparse(request.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        self.requests.append(params)
+
+        resources = sorted(
+            self.patients.values(), key=lambda p: p["meta"]["lastUpdated"]
+        )
+        if "_lastUpdated" in params:
+            since = datetime.fromisoformat(params["_lastUpdated"].removeprefix("ge"))
+            resources = [
+                r
+                for r in resources
+                if datetime.fromisoformat(r["meta"]["lastUpdated"]) >= since
+            ]
+        count = int(params.get("_count", 100))
+        offset = int(params.get("_offset", 0))
+        bundle: dict = {
+            "resourceType": "Bundle",
+            "entry": [{"resource": r} for r in resources[offset : offset + count]],
+            "link": [],
+        }
+        if offset + count < len(resources):
+            next_params = {**params, "_offset": offset + count}
+            bundle["link"].append(
+                {
+                    "relation": "next",
+                    "url": f"{self.base_url}{url.path}?{urlencode(next_params)}",
+                }
+            )
+
+        body = json.dumps(bundle).encode()
+        request.send_response(200)
+        request.send_header("Content-Type", "application/fhir+json")
+        request.send_header("Content-Length", str(len(body)))
+        request.end_headers()
+        request.wfile.write(body)
+
+
+class PatientMirrorSyncTest(TestCase):
+    def setUp(self):
+        self.stub = FHIRStub()
+        self.addCleanup(self.stub.stop)
+        self.source = APIPatientService(self.stub.base_url)
+        self.mirror = MirrorPatientService()
+
+    def test_first_sync_copies_every_patient(self):
+        guids = [
+            self.stub.put(f"Jan{i}", "Kowalski", f"9001011234{i}") for i in range(5)
+        ]
+
+        stats = self.mirror.sync(self.source, page_size=2)
+
+        self.assertEqual(stats["pages"], 3)
+        self.assertEqual(stats["patients"], 5)
+        record = PatientRecord.objects.get(guid=guids[3])
+        self.assertEqual(record.first_name, "Jan3")
+        self.assertEqual(record.pesel, "90010112343")
+        self.assertEqual(record.as_dict()["birth_date"], "1990-01-01")
+        self.assertNotIn("_lastUpdated", self.stub.requests[0])
+
+    def test_incremental_sync_pulls_only_changes(self):
+        guids = [
+            self.stub.put(f"Jan{i}", "Kowalski", f"9001011234{i}") for i in range(4)
+        ]
+        self.mirror.sync(self.source)
+        checkpoint = self.mirror.get_checkpoint()
+
+        self.stub.put("Janina", "Nowak", "90010112340", guid=guids[0])
+        new_guid = self.stub.put("Anna", "Zielińska", "85050512345")
+        self.stub.requests.clear()
+
+        stats = self.mirror.sync(self.source)
+
+        self.assertEqual(
+            self.stub.requests[0]["_lastUpdated"], f"ge{checkpoint.isoformat()}"
+        )
+        # The newest record of the previous run is fetched again, plus the two
+        # changes.
+        self.assertEqual(stats["patients"], 3)
+        self.assertEqual(PatientRecord.objects.count(), 5)
+        self.assertEqual(PatientRecord.objects.get(guid=guids[0]).last_name, "Nowak")
+        self.assertTrue(PatientRecord.objects.filter(guid=new_guid).exists())
+
+    def test_full_sync_removes_deleted_patients(self):
+        kept = self.stub.put("Jan", "Kowalski", "90010112345")
+        deleted = self.stub.put("Anna", "Nowak", "85050512345")
+        self.mirror.sync(self.source)
+        del self.stub.patients[deleted]
+
+        stats = self.mirror.sync(self.source, full=True)
+
+        self.assertEqual(stats["removed"], 1)
+        self.assertEqual(
+            list(PatientRecord.objects.values_list("guid", flat=True)),
+            [uuid.UUID(kept)],
+        )
+
+    def test_mirror_lists_its_records_as_a_source(self):
+        guids = [
+            self.stub.put(f"Jan{i}", "Kowalski", f"9001011234{i}") for i in range(3)
+        ]
+        self.mirror.sync(self.source)
+        since = PatientRecord.objects.get(guid=guids[1]).source_updated_at
+
+        pages = list(self.mirror.iter_updated_patients(since, page_size=1))
+
+        self.assertEqual([page[0]["id"] for page in pages], guids[1:])
+        self.assertEqual(pages[0][0]["last_updated"], since.isoformat())
+
+
+@patch("analysis.services.analysis.USE_PATIENT_MIRROR", True)
+@patch("analysis.filters.USE_PATIENT_MIRROR", True)
+class PatientMirrorModeTest(APITestCase):
+    def setUp(self):
+        user_data = TestFixtures.get_test_user_data()
+        self.user = User.objects.create_user(
+            username=user_data["username"],
+            email=user_data["email"],
+            password=user_data["password"],
+        )
+        self.client.force_authenticate(user=self.user)
+
+        self.stub = FHIRStub()
+        self.addCleanup(self.stub.stop)
+        self.kowalski = self.stub.put("Jan", "Kowalski", "90010112345")
+        self.nowak = self.stub.put("Anna", "Nowak", "85050512345")
+        MirrorPatientService().sync(APIPatientService(self.stub.base_url))
+
+        self.kowalski_analysis = VideoAnalysis.objects.create(
+            user=self.user, patient_guid=self.kowalski
+        )
+        VideoAnalysis.objects.create(user=self.user, patient_guid=self.nowak)
+
+        # Nothing in mirror mode may reach the live service.
+        for method in (
+            "search_patients",
+            "get_patients_by_guids",
+            "get_patient_by_guid",
+        ):
+            patcher = patch(
+                f"patients.services.patient_service.patient_service.{method}",
+                side_effect=AssertionError("patient service called"),
+            )
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_patient_filter_and_enrichment_read_the_mirror(self):
+        response = self.client.get(
+            reverse("analysis:analysis-list"), {"first_name": "ja", "last_name": "kow"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        (result,) = response.data["results"]
+        self.assertEqual(result["id"], self.kowalski_analysis.id)
+        self.assertEqual(result["patient_details"]["last_name"], "Kowalski")
+        self.assertEqual(result["patient_details"]["pesel"], "90010112345")
+
+    def test_detail_reads_the_mirror(self):
+        response = self.client.get(
+            reverse("analysis:analysis-detail", args=[self.kowalski_analysis.id])
+        )
+
+        self.assertEqual(response.data["patient_details"]["first_name"], "Jan")
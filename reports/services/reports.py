@@ -23,6 +23,7 @@ from django.contrib.staticfiles import finders
 from analysis.errors import AnalysisNotFoundError
 from analysis.models import VideoAnalysis
 from analysis.services.analysis import AnalysisService
+from analysis.services.substance_catalog import SubstanceCatalog
 from patients.services import patient_service
 from reports.errors import AnalysisNotCompletedError, ReportError
 
@@ -230,13 +231,14 @@ class AnalysisReportPDFGenerator:
         )
 
         data = [["Substance", "Confidence Score"]]
-        results = self.analysis.analysis_results.all()
+        results = list(self.analysis.analysis_results.all())
 
-        if results.exists():
+        if results:
             for result in results:
+                entry = SubstanceCatalog.get(result.substance_id)
                 data.append(
                     [
-                        result.substance.name_en,
+                        entry.name_en if entry else "",
                         f"{result.confidence_score:.2f}%",
                     ]
                 )
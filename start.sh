@@ -30,7 +30,7 @@ echo "--- Collecting static files ---"
 python manage.py collectstatic --noinput
 
 echo "--- Starting Celery worker in background... ---"
-celery -A larvixon_site worker -l info &
+celery -A larvixon_site worker -l info -Q ingest,inference,reports,maintenance &
 
 echo "--- Starting Celery Beat (scheduler) in background... ---"
 celery -A larvixon_site beat -l info &
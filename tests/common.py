@@ -19,9 +19,11 @@ class TestFixtures:
 
 
 def cleanup_test_media():
-    test_media_users = Path(__file__).parent.parent / "test_media" / "users"
-    if test_media_users.exists():
-        shutil.rmtree(test_media_users)
+    test_media = Path(__file__).parent.parent / "test_media"
+    for folder in ("users", "uploads"):
+        test_media_folder = test_media / folder
+        if test_media_folder.exists():
+            shutil.rmtree(test_media_folder)
 
 
 def run_tests(test_classes) -> bool:
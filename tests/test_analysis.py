@@ -1,6 +1,6 @@
 import sys
 import os
-from unittest.mock import patch
+from unittest.mock import ANY, patch
 from datetime import timedelta
 from django.utils import timezone
 from django.test import TestCase, override_settings
@@ -13,6 +13,8 @@ from analysis.views.list_view import VideoAnalysisListView
 from analysis.views.detail_view import VideoAnalysisDetailView
 from analysis.views.retry_view import VideoAnalysisRetryView
 from analysis.models import VideoAnalysis, Substance, AnalysisResult
+from analysis.errors import AnalysisNotFailedError
+from analysis.services.analysis import AnalysisService
 from tests.common import TestFixtures, run_tests, cleanup_test_media
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "larvixon_site.settings")
@@ -158,8 +160,9 @@ class TestAnalysisRetry(TestCase):
         analysis: VideoAnalysis = self._create_failed_analysis(
             "Model request failed: Connection timeout"
         )
+        VideoAnalysis.objects.filter(id=analysis.id).update(processing_attempts=3)
 
-        with patch("videoprocessor.tasks.process_video_task.delay") as mock_task:
+        with patch("videoprocessor.tasks.process_video_task.apply_async") as mock_task:
             request: Request = self.factory.post(f"/api/analysis/{analysis.id}/retry/")
             force_authenticate(request, user=self.user)
             response: Response = VideoAnalysisRetryView.as_view()(
@@ -172,12 +175,13 @@ class TestAnalysisRetry(TestCase):
             self.assertEqual(
                 response.data["message"], "Analysis retry initiated successfully."
             )
-            mock_task.assert_called_once_with(analysis.id)
+            mock_task.assert_called_once_with((analysis.id,), task_id=ANY)
 
             analysis.refresh_from_db()
             self.assertEqual(analysis.status, VideoAnalysis.Status.PENDING)
             self.assertIsNone(analysis.error_message)
             self.assertIsNone(analysis.completed_at)
+            self.assertEqual(analysis.processing_attempts, 0)
 
     def test_cannot_retry_non_failed_analysis(self) -> None:
         analysis: VideoAnalysis = VideoAnalysis.objects.create(
@@ -242,9 +246,11 @@ class TestAnalysisRetry(TestCase):
             analysis=analysis, substance=self.morphine, confidence_score=0.2
         )
 
+        VideoAnalysis.objects.filter(id=analysis.id).refresh_top_prediction()
+
         self.assertEqual(analysis.analysis_results.count(), 2)
 
-        with patch("videoprocessor.tasks.process_video_task.delay"):
+        with patch("videoprocessor.tasks.process_video_task.apply_async"):
             request: Request = self.factory.post(f"/api/analysis/{analysis.id}/retry/")
             force_authenticate(request, user=self.user)
             response: Response = VideoAnalysisRetryView.as_view()(
@@ -254,6 +260,23 @@ class TestAnalysisRetry(TestCase):
             self.assertEqual(response.status_code, 200)
             analysis.refresh_from_db()
             self.assertEqual(analysis.analysis_results.count(), 0)
+            self.assertIsNone(analysis.top_substance)
+            self.assertIsNone(analysis.top_confidence)
+
+    def test_concurrent_retry_is_applied_once(self) -> None:
+        analysis: VideoAnalysis = self._create_failed_analysis(
+            "Model request failed: Timeout"
+        )
+        # Both requests passed validation before either reset the analysis.
+        first = VideoAnalysis.objects.get(id=analysis.id)
+        second = VideoAnalysis.objects.get(id=analysis.id)
+
+        AnalysisService._reset_analysis_for_retry(first)
+
+        with self.assertRaises(AnalysisNotFailedError):
+            AnalysisService._reset_analysis_for_retry(second)
+        analysis.refresh_from_db()
+        self.assertEqual(analysis.status, VideoAnalysis.Status.PENDING)
 
     def test_retry_requires_authentication(self) -> None:
         analysis: VideoAnalysis = self._create_failed_analysis(
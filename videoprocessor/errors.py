@@ -69,3 +69,109 @@ class VideoFileAccessError(VideoProcessingError):
     def __init__(self, message: str = "Failed to access video file"):
         self.message = message
         super().__init__(self.message)
+
+
+class AnalysisLeaseLostError(VideoProcessingError):
+    """Raised when the processing lease of an analysis expired mid-run."""
+
+    def __init__(self, analysis_id: int):
+        self.analysis_id = analysis_id
+        super().__init__(f"Processing lease for analysis {analysis_id} was lost.")
+
+
+class VideoIngestError(VideoProcessingError):
+    """Raised when the thumbnail or metadata of a stored video cannot be produced."""
+
+    def __init__(self, message: str = "Failed to ingest video"):
+        self.message = message
+        super().__init__(self.message)
+
+
+class UploadSessionNotFoundError(VideoProcessingError):
+    """Raised when a chunked upload session does not exist or belongs to another user."""
+
+    def __init__(self, upload_id: str):
+        self.upload_id = upload_id
+        super().__init__(f"Upload session {upload_id} not found.")
+
+
+class UploadSessionClosedError(VideoProcessingError):
+    """Raised when a chunk or completion is sent to a session that is no longer active."""
+
+    def __init__(self, message: str = "Upload session is no longer active"):
+        self.message = message
+        super().__init__(self.message)
+
+
+class UploadInvalidContentRangeError(VideoProcessingError):
+    """Raised when the Content-Range header of a chunk is missing or malformed."""
+
+    def __init__(self, message: str = "Invalid or missing Content-Range header"):
+        self.message = message
+        super().__init__(self.message)
+
+
+class UploadChunkOffsetMismatchError(VideoProcessingError):
+    """Raised when a chunk does not start where the previous one ended."""
+
+    def __init__(self, expected_offset: int, received_offset: int):
+        self.expected_offset = expected_offset
+        self.received_offset = received_offset
+        super().__init__(
+            f"Chunk starts at byte {received_offset}, expected byte {expected_offset}."
+        )
+
+
+class UploadIncompleteError(VideoProcessingError):
+    """Raised when completing an upload before all bytes were received."""
+
+    def __init__(self, received_bytes: int, total_size: int):
+        self.received_bytes = received_bytes
+        self.total_size = total_size
+        super().__init__(
+            f"Upload incomplete: received {received_bytes} of {total_size} bytes."
+        )
+
+
+class ChunkedUploadNotSupportedError(VideoProcessingError):
+    """Raised when the configured storage backend cannot accept chunked uploads."""
+
+    def __init__(
+        self, message: str = "Storage backend does not support chunked uploads"
+    ):
+        self.message = message
+        super().__init__(self.message)
+
+
+class DirectUploadNotFoundError(VideoProcessingError):
+    """Raised when no direct upload is awaiting completion for the analysis."""
+
+    def __init__(self, analysis_id: int):
+        self.analysis_id = analysis_id
+        super().__init__(f"No direct upload pending for analysis {analysis_id}.")
+
+
+class DirectUploadNotReceivedError(VideoProcessingError):
+    """Raised when completing a direct upload whose object is not in storage."""
+
+    def __init__(self, message: str = "Video has not been uploaded to storage yet"):
+        self.message = message
+        super().__init__(self.message)
+
+
+class DirectUploadInvalidTokenError(VideoProcessingError):
+    """Raised when a local signed upload URL is forged, expired or misused."""
+
+    def __init__(self, message: str = "Invalid upload URL"):
+        self.message = message
+        super().__init__(self.message)
+
+
+class DirectUploadNotSupportedError(VideoProcessingError):
+    """Raised when the configured storage backend cannot issue signed upload URLs."""
+
+    def __init__(
+        self, message: str = "Storage backend does not support direct uploads"
+    ):
+        self.message = message
+        super().__init__(self.message)
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from videoprocessor.services.cached_ml_service import CachedMLService
+
+
+class Command(BaseCommand):
+    help = "Show ML prediction cache hit/miss counters, or invalidate the cache."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--invalidate",
+            action="store_true",
+            help="Drop all cached predictions, e.g. after deploying a new model.",
+        )
+        parser.add_argument(
+            "--reset-stats",
+            action="store_true",
+            help="Reset the hit and miss counters.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        if options["invalidate"]:
+            generation = CachedMLService.invalidate()
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Prediction cache invalidated (generation {generation})."
+                )
+            )
+        if options["reset_stats"]:
+            CachedMLService.reset_stats()
+            self.stdout.write(self.style.SUCCESS("Prediction cache stats reset."))
+
+        for name, value in CachedMLService.get_stats().items():
+            self.stdout.write(f"{name}: {value}")
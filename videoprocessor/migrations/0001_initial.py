@@ -0,0 +1,85 @@
+# Generated by Django 5.2.5 on 2026-10-16 20:37
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("analysis", "0013_change_patient_to_patient_guid"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UploadSession",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("filename", models.CharField(max_length=255)),
+                ("description", models.TextField(blank=True, default="")),
+                ("patient_guid", models.UUIDField(blank=True, null=True)),
+                ("total_size", models.BigIntegerField()),
+                ("received_bytes", models.BigIntegerField(default=0)),
+                (
+                    "storage_name",
+                    models.CharField(
+                        help_text="Final name of the assembled video in storage",
+                        max_length=1024,
+                    ),
+                ),
+                (
+                    "block_ids",
+                    models.JSONField(
+                        blank=True,
+                        default=list,
+                        help_text="Staged block IDs, in order (block blob backends only)",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("active", "Active"),
+                            ("completed", "Completed"),
+                            ("aborted", "Aborted"),
+                        ],
+                        default="active",
+                        max_length=20,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "analysis",
+                    models.OneToOneField(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="upload_session",
+                        to="analysis.videoanalysis",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="upload_sessions",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.5 on 2026-10-17 01:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("videoprocessor", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="uploadsession",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("active", "Active"),
+                    ("completed", "Completed"),
+                    ("aborted", "Aborted"),
+                    ("expired", "Expired"),
+                ],
+                default="active",
+                max_length=20,
+            ),
+        ),
+    ]
@@ -0,0 +1,61 @@
+import uuid
+from django.db import models
+from accounts.models import User
+
+
+class UploadSession(models.Model):
+    """
+    Server-side state of a resumable (chunked) video upload.
+
+    Chunks are written straight to storage as they arrive, so the only thing
+    kept here is the bookkeeping needed to resume after a dropped connection
+    or a worker restart.
+    """
+
+    class Status(models.TextChoices):
+        ACTIVE = "active", "Active"
+        COMPLETED = "completed", "Completed"
+        ABORTED = "aborted", "Aborted"
+        EXPIRED = "expired", "Expired"
+
+    id: models.UUIDField = models.UUIDField(
+        primary_key=True, default=uuid.uuid4, editable=False
+    )
+    user: models.ForeignKey[User, User] = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="upload_sessions"
+    )
+    filename: models.CharField = models.CharField(max_length=255)
+    description: models.TextField = models.TextField(blank=True, default="")
+    patient_guid = models.UUIDField(null=True, blank=True)
+
+    total_size: models.BigIntegerField = models.BigIntegerField()
+    received_bytes: models.BigIntegerField = models.BigIntegerField(default=0)
+    storage_name: models.CharField = models.CharField(
+        max_length=1024, help_text="Final name of the assembled video in storage"
+    )
+    block_ids: models.JSONField = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="Staged block IDs, in order (block blob backends only)",
+    )
+
+    status: models.CharField = models.CharField(
+        max_length=20, choices=Status.choices, default=Status.ACTIVE
+    )
+    analysis = models.OneToOneField(
+        "analysis.VideoAnalysis",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="upload_session",
+    )
+
+    created_at: models.DateTimeField = models.DateTimeField(auto_now_add=True)
+    updated_at: models.DateTimeField = models.DateTimeField(auto_now=True)
+
+    @property
+    def is_complete(self) -> bool:
+        return self.received_bytes >= self.total_size
+
+    def __str__(self) -> str:
+        return f"{self.id} - {self.filename} ({self.received_bytes}/{self.total_size})"
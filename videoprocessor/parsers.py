@@ -0,0 +1,51 @@
+import hashlib
+from typing import Any
+
+from django.core.files.uploadhandler import FileUploadHandler
+from rest_framework.parsers import DataAndFiles, MultiPartParser
+
+
+class Sha256UploadHandler(FileUploadHandler):
+    """
+    Hashes every uploaded file while the request body streams in.
+
+    Runs ahead of Django's own handlers and passes each chunk on unchanged,
+    so the content hash costs no extra read of the file.
+    """
+
+    def __init__(self, request=None) -> None:
+        super().__init__(request)
+        self.digests: dict[str, list[str]] = {}
+        self.digest = hashlib.sha256()
+
+    def new_file(self, *args, **kwargs) -> None:
+        super().new_file(*args, **kwargs)
+        self.digest = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data: bytes, start: int) -> bytes:
+        self.digest.update(raw_data)
+        return raw_data
+
+    def file_complete(self, file_size: int) -> None:
+        self.digests.setdefault(self.field_name, []).append(self.digest.hexdigest())
+        # Leave building the file to the next handler.
+        return None
+
+
+class HashingMultiPartParser(MultiPartParser):
+    """Multipart parser that sets ``sha256`` on every uploaded file."""
+
+    def parse(self, stream, media_type=None, parser_context=None) -> DataAndFiles:
+        request = (parser_context or {})["request"]
+        hasher = Sha256UploadHandler(request)
+        request.upload_handlers.insert(0, hasher)
+        try:
+            data_and_files = super().parse(stream, media_type, parser_context)
+        finally:
+            request.upload_handlers.remove(hasher)
+
+        for field_name, digests in hasher.digests.items():
+            uploaded: list[Any] = data_and_files.files.getlist(field_name)
+            for uploaded_file, digest in zip(uploaded, digests):
+                uploaded_file.sha256 = digest
+        return data_and_files
@@ -1,5 +1,8 @@
 from rest_framework import serializers
 
+from videoprocessor.models import UploadSession
+from videoprocessor.services.chunked_upload_service import RECOMMENDED_CHUNK_SIZE
+
 
 class VideoUploadSerializer(serializers.Serializer):
     """
@@ -7,3 +10,56 @@ class VideoUploadSerializer(serializers.Serializer):
     """
 
     pass
+
+
+class UploadSessionCreateSerializer(serializers.Serializer):
+    filename = serializers.CharField(max_length=255)
+    size = serializers.IntegerField(min_value=1, help_text="Total file size in bytes")
+    description = serializers.CharField(required=False, allow_blank=True, default="")
+    patient_guid = serializers.CharField(
+        required=False,
+        allow_null=True,
+        allow_blank=True,
+        help_text="GUID of the patient from Patient Service",
+    )
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    upload_id = serializers.UUIDField(source="id", read_only=True)
+    offset = serializers.IntegerField(source="received_bytes", read_only=True)
+    size = serializers.IntegerField(source="total_size", read_only=True)
+    chunk_size = serializers.SerializerMethodField()
+    analysis_id = serializers.IntegerField(
+        source="analysis.id", read_only=True, allow_null=True, default=None
+    )
+
+    class Meta:  # type: ignore[misc]
+        model = UploadSession
+        fields = (
+            "upload_id",
+            "filename",
+            "offset",
+            "size",
+            "chunk_size",
+            "status",
+            "analysis_id",
+        )
+        read_only_fields = fields
+
+    def get_chunk_size(self, obj) -> int:
+        return RECOMMENDED_CHUNK_SIZE
+
+
+class DirectUploadSerializer(serializers.Serializer):
+    analysis_id = serializers.IntegerField(read_only=True)
+    status = serializers.CharField(read_only=True)
+    upload_url = serializers.CharField(
+        read_only=True, help_text="Signed URL the video must be written to"
+    )
+    method = serializers.CharField(read_only=True)
+    headers = serializers.DictField(
+        child=serializers.CharField(),
+        read_only=True,
+        help_text="Headers to send with the upload request",
+    )
+    expires_at = serializers.DateTimeField(read_only=True)
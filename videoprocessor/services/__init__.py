@@ -2,6 +2,10 @@ from .video_file_manager import VideoFileManager
 from .base_ml_service import BaseMLService
 from .mock_ml_service import MockMLService
 from .api_ml_service import APIMLService
+from .cached_ml_service import CachedMLService
 from .ml_service import get_ml_service, ml_service
 from .video_upload_service import VideoUploadService
+from .video_ingest_service import VideoIngestService
+from .chunked_upload_service import ChunkedUploadService
+from .direct_upload_service import DirectUploadService
 from .video_processing_service import VideoProcessingService
@@ -0,0 +1,198 @@
+import logging
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+
+from django.core.exceptions import ImproperlyConfigured
+
+from larvixon_site.settings import (
+    ANALYSIS_LEASE_BACKEND,
+    ANALYSIS_LEASE_TTL_SECONDS,
+    REDIS_URL,
+)
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+LEASE_PREFIX = "videoprocessor:analysis_lease"
+
+
+class BaseLeaseStore(ABC):
+    """Shared key/token store with expiry, used to hold analysis leases."""
+
+    @abstractmethod
+    def acquire(self, key: str, token: str, ttl: float) -> bool:
+        """Store ``token`` under ``key`` unless another live token is there."""
+        pass
+
+    @abstractmethod
+    def renew(self, key: str, token: str, ttl: float) -> bool:
+        """Extend the expiry of ``key`` if it still holds ``token``."""
+        pass
+
+    @abstractmethod
+    def release(self, key: str, token: str) -> bool:
+        """Delete ``key`` if it still holds ``token``."""
+        pass
+
+
+class RedisLeaseStore(BaseLeaseStore):
+    """
+    Lease store on Redis. Acquisition is a single ``SET NX PX``; renewal and
+    release compare the token and act in one Lua script, so a worker whose
+    lease expired can never extend or delete the lease of its successor.
+    """
+
+    RENEW_SCRIPT = """
+        if redis.call("get", KEYS[1]) == ARGV[1] then
+            return redis.call("pexpire", KEYS[1], ARGV[2])
+        end
+        return 0
+    """
+    RELEASE_SCRIPT = """
+        if redis.call("get", KEYS[1]) == ARGV[1] then
+            return redis.call("del", KEYS[1])
+        end
+        return 0
+    """
+
+    def __init__(self, url: str) -> None:
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self._renew = self.client.register_script(self.RENEW_SCRIPT)
+        self._release = self.client.register_script(self.RELEASE_SCRIPT)
+
+    def acquire(self, key: str, token: str, ttl: float) -> bool:
+        return bool(self.client.set(key, token, nx=True, px=int(ttl * 1000)))
+
+    def renew(self, key: str, token: str, ttl: float) -> bool:
+        return bool(self._renew(keys=[key], args=[token, int(ttl * 1000)]))
+
+    def release(self, key: str, token: str) -> bool:
+        return bool(self._release(keys=[key], args=[token]))
+
+
+class LocalLeaseStore(BaseLeaseStore):
+    """In-process lease store for tests and single-process development."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._leases: dict[str, tuple[str, float]] = {}
+
+    def _holder(self, key: str) -> str | None:
+        lease = self._leases.get(key)
+        if lease is None or lease[1] <= time.monotonic():
+            self._leases.pop(key, None)
+            return None
+        return lease[0]
+
+    def acquire(self, key: str, token: str, ttl: float) -> bool:
+        with self._lock:
+            if self._holder(key) is not None:
+                return False
+            self._leases[key] = (token, time.monotonic() + ttl)
+            return True
+
+    def renew(self, key: str, token: str, ttl: float) -> bool:
+        with self._lock:
+            if self._holder(key) != token:
+                return False
+            self._leases[key] = (token, time.monotonic() + ttl)
+            return True
+
+    def release(self, key: str, token: str) -> bool:
+        with self._lock:
+            if self._holder(key) != token:
+                return False
+            del self._leases[key]
+            return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._leases.clear()
+
+
+def get_lease_store(backend: str = ANALYSIS_LEASE_BACKEND) -> BaseLeaseStore:
+    if backend == "redis":
+        return RedisLeaseStore(REDIS_URL)
+    if backend == "local":
+        return LocalLeaseStore()
+    raise ImproperlyConfigured(f"Unknown ANALYSIS_LEASE_BACKEND: {backend}")
+
+
+lease_store: BaseLeaseStore = get_lease_store()
+
+
+class AnalysisLease:
+    """
+    Exclusive, expiring claim on processing one analysis.
+
+    Used as a context manager: entering tries to acquire the lease once and sets
+    ``acquired``; while held, a daemon thread renews it every third of its TTL so
+    long ML calls keep it alive. If the worker dies the lease simply expires and
+    a redelivered task can take over.
+    """
+
+    def __init__(
+        self,
+        analysis_id: int,
+        ttl: float = ANALYSIS_LEASE_TTL_SECONDS,
+        store: BaseLeaseStore | None = None,
+    ) -> None:
+        self.analysis_id = analysis_id
+        self.ttl = ttl
+        self.store = store or lease_store
+        self.key = f"{LEASE_PREFIX}:{analysis_id}"
+        self.token = uuid.uuid4().hex
+        self.acquired = False
+        self._stop = threading.Event()
+        self._renewer: threading.Thread | None = None
+
+    def acquire(self) -> bool:
+        self.acquired = self.store.acquire(self.key, self.token, self.ttl)
+        return self.acquired
+
+    def renew(self) -> bool:
+        """Extend the lease; False means it expired and may belong to another worker."""
+        if self.acquired and not self.store.renew(self.key, self.token, self.ttl):
+            logger.warning(f"Lost processing lease for analysis {self.analysis_id}")
+            self.acquired = False
+        return self.acquired
+
+    def release(self) -> None:
+        if self.acquired:
+            self.store.release(self.key, self.token)
+            self.acquired = False
+
+    def _keep_alive(self) -> None:
+        while not self._stop.wait(self.ttl / 3):
+            try:
+                if not self.renew():
+                    return
+            except Exception as e:
+                logger.warning(
+                    f"Could not renew lease for analysis {self.analysis_id}: {e}"
+                )
+
+    def __enter__(self) -> "AnalysisLease":
+        if self.acquire():
+            self._renewer = threading.Thread(
+                target=self._keep_alive,
+                name=f"analysis-lease-{self.analysis_id}",
+                daemon=True,
+            )
+            self._renewer.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        if self._renewer is not None:
+            self._renewer.join()
+        try:
+            self.release()
+        except Exception as e:
+            # The lease expires on its own; a failed release only delays redelivery.
+            logger.warning(
+                f"Could not release lease for analysis {self.analysis_id}: {e}"
+            )
@@ -1,31 +1,83 @@
 import requests
 import json
 import os
+import random
+import time
 import logging
-from larvixon_site.settings import ML_ENDPOINT_URL
+from larvixon_site.settings import (
+    ML_CONNECT_TIMEOUT_SECONDS,
+    ML_ENDPOINT_URL,
+    ML_MAX_RETRIES,
+    ML_READ_TIMEOUT_SECONDS,
+    ML_RETRY_BACKOFF_MAX_SECONDS,
+    ML_RETRY_BACKOFF_SECONDS,
+)
 from videoprocessor.services.base_ml_service import BaseMLService
+from videoprocessor.services.ml_http_client import MultipartFileBody, get_ml_session
 
 logger: logging.Logger = logging.getLogger(__name__)
 
 
 class APIMLService(BaseMLService):
     @staticmethod
-    def predict_video(video_path: str) -> dict[str, float] | None:
+    def retry_delay(attempt: int) -> float:
+        """Full-jitter exponential backoff for the given 0-based retry attempt."""
+        cap = min(ML_RETRY_BACKOFF_MAX_SECONDS, ML_RETRY_BACKOFF_SECONDS * 2**attempt)
+        return random.uniform(0, cap)
+
+    @staticmethod
+    def _post_video(video_path: str) -> requests.Response:
+        """POST the video, retrying connection errors and 5xx responses."""
+        session = get_ml_session()
+        headers: dict[str, str] = {"Accept": "application/json"}
+
+        with open(video_path, "rb") as video_file:
+            body = MultipartFileBody(
+                "file", video_file, os.path.basename(video_path), "video/webm"
+            )
+            headers["Content-Type"] = body.content_type
+
+            attempt = 0
+            while True:
+                body.rewind()
+                try:
+                    logger.info(f"Sending request to ML endpoint: {ML_ENDPOINT_URL}")
+                    response: requests.Response = session.post(
+                        ML_ENDPOINT_URL,
+                        headers=headers,
+                        data=body,
+                        timeout=(ML_CONNECT_TIMEOUT_SECONDS, ML_READ_TIMEOUT_SECONDS),
+                    )
+                except requests.exceptions.ConnectionError as e:
+                    if attempt >= ML_MAX_RETRIES:
+                        raise
+                    logger.warning(f"ML endpoint connection failed: {e}")
+                else:
+                    if response.status_code < 500 or attempt >= ML_MAX_RETRIES:
+                        return response
+                    logger.warning(
+                        f"ML endpoint returned {response.status_code}, retrying"
+                    )
+                    response.close()
+
+                delay = APIMLService.retry_delay(attempt)
+                attempt += 1
+                logger.info(
+                    f"Retrying ML request in {delay:.1f}s "
+                    f"(attempt {attempt + 1}/{ML_MAX_RETRIES + 1})"
+                )
+                time.sleep(delay)
+
+    @staticmethod
+    def predict_video(
+        video_path: str, video_sha256: str | None = None
+    ) -> dict[str, float] | None:
         if not os.path.exists(video_path):
             logger.error(f"Video file not found at {video_path}")
             return None
 
         try:
-            with open(video_path, "rb") as video_file:
-                files = {
-                    "file": (os.path.basename(video_path), video_file, "video/webm")
-                }
-                headers: dict[str, str] = {"Accept": "application/json"}
-
-                logger.info(f"Sending request to ML endpoint: {ML_ENDPOINT_URL}")
-                response: requests.Response = requests.post(
-                    ML_ENDPOINT_URL, headers=headers, files=files
-                )
+            response = APIMLService._post_video(video_path)
 
             if response.status_code != 200:
                 logger.error(
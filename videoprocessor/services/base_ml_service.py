@@ -6,12 +6,15 @@ class BaseMLService(ABC):
     """Abstract base class for ML prediction services."""
 
     @abstractmethod
-    def predict_video(self, video_path: str) -> Dict[str, float] | None:
+    def predict_video(
+        self, video_path: str, video_sha256: str | None = None
+    ) -> Dict[str, float] | None:
         """
         Predict substance from video using ML service.
 
         Args:
             video_path: Path to the video file
+            video_sha256: Digest of the video content, if already known
 
         Returns:
             Dictionary of predictions with confidence scores, or None if failed
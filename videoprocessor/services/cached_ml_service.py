@@ -0,0 +1,117 @@
+import hashlib
+import logging
+import time
+from typing import Dict
+
+from django.core.cache import cache
+
+from larvixon_site.settings import ML_MODEL_VERSION, ML_PREDICTION_CACHE_TTL_SECONDS
+from videoprocessor.services.base_ml_service import BaseMLService
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+CACHE_PREFIX = "ml_prediction"
+GENERATION_KEY = f"{CACHE_PREFIX}:generation"
+HITS_KEY = f"{CACHE_PREFIX}:hits"
+MISSES_KEY = f"{CACHE_PREFIX}:misses"
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class CachedMLService(BaseMLService):
+    """
+    Caches predictions of another ML service by video digest and model version.
+
+    Entries expire after ML_PREDICTION_CACHE_TTL_SECONDS. Changing
+    ML_MODEL_VERSION or calling ``invalidate`` makes every earlier entry
+    unreachable; they then age out of the cache on their own. The cache
+    generation is the time of the last invalidation, so if the cache evicts
+    it the next lookup starts a newer generation rather than returning to
+    an invalidated one.
+    """
+
+    def __init__(self, service: BaseMLService) -> None:
+        self.service = service
+
+    @staticmethod
+    def _file_sha256(video_path: str) -> str:
+        digest = hashlib.sha256()
+        with open(video_path, "rb") as f:
+            while chunk := f.read(HASH_CHUNK_SIZE):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _generation() -> int:
+        return int(cache.get_or_set(GENERATION_KEY, time.time_ns, timeout=None) or 0)
+
+    @staticmethod
+    def cache_key(video_sha256: str) -> str:
+        return (
+            f"{CACHE_PREFIX}:{CachedMLService._generation()}:"
+            f"{ML_MODEL_VERSION}:{video_sha256}"
+        )
+
+    @staticmethod
+    def _count(key: str) -> None:
+        try:
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.add(key, 0, timeout=None)
+                cache.incr(key)
+        except Exception as e:
+            logger.warning(f"Could not count {key}: {e}")
+
+    def predict_video(
+        self, video_path: str, video_sha256: str | None = None
+    ) -> Dict[str, float] | None:
+        try:
+            key = self.cache_key(video_sha256 or self._file_sha256(video_path))
+            cached = cache.get(key)
+        except Exception as e:
+            logger.warning(f"Prediction cache unavailable, calling ML service: {e}")
+            return self.service.predict_video(video_path, video_sha256)
+
+        if cached is not None:
+            self._count(HITS_KEY)
+            logger.info(f"Prediction cache hit for {video_path}")
+            return cached
+
+        self._count(MISSES_KEY)
+        results = self.service.predict_video(video_path, video_sha256)
+        if results is not None:
+            try:
+                cache.set(key, results, timeout=ML_PREDICTION_CACHE_TTL_SECONDS)
+            except Exception as e:
+                logger.warning(f"Could not cache the prediction for {video_path}: {e}")
+        return results
+
+    @staticmethod
+    def invalidate() -> int:
+        """Drop every cached prediction; returns the new cache generation."""
+        generation = max(time.time_ns(), CachedMLService._generation() + 1)
+        try:
+            cache.set(GENERATION_KEY, generation, timeout=None)
+        except Exception as e:
+            # Unlike a lost prediction, a lost invalidation must not go unnoticed.
+            logger.warning(f"Could not invalidate the prediction cache: {e}")
+            raise
+        logger.info(f"Prediction cache invalidated, generation {generation}")
+        return generation
+
+    @staticmethod
+    def get_stats() -> dict[str, int | float | str]:
+        hits = cache.get(HITS_KEY, 0)
+        misses = cache.get(MISSES_KEY, 0)
+        total = hits + misses
+        return {
+            "model_version": ML_MODEL_VERSION,
+            "generation": CachedMLService._generation(),
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / total, 4) if total else 0.0,
+        }
+
+    @staticmethod
+    def reset_stats() -> None:
+        cache.delete_many([HITS_KEY, MISSES_KEY])
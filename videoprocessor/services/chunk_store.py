@@ -0,0 +1,211 @@
+import hashlib
+import logging
+import os
+from abc import ABC, abstractmethod
+from typing import BinaryIO
+
+from django.core.files.storage import FileSystemStorage, Storage, default_storage
+
+from videoprocessor.errors import ChunkedUploadNotSupportedError
+from videoprocessor.models import UploadSession
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+PARTIAL_UPLOADS_DIR = "uploads/partial"
+COPY_BUFFER_SIZE = 1024 * 1024
+
+
+class ChunkReadError(IOError):
+    """Raised when the client stream ends before the announced chunk length."""
+
+
+class LimitedReader:
+    """File-like view over at most ``length`` bytes of ``stream``."""
+
+    def __init__(self, stream: BinaryIO, length: int) -> None:
+        self.stream = stream
+        self.remaining = length
+
+    def read(self, size: int = -1) -> bytes:
+        if self.remaining <= 0:
+            return b""
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.stream.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def __iter__(self):
+        while True:
+            data = self.read(COPY_BUFFER_SIZE)
+            if not data:
+                return
+            yield data
+
+
+class BaseChunkStore(ABC):
+    """Writes upload chunks directly to storage and assembles the final file."""
+
+    def __init__(self, storage: Storage | None = None) -> None:
+        self.fs: Storage = storage or default_storage
+
+    @abstractmethod
+    def begin(self, session: UploadSession) -> None:
+        """Prepare storage for a new upload session."""
+        pass
+
+    @abstractmethod
+    def write_chunk(
+        self, session: UploadSession, offset: int, stream: BinaryIO, length: int
+    ) -> None:
+        """
+        Persist ``length`` bytes read from ``stream`` at ``offset``.
+
+        Writing the same offset twice must overwrite the previous attempt, so a
+        chunk whose acknowledgement was lost can simply be re-sent.
+        """
+        pass
+
+    @abstractmethod
+    def sha256(self, session: UploadSession) -> str | None:
+        """Hash of the uploaded bytes, or None when they cannot be read back."""
+        pass
+
+    @abstractmethod
+    def assemble(self, session: UploadSession) -> None:
+        """Make the uploaded bytes available under ``session.storage_name``."""
+        pass
+
+    @abstractmethod
+    def discard(self, session: UploadSession) -> None:
+        """Remove any partial data for the session."""
+        pass
+
+
+class FileSystemChunkStore(BaseChunkStore):
+    """
+    Writes chunks into a sparse ``.part`` file inside the storage location.
+
+    Assembly is a rename into the final path, which lives on the same
+    filesystem, so the video is never read back.
+    """
+
+    def _part_path(self, session: UploadSession) -> str:
+        return self.fs.path(f"{PARTIAL_UPLOADS_DIR}/{session.id}.part")
+
+    def begin(self, session: UploadSession) -> None:
+        part_path = self._part_path(session)
+        os.makedirs(os.path.dirname(part_path), exist_ok=True)
+        with open(part_path, "wb"):
+            pass
+
+    def write_chunk(
+        self, session: UploadSession, offset: int, stream: BinaryIO, length: int
+    ) -> None:
+        part_path = self._part_path(session)
+        mode = "r+b" if os.path.exists(part_path) else "wb"
+        written = 0
+        with open(part_path, mode) as part_file:
+            part_file.seek(offset)
+            for data in LimitedReader(stream, length):
+                part_file.write(data)
+                written += len(data)
+
+        if written != length:
+            raise ChunkReadError(f"Expected {length} bytes, received {written}.")
+
+    def sha256(self, session: UploadSession) -> str | None:
+        path = self._part_path(session)
+        if not os.path.exists(path):
+            path = self.fs.path(session.storage_name)
+
+        digest = hashlib.sha256()
+        with open(path, "rb") as video_file:
+            while data := video_file.read(COPY_BUFFER_SIZE):
+                digest.update(data)
+        return digest.hexdigest()
+
+    def assemble(self, session: UploadSession) -> None:
+        part_path = self._part_path(session)
+        final_path = self.fs.path(session.storage_name)
+        if not os.path.exists(part_path) and os.path.exists(final_path):
+            # Already assembled by an earlier completion attempt.
+            return
+
+        os.makedirs(os.path.dirname(final_path), exist_ok=True)
+        os.replace(part_path, final_path)
+
+    def discard(self, session: UploadSession) -> None:
+        part_path = self._part_path(session)
+        if os.path.exists(part_path):
+            os.remove(part_path)
+
+
+class AzureBlockChunkStore(BaseChunkStore):
+    """
+    Stages every chunk as an uncommitted block of the target block blob.
+
+    Assembly commits the block list, which Azure performs server-side.
+    """
+
+    @staticmethod
+    def block_id_for_offset(offset: int) -> str:
+        # Block IDs must have the same length within a blob; the SDK base64-encodes them.
+        return f"{offset:020d}"
+
+    def _blob_client(self, session: UploadSession):
+        storage = self.fs
+        return storage.client.get_blob_client(  # type: ignore[attr-defined]
+            storage._get_valid_path(session.storage_name)  # type: ignore[attr-defined]
+        )
+
+    def begin(self, session: UploadSession) -> None:
+        session.block_ids = []
+
+    def write_chunk(
+        self, session: UploadSession, offset: int, stream: BinaryIO, length: int
+    ) -> None:
+        block_id = self.block_id_for_offset(offset)
+        reader = LimitedReader(stream, length)
+        self._blob_client(session).stage_block(block_id, reader, length=length)
+        if reader.remaining:
+            raise ChunkReadError(
+                f"Expected {length} bytes, received {length - reader.remaining}."
+            )
+
+        if block_id not in session.block_ids:
+            session.block_ids.append(block_id)
+
+    def sha256(self, session: UploadSession) -> str | None:
+        # Uncommitted blocks cannot be downloaded; ingest hashes the blob.
+        return None
+
+    def assemble(self, session: UploadSession) -> None:
+        from azure.storage.blob import BlobBlock
+
+        self._blob_client(session).commit_block_list(
+            [BlobBlock(block_id=block_id) for block_id in session.block_ids]
+        )
+
+    def discard(self, session: UploadSession) -> None:
+        # Uncommitted blocks cannot be deleted on their own. Committing an
+        # empty block list drops them, then the empty blob is deleted.
+        blob_client = self._blob_client(session)
+        blob_client.commit_block_list([])
+        blob_client.delete_blob()
+        session.block_ids = []
+
+
+def get_chunk_store(storage: Storage | None = None) -> BaseChunkStore:
+    fs: Storage = storage or default_storage
+
+    if isinstance(fs, FileSystemStorage):
+        return FileSystemChunkStore(fs)
+
+    from storages.backends.azure_storage import AzureStorage
+
+    if isinstance(fs, AzureStorage):
+        return AzureBlockChunkStore(fs)
+
+    logger.error(f"Chunked uploads not supported for storage {type(fs).__name__}")
+    raise ChunkedUploadNotSupportedError()
@@ -0,0 +1,249 @@
+import re
+import logging
+from datetime import datetime, timedelta
+from typing import BinaryIO
+
+from django.utils import timezone
+
+from analysis.models import VideoAnalysis
+from larvixon_site.settings import CHUNKED_UPLOAD_ABANDONED_AFTER_SECONDS
+from videoprocessor.errors import (
+    UploadChunkOffsetMismatchError,
+    UploadIncompleteError,
+    UploadInvalidContentRangeError,
+    UploadSessionClosedError,
+    UploadSessionNotFoundError,
+    VideoNoFilenameError,
+    VideoNoUploadIDError,
+)
+from videoprocessor.models import UploadSession
+from videoprocessor.services.chunk_store import ChunkReadError, get_chunk_store
+from videoprocessor.services.video_dedup_service import VideoDedupService
+from videoprocessor.services.video_upload_service import VideoUploadService
+
+RECOMMENDED_CHUNK_SIZE: int = 8 * 1024 * 1024
+MAX_CHUNK_SIZE: int = 64 * 1024 * 1024
+
+CONTENT_RANGE_PATTERN = re.compile(r"^bytes (\d+)-(\d+)/(\d+)$")
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+class ChunkedUploadService:
+    """
+    Resumable uploads: init a session, PUT chunks with Content-Range, complete.
+
+    Chunks must arrive in order. A client that lost its connection asks for the
+    session status and resumes from the returned offset. Sessions that receive
+    no chunk within CHUNKED_UPLOAD_ABANDONED_AFTER_SECONDS are expired by
+    ``expire_abandoned``.
+    """
+
+    @staticmethod
+    def create_session(
+        user,
+        filename: str | None,
+        total_size: int,
+        description: str = "",
+        patient_guid: str | None = None,
+    ) -> UploadSession:
+        if not filename:
+            raise VideoNoFilenameError()
+
+        VideoUploadService.validate_upload(filename, total_size, patient_guid)
+
+        # Resolve the final name up front so chunks can be staged in place.
+        placeholder = VideoAnalysis(user=user)
+        storage_name = placeholder.video.field.generate_filename(placeholder, filename)
+
+        session = UploadSession(
+            user=user,
+            filename=filename,
+            description=description,
+            patient_guid=patient_guid or None,
+            total_size=total_size,
+            storage_name=storage_name,
+        )
+        get_chunk_store().begin(session)
+        session.save()
+
+        logger.info(
+            f"Created upload session {session.id} for user {user.id} ({total_size} bytes)"
+        )
+        return session
+
+    @staticmethod
+    def get_session(upload_id, user) -> UploadSession:
+        if not upload_id:
+            raise VideoNoUploadIDError()
+
+        try:
+            return UploadSession.objects.get(id=upload_id, user=user)
+        except UploadSession.DoesNotExist:
+            logger.info(f"Upload session {upload_id} not found for user {user.id}")
+            raise UploadSessionNotFoundError(str(upload_id))
+
+    @staticmethod
+    def parse_content_range(header: str | None) -> tuple[int, int, int]:
+        """Parse ``bytes <start>-<end>/<total>`` into ``(start, length, total)``."""
+        match = CONTENT_RANGE_PATTERN.match((header or "").strip())
+        if not match:
+            raise UploadInvalidContentRangeError()
+
+        start, end, total = (int(group) for group in match.groups())
+        if end < start or end >= total:
+            raise UploadInvalidContentRangeError(
+                f"Invalid byte range {start}-{end} for total size {total}"
+            )
+
+        length = end - start + 1
+        if length > MAX_CHUNK_SIZE:
+            raise UploadInvalidContentRangeError(
+                f"Chunk of {length} bytes exceeds the maximum of {MAX_CHUNK_SIZE} bytes"
+            )
+
+        return start, length, total
+
+    @staticmethod
+    def write_chunk(
+        session: UploadSession,
+        content_range: str | None,
+        stream: BinaryIO | None,
+        content_length: int,
+    ) -> UploadSession:
+        start, length, total = ChunkedUploadService.parse_content_range(content_range)
+
+        if session.status != UploadSession.Status.ACTIVE:
+            raise UploadSessionClosedError()
+
+        if total != session.total_size:
+            raise UploadInvalidContentRangeError(
+                f"Total size {total} does not match the session size {session.total_size}"
+            )
+
+        if content_length != length or stream is None:
+            raise UploadInvalidContentRangeError(
+                f"Content-Length {content_length} does not match the range length {length}"
+            )
+
+        if start != session.received_bytes:
+            raise UploadChunkOffsetMismatchError(
+                expected_offset=session.received_bytes, received_offset=start
+            )
+
+        try:
+            get_chunk_store().write_chunk(session, start, stream, length)
+        except ChunkReadError as e:
+            logger.warning(f"Chunk for upload {session.id} was cut short: {e}")
+            raise UploadInvalidContentRangeError(str(e))
+
+        # Guard against a concurrent retry of the same chunk moving the offset.
+        updated = UploadSession.objects.filter(
+            id=session.id, received_bytes=start, status=UploadSession.Status.ACTIVE
+        ).update(
+            received_bytes=start + length,
+            block_ids=session.block_ids,
+            # update() skips auto_now; the reaper expires sessions by it.
+            updated_at=timezone.now(),
+        )
+        if not updated:
+            session.refresh_from_db()
+            raise UploadChunkOffsetMismatchError(
+                expected_offset=session.received_bytes, received_offset=start
+            )
+
+        session.received_bytes = start + length
+        logger.debug(
+            f"Upload {session.id}: {session.received_bytes}/{session.total_size} bytes"
+        )
+        return session
+
+    @staticmethod
+    def complete(session: UploadSession) -> VideoAnalysis:
+        if not session.is_complete:
+            raise UploadIncompleteError(session.received_bytes, session.total_size)
+
+        # Claim the session so a double-submitted completion cannot assemble twice.
+        claimed = UploadSession.objects.filter(
+            id=session.id, status=UploadSession.Status.ACTIVE
+        ).update(status=UploadSession.Status.COMPLETED)
+        if not claimed:
+            raise UploadSessionClosedError()
+
+        store = get_chunk_store()
+        try:
+            # Known content is never assembled; the analysis shares the
+            # earlier video and the staged bytes are dropped.
+            video_sha256 = store.sha256(session) or ""
+            duplicate = VideoDedupService.find_duplicate(session.user, video_sha256)
+            if duplicate is None:
+                store.assemble(session)
+            analysis = VideoUploadService.create_analysis_for_stored_video(
+                user=session.user,
+                video_name=session.storage_name,
+                description=session.description,
+                patient_guid=(
+                    str(session.patient_guid) if session.patient_guid else None
+                ),
+                video_sha256=video_sha256,
+                duplicate=duplicate,
+            )
+        except Exception:
+            UploadSession.objects.filter(id=session.id).update(
+                status=UploadSession.Status.ACTIVE
+            )
+            raise
+
+        if duplicate is not None:
+            store.discard(session)
+
+        session.status = UploadSession.Status.COMPLETED
+        session.analysis = analysis
+        session.save(update_fields=["status", "analysis", "block_ids", "updated_at"])
+
+        logger.info(f"Upload session {session.id} completed as analysis {analysis.id}")
+        return analysis
+
+    @staticmethod
+    def abort(session: UploadSession) -> None:
+        if session.status != UploadSession.Status.ACTIVE:
+            raise UploadSessionClosedError()
+
+        get_chunk_store().discard(session)
+        session.status = UploadSession.Status.ABORTED
+        session.save(update_fields=["status", "block_ids", "updated_at"])
+        logger.info(f"Upload session {session.id} aborted")
+
+    @staticmethod
+    def expire_abandoned(now: datetime | None = None) -> list[str]:
+        """Expire sessions that stopped receiving chunks and drop their staged bytes."""
+        cutoff = (now or timezone.now()) - timedelta(
+            seconds=CHUNKED_UPLOAD_ABANDONED_AFTER_SECONDS
+        )
+        abandoned = list(
+            UploadSession.objects.filter(
+                status=UploadSession.Status.ACTIVE, updated_at__lt=cutoff
+            )
+        )
+        if not abandoned:
+            return []
+
+        store = get_chunk_store()
+        expired: list[str] = []
+        for session in abandoned:
+            # A chunk or completion that raced the reaper keeps the session.
+            if not UploadSession.objects.filter(
+                id=session.id,
+                status=UploadSession.Status.ACTIVE,
+                updated_at__lt=cutoff,
+            ).update(status=UploadSession.Status.EXPIRED, block_ids=[]):
+                continue
+            expired.append(str(session.id))
+            try:
+                store.discard(session)
+            except Exception as e:
+                logger.warning(f"Could not discard abandoned upload {session.id}: {e}")
+
+        if expired:
+            logger.warning(f"Expired abandoned upload sessions: {expired}")
+        return expired
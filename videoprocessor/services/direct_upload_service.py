@@ -0,0 +1,139 @@
+import logging
+from datetime import datetime, timedelta
+
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+
+from analysis.models import VideoAnalysis
+from larvixon_site.settings import DIRECT_UPLOAD_ABANDONED_AFTER_SECONDS
+from videoprocessor.errors import (
+    DirectUploadNotFoundError,
+    DirectUploadNotReceivedError,
+    VideoForUploadTooLargeError,
+    VideoNoFilenameError,
+)
+from videoprocessor.services.signed_upload import (
+    SignedUpload,
+    get_signed_upload_backend,
+)
+from videoprocessor.services.video_dedup_service import VideoDedupService
+from videoprocessor.services.video_upload_service import VideoUploadService
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+class DirectUploadService:
+    """
+    Uploads that bypass the web tier: the client PUTs the video to a signed
+    storage URL and then asks the API to verify it and start the pipeline.
+    Uploads not completed within DIRECT_UPLOAD_ABANDONED_AFTER_SECONDS are
+    failed by ``expire_abandoned``.
+    """
+
+    @staticmethod
+    def create_upload(
+        user,
+        filename: str | None,
+        size: int,
+        description: str = "",
+        patient_guid: str | None = None,
+    ) -> tuple[VideoAnalysis, SignedUpload]:
+        if not filename:
+            raise VideoNoFilenameError()
+
+        VideoUploadService.validate_upload(filename, size, patient_guid)
+        backend = get_signed_upload_backend()
+
+        with transaction.atomic():
+            analysis = VideoAnalysis(
+                user=user,
+                description=description,
+                patient_guid=patient_guid or None,
+                status=VideoAnalysis.Status.UPLOADING,
+            )
+            analysis.video.name = analysis.video.field.generate_filename(
+                analysis, filename
+            )
+            analysis.save()
+
+            if hasattr(user, "unmark_new_user"):
+                user.unmark_new_user()
+
+        signed_upload = backend.create_upload(analysis.video.name, size, analysis.id)
+
+        logger.info(
+            f"Issued direct upload URL for analysis {analysis.id} ({size} bytes)"
+        )
+        return analysis, signed_upload
+
+    @staticmethod
+    def complete(analysis_id: int, user) -> VideoAnalysis:
+        try:
+            analysis = VideoAnalysis.objects.get(
+                id=analysis_id, user=user, status=VideoAnalysis.Status.UPLOADING
+            )
+        except VideoAnalysis.DoesNotExist:
+            logger.info(f"No pending direct upload {analysis_id} for user {user.id}")
+            raise DirectUploadNotFoundError(analysis_id)
+
+        video_name = analysis.video.name
+        if not default_storage.exists(video_name):
+            raise DirectUploadNotReceivedError()
+
+        try:
+            VideoUploadService.validate_file_size(default_storage.size(video_name))
+        except VideoForUploadTooLargeError:
+            logger.warning(f"Direct upload {video_name} exceeds the size limit")
+            default_storage.delete(video_name)
+            raise
+
+        # Only set when the bytes were hashed as they were received.
+        duplicate = VideoDedupService.find_duplicate(
+            user, analysis.video_sha256, exclude_id=analysis.id
+        )
+
+        # Claim the upload so a double-submitted completion ingests once.
+        claimed = VideoAnalysis.objects.filter(
+            id=analysis.id, status=VideoAnalysis.Status.UPLOADING
+        ).update(status=VideoAnalysis.Status.INGESTING, heartbeat_at=timezone.now())
+        if not claimed:
+            raise DirectUploadNotFoundError(analysis_id)
+
+        analysis.status = VideoAnalysis.Status.INGESTING
+        VideoUploadService.start_ingest(analysis, duplicate)
+        if analysis.video.name != video_name:
+            default_storage.delete(video_name)
+            logger.info(f"Deleted duplicate upload {video_name}")
+
+        logger.info(f"Direct upload completed for analysis {analysis.id}")
+        return analysis
+
+    @staticmethod
+    def expire_abandoned(now: datetime | None = None) -> list[int]:
+        """Fail direct uploads that were never completed and drop their objects."""
+        cutoff = (now or timezone.now()) - timedelta(
+            seconds=DIRECT_UPLOAD_ABANDONED_AFTER_SECONDS
+        )
+        abandoned = VideoAnalysis.objects.filter(
+            status=VideoAnalysis.Status.UPLOADING, created_at__lt=cutoff
+        ).values_list("id", "video")
+
+        failed: list[int] = []
+        for analysis_id, video_name in abandoned:
+            if not VideoAnalysis.objects.filter(id=analysis_id).transition(
+                VideoAnalysis.Status.UPLOADING,
+                VideoAnalysis.Status.FAILED,
+                error_message="Upload was not completed",
+            ):
+                continue
+            failed.append(analysis_id)
+            try:
+                if video_name and default_storage.exists(video_name):
+                    default_storage.delete(video_name)
+            except Exception as e:
+                logger.warning(f"Could not delete abandoned upload {video_name}: {e}")
+
+        if failed:
+            logger.warning(f"Failed abandoned direct uploads: {failed}")
+        return failed
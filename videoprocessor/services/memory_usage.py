@@ -0,0 +1,33 @@
+import logging
+import resource
+import sys
+from contextlib import contextmanager
+from typing import Iterator
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+def peak_rss_bytes() -> int:
+    """Peak resident set size of this process so far."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+@contextmanager
+def track_peak_memory(label: str) -> Iterator[None]:
+    """
+    Log the worker's peak RSS after the block and how much the block raised it.
+
+    The peak never goes down, so a growth of zero means the block fit within
+    memory the process had already used.
+    """
+    peak_before = peak_rss_bytes()
+    try:
+        yield
+    finally:
+        peak_after = peak_rss_bytes()
+        logger.info(
+            f"{label}: peak RSS {peak_after / 1024**2:.1f} MiB "
+            f"(+{(peak_after - peak_before) / 1024**2:.1f} MiB)"
+        )
@@ -0,0 +1,91 @@
+import os
+import uuid
+import logging
+from typing import BinaryIO
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from larvixon_site.settings import ML_POOL_SIZE
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+UPLOAD_BLOCK_SIZE = 1024 * 1024
+
+_sessions: dict[int, requests.Session] = {}
+
+
+def get_ml_session() -> requests.Session:
+    """
+    Keep-alive session shared by every ML request of this process.
+
+    Sessions are keyed by PID so Celery's forked workers never share a pooled
+    socket inherited from the parent.
+    """
+    pid = os.getpid()
+    session = _sessions.get(pid)
+    if session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=ML_POOL_SIZE)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        _sessions.clear()
+        _sessions[pid] = session
+        logger.debug(f"Created ML HTTP session for process {pid}")
+    return session
+
+
+class MultipartFileBody:
+    """
+    ``multipart/form-data`` body with a single file field, read lazily.
+
+    ``requests`` builds ``files=`` bodies in memory; this object has a known
+    length and is read block by block, so the video is streamed from disk.
+    It can be rewound and sent again when a request is retried.
+    """
+
+    def __init__(
+        self, field_name: str, file: BinaryIO, filename: str, content_type: str
+    ) -> None:
+        self.boundary = uuid.uuid4().hex
+        self.file = file
+        self.head = (
+            f"--{self.boundary}\r\n"
+            f'Content-Disposition: form-data; name="{field_name}"; '
+            f'filename="{filename}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n"
+        ).encode()
+        self.tail = f"\r\n--{self.boundary}--\r\n".encode()
+
+        self.file.seek(0, os.SEEK_END)
+        self.file_size = self.file.tell()
+        self.rewind()
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self) -> int:
+        return len(self.head) + self.file_size + len(self.tail)
+
+    def rewind(self) -> None:
+        self.file.seek(0)
+        self._pending = self.head
+        self._file_done = False
+        self._tail_sent = False
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            size = UPLOAD_BLOCK_SIZE
+
+        if not self._pending:
+            if not self._file_done:
+                self._pending = self.file.read(size)
+                if not self._pending:
+                    self._file_done = True
+            if self._file_done and not self._tail_sent:
+                self._pending = self.tail
+                self._tail_sent = True
+
+        data, self._pending = self._pending[:size], self._pending[size:]
+        return data
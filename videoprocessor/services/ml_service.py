@@ -1,8 +1,9 @@
 import logging
-from larvixon_site.settings import MOCK_ML
+from larvixon_site.settings import MOCK_ML, ML_PREDICTION_CACHE_ENABLED
 from .base_ml_service import BaseMLService
 from .mock_ml_service import MockMLService
 from .api_ml_service import APIMLService
+from .cached_ml_service import CachedMLService
 
 logger: logging.Logger = logging.getLogger(__name__)
 
@@ -10,6 +11,8 @@ logger: logging.Logger = logging.getLogger(__name__)
 def get_ml_service() -> BaseMLService:
     if MOCK_ML:
         return MockMLService()
+    if ML_PREDICTION_CACHE_ENABLED:
+        return CachedMLService(APIMLService())
     return APIMLService()
 
 
@@ -15,7 +15,9 @@ SIMULATE_NONE_FOUND = False
 
 class MockMLService(BaseMLService):
     @staticmethod
-    def predict_video(video_path: str) -> dict[str, float] | None:
+    def predict_video(
+        video_path: str, video_sha256: str | None = None
+    ) -> dict[str, float] | None:
         if SIMULATE_NONE_FOUND:
             return {}
 
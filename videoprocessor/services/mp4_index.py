@@ -0,0 +1,196 @@
+"""
+Minimal MP4 (ISO BMFF) box reader used to bound thumbnail extraction.
+
+Only box headers and the ``moov`` atom are read, never the media data, so
+probing a multi-gigabyte upload costs a few seeks and the size of its index.
+"""
+
+import logging
+import struct
+from typing import BinaryIO, Iterator
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+MAX_MOOV_SIZE = 64 * 1024 * 1024
+
+
+class Mp4IndexError(ValueError):
+    """Raised when the stream is not an MP4 file this reader understands."""
+
+
+def _read_exact(handle: BinaryIO, size: int) -> bytes:
+    data = handle.read(size)
+    if len(data) != size:
+        raise Mp4IndexError("Unexpected end of file")
+    return data
+
+
+def iter_top_level_boxes(handle: BinaryIO) -> Iterator[tuple[bytes, int, int, int]]:
+    """Yield ``(type, offset, header_size, box_size)`` by seeking between headers."""
+    handle.seek(0, 2)
+    file_size = handle.tell()
+    offset = 0
+
+    while offset + 8 <= file_size:
+        handle.seek(offset)
+        size, box_type = struct.unpack(">I4s", _read_exact(handle, 8))
+        header_size = 8
+        if size == 1:
+            size = struct.unpack(">Q", _read_exact(handle, 8))[0]
+            header_size = 16
+        elif size == 0:
+            size = file_size - offset
+
+        if size < header_size:
+            raise Mp4IndexError(f"Invalid size for box {box_type!r}")
+
+        yield box_type, offset, header_size, size
+        offset += size
+
+
+def _iter_child_boxes(data: bytes) -> Iterator[tuple[bytes, bytes]]:
+    offset = 0
+    while offset + 8 <= len(data):
+        size, box_type = struct.unpack_from(">I4s", data, offset)
+        header_size = 8
+        if size == 1:
+            size = struct.unpack_from(">Q", data, offset + 8)[0]
+            header_size = 16
+        elif size == 0:
+            size = len(data) - offset
+        if size < header_size or offset + size > len(data):
+            raise Mp4IndexError(f"Invalid size for box {box_type!r}")
+
+        yield box_type, data[offset + header_size : offset + size]
+        offset += size
+
+
+def _find_child(data: bytes, box_type: bytes) -> bytes | None:
+    for child_type, payload in _iter_child_boxes(data):
+        if child_type == box_type:
+            return payload
+    return None
+
+
+def _find_path(data: bytes, path: list[bytes]) -> bytes | None:
+    for box_type in path:
+        found = _find_child(data, box_type)
+        if found is None:
+            return None
+        data = found
+    return data
+
+
+def _video_sample_table(moov: bytes) -> bytes:
+    for box_type, trak in _iter_child_boxes(moov):
+        if box_type != b"trak":
+            continue
+        hdlr = _find_path(trak, [b"mdia", b"hdlr"])
+        # hdlr: version/flags (4), pre_defined (4), handler_type (4)
+        if hdlr is None or hdlr[8:12] != b"vide":
+            continue
+        stbl = _find_path(trak, [b"mdia", b"minf", b"stbl"])
+        if stbl is not None:
+            return stbl
+    raise Mp4IndexError("No video track found")
+
+
+def _first_sync_sample(stbl: bytes) -> int:
+    stss = _find_child(stbl, b"stss")
+    if stss is None:
+        # Without a sync sample table every sample is a keyframe.
+        return 1
+    entry_count = struct.unpack_from(">I", stss, 4)[0]
+    if entry_count == 0:
+        raise Mp4IndexError("Video track has no keyframes")
+    return struct.unpack_from(">I", stss, 8)[0]
+
+
+def _sample_size(stsz: bytes, sample_number: int) -> int:
+    fixed_size, sample_count = struct.unpack_from(">II", stsz, 4)
+    if fixed_size:
+        return fixed_size
+    if sample_number > sample_count:
+        raise Mp4IndexError("Sample number out of range")
+    return struct.unpack_from(">I", stsz, 12 + 4 * (sample_number - 1))[0]
+
+
+def _chunk_offset(stbl: bytes, chunk_number: int) -> int:
+    stco = _find_child(stbl, b"stco")
+    if stco is not None:
+        return struct.unpack_from(">I", stco, 8 + 4 * (chunk_number - 1))[0]
+    co64 = _find_child(stbl, b"co64")
+    if co64 is not None:
+        return struct.unpack_from(">Q", co64, 8 + 8 * (chunk_number - 1))[0]
+    raise Mp4IndexError("Video track has no chunk offset table")
+
+
+def sample_byte_range(stbl: bytes, sample_number: int) -> tuple[int, int]:
+    """Return the ``(start, end)`` byte range of a 1-based sample."""
+    stsc = _find_child(stbl, b"stsc")
+    stsz = _find_child(stbl, b"stsz")
+    if stsc is None or stsz is None:
+        raise Mp4IndexError("Video track has no sample tables")
+
+    entry_count = struct.unpack_from(">I", stsc, 4)[0]
+    entries = [struct.unpack_from(">III", stsc, 8 + 12 * i) for i in range(entry_count)]
+    if not entries:
+        raise Mp4IndexError("Empty sample-to-chunk table")
+
+    first_sample_in_run = 1
+    for index, (first_chunk, samples_per_chunk, _) in enumerate(entries):
+        next_first_chunk = entries[index + 1][0] if index + 1 < len(entries) else None
+        run_samples = (
+            (next_first_chunk - first_chunk) * samples_per_chunk
+            if next_first_chunk is not None
+            else None
+        )
+        if run_samples is None or sample_number < first_sample_in_run + run_samples:
+            chunk_in_run, index_in_chunk = divmod(
+                sample_number - first_sample_in_run, samples_per_chunk
+            )
+            chunk_number = first_chunk + chunk_in_run
+            first_in_chunk = sample_number - index_in_chunk
+            break
+        first_sample_in_run += run_samples
+
+    start = _chunk_offset(stbl, chunk_number)
+    for preceding in range(first_in_chunk, sample_number):
+        start += _sample_size(stsz, preceding)
+    return start, start + _sample_size(stsz, sample_number)
+
+
+def first_keyframe_read_limit(handle: BinaryIO) -> int | None:
+    """
+    Return how many leading bytes are enough to decode the first keyframe.
+
+    Returns ``None`` when the ``moov`` atom sits after the media data (or the
+    file cannot be parsed), in which case the whole file is needed.
+    """
+    try:
+        moov_range = None
+        for box_type, offset, header_size, size in iter_top_level_boxes(handle):
+            if box_type == b"mdat" and moov_range is None:
+                return None
+            if box_type == b"moov":
+                moov_range = (offset, header_size, size)
+                break
+
+        if moov_range is None:
+            return None
+
+        offset, header_size, size = moov_range
+        if size > MAX_MOOV_SIZE:
+            return None
+
+        handle.seek(offset + header_size)
+        moov = _read_exact(handle, size - header_size)
+        stbl = _video_sample_table(moov)
+        _, keyframe_end = sample_byte_range(stbl, _first_sync_sample(stbl))
+
+        return max(offset + size, keyframe_end)
+    except (Mp4IndexError, struct.error) as e:
+        logger.debug(f"Could not read MP4 index: {e}")
+        return None
+    finally:
+        handle.seek(0)
@@ -0,0 +1,193 @@
+import logging
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Iterator
+
+from django.db import connection
+from django.db.models import F
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from analysis.models import VideoAnalysis
+from larvixon_site.settings import (
+    ANALYSIS_HEARTBEAT_SECONDS,
+    ANALYSIS_HEARTBEAT_TIMEOUT_SECONDS,
+    ANALYSIS_MAX_PROCESSING_ATTEMPTS,
+    ANALYSIS_MAX_TASK_RESENDS,
+    ANALYSIS_QUEUED_TIMEOUT_SECONDS,
+    CELERY_QUEUE_INFERENCE,
+    CELERY_QUEUE_INGEST,
+)
+from videoprocessor.services.task_dispatch import TaskDispatch
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+REAPER_BATCH_SIZE = 100
+
+
+class ProcessingWatchdog:
+    """
+    Heartbeats for analyses in PROCESSING and the reaper for dead runs.
+
+    A worker refreshes ``heartbeat_at`` while it waits on the ML service. An
+    analysis whose heartbeat is older than ANALYSIS_HEARTBEAT_TIMEOUT_SECONDS
+    lost its worker; the reaper puts it back to PENDING and requeues it, or
+    fails it once ANALYSIS_MAX_PROCESSING_ATTEMPTS runs have been started.
+
+    For INGESTING and PENDING analyses ``heartbeat_at`` records when their
+    task was last sent (``created_at`` if never). Once one has waited
+    ANALYSIS_QUEUED_TIMEOUT_SECONDS its task is looked up by id, and it is
+    sent again only if the message is gone; resends are counted in
+    ``requeue_count``, apart from the processing attempts.
+    """
+
+    @staticmethod
+    def heartbeat(analysis_id: int) -> bool:
+        """Refresh the heartbeat; False when the analysis is no longer processing."""
+        return bool(
+            VideoAnalysis.objects.filter(
+                id=analysis_id, status=VideoAnalysis.Status.PROCESSING
+            ).update(heartbeat_at=timezone.now())
+        )
+
+    @staticmethod
+    @contextmanager
+    def keep_alive(
+        analysis_id: int, interval: float = ANALYSIS_HEARTBEAT_SECONDS
+    ) -> Iterator[None]:
+        """Send heartbeats from a background thread while the block runs."""
+        stop = threading.Event()
+
+        def beat() -> None:
+            try:
+                while not stop.wait(interval):
+                    try:
+                        if not ProcessingWatchdog.heartbeat(analysis_id):
+                            return
+                    except Exception as e:
+                        logger.warning(
+                            f"Heartbeat failed for analysis {analysis_id}: {e}"
+                        )
+            finally:
+                connection.close()
+
+        thread = threading.Thread(
+            target=beat, name=f"analysis-heartbeat-{analysis_id}", daemon=True
+        )
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    @staticmethod
+    def reap_stuck(now: datetime | None = None) -> dict[str, list[int]]:
+        """Requeue or fail one batch of analyses whose heartbeat expired."""
+        cutoff = (now or timezone.now()) - timedelta(
+            seconds=ANALYSIS_HEARTBEAT_TIMEOUT_SECONDS
+        )
+        stuck = VideoAnalysis.objects.filter(
+            status=VideoAnalysis.Status.PROCESSING, heartbeat_at__lt=cutoff
+        ).values_list("id", "processing_attempts")[:REAPER_BATCH_SIZE]
+
+        requeued: list[int] = []
+        failed: list[int] = []
+        for analysis_id, attempts in stuck:
+            # Re-check the heartbeat in the UPDATE so a worker that just came
+            # back to life keeps its run.
+            rows = VideoAnalysis.objects.filter(id=analysis_id, heartbeat_at__lt=cutoff)
+            if attempts < ANALYSIS_MAX_PROCESSING_ATTEMPTS:
+                if rows.transition(
+                    VideoAnalysis.Status.PROCESSING,
+                    VideoAnalysis.Status.PENDING,
+                    heartbeat_at=timezone.now(),
+                ):
+                    requeued.append(analysis_id)
+            elif rows.transition(
+                VideoAnalysis.Status.PROCESSING,
+                VideoAnalysis.Status.FAILED,
+                heartbeat_at=None,
+                error_message=(
+                    f"Processing timed out after {attempts} attempts "
+                    "without a response from the worker"
+                ),
+            ):
+                failed.append(analysis_id)
+
+        if requeued or failed:
+            logger.warning(
+                f"Reaped stuck analyses: requeued {requeued}, failed {failed}"
+            )
+        return {"requeued": requeued, "failed": failed}
+
+    @staticmethod
+    def reap_queued(now: datetime | None = None) -> dict[str, list[int]]:
+        """
+        Resend the task of INGESTING and PENDING analyses whose last task was
+        lost, or fail them once it has been resent ANALYSIS_MAX_TASK_RESENDS
+        times. Analyses whose task is still queued are left alone however long
+        they wait. Returns the ids resent to ``ingest`` and to ``process``, and
+        the ``failed`` ones.
+        """
+        from videoprocessor.tasks import ingest_video_task, process_video_task
+
+        now = now or timezone.now()
+        cutoff = now - timedelta(seconds=ANALYSIS_QUEUED_TIMEOUT_SECONDS)
+        queued = VideoAnalysis.objects.annotate(
+            queued_at=Coalesce("heartbeat_at", "created_at")
+        ).filter(queued_at__lt=cutoff)
+        waiting = list(
+            queued.filter(
+                status__in=[
+                    VideoAnalysis.Status.INGESTING,
+                    VideoAnalysis.Status.PENDING,
+                ]
+            ).values_list("id", "status", "task_id", "requeue_count")[
+                :REAPER_BATCH_SIZE
+            ]
+        )
+
+        reaped: dict[str, list[int]] = {"ingest": [], "process": [], "failed": []}
+        if not waiting:
+            return reaped
+        broker_ids = TaskDispatch.queued_task_ids(
+            [CELERY_QUEUE_INGEST, CELERY_QUEUE_INFERENCE]
+        )
+        for analysis_id, status, task_id, resends in waiting:
+            if not TaskDispatch.is_lost(task_id, broker_ids):
+                continue
+            # Guarded on the status and the task id, so an analysis that was
+            # picked up or sent again in the meantime is left to that task.
+            rows = queued.filter(id=analysis_id, task_id=task_id)
+            if resends < ANALYSIS_MAX_TASK_RESENDS:
+                new_task_id = str(uuid.uuid4())
+                if rows.filter(status=status).update(
+                    task_id=new_task_id,
+                    heartbeat_at=now,
+                    requeue_count=F("requeue_count") + 1,
+                ):
+                    if status == VideoAnalysis.Status.INGESTING:
+                        TaskDispatch.send(ingest_video_task, analysis_id, new_task_id)
+                        reaped["ingest"].append(analysis_id)
+                    else:
+                        TaskDispatch.send(process_video_task, analysis_id, new_task_id)
+                        reaped["process"].append(analysis_id)
+            elif rows.transition(
+                status,
+                VideoAnalysis.Status.FAILED,
+                heartbeat_at=None,
+                error_message=(
+                    f"The analysis task was lost after being resent {resends} times"
+                ),
+            ):
+                reaped["failed"].append(analysis_id)
+
+        if any(reaped.values()):
+            logger.warning(
+                f"Reaped lost tasks: resent ingest {reaped['ingest']}, "
+                f"resent processing {reaped['process']}, failed {reaped['failed']}"
+            )
+        return reaped
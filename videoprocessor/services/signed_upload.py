@@ -0,0 +1,174 @@
+import hashlib
+import logging
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import BinaryIO
+
+from django.core import signing
+from django.core.files.storage import FileSystemStorage, Storage, default_storage
+from django.urls import reverse
+from django.utils import timezone
+
+from analysis.models import VideoAnalysis
+from larvixon_site.settings import DIRECT_UPLOAD_URL_EXPIRY_SECONDS
+from videoprocessor.errors import (
+    DirectUploadInvalidTokenError,
+    DirectUploadNotSupportedError,
+)
+from videoprocessor.services.chunk_store import (
+    COPY_BUFFER_SIZE,
+    ChunkReadError,
+    LimitedReader,
+)
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+LOCAL_UPLOAD_TOKEN_SALT = "videoprocessor.direct-upload"
+
+
+@dataclass
+class SignedUpload:
+    """Everything a client needs to write one object straight to storage."""
+
+    url: str
+    expires_at: datetime
+    method: str = "PUT"
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+class BaseSignedUploadBackend(ABC):
+    """Issues short-lived URLs that let a client write a video without Django."""
+
+    def __init__(self, storage: Storage | None = None) -> None:
+        self.fs: Storage = storage or default_storage
+
+    @abstractmethod
+    def create_upload(
+        self, storage_name: str, size: int, analysis_id: int
+    ) -> SignedUpload:
+        """Return a short-lived URL that accepts uploads of ``storage_name``."""
+        pass
+
+
+class AzureSignedUploadBackend(BaseSignedUploadBackend):
+    """Write-only SAS URL for the target block blob."""
+
+    def create_upload(
+        self, storage_name: str, size: int, analysis_id: int
+    ) -> SignedUpload:
+        url = self.fs.url(  # type: ignore[call-arg]
+            storage_name, expire=DIRECT_UPLOAD_URL_EXPIRY_SECONDS, mode="cw"
+        )
+        return SignedUpload(
+            url=url,
+            expires_at=timezone.now()
+            + timedelta(seconds=DIRECT_UPLOAD_URL_EXPIRY_SECONDS),
+            headers={"x-ms-blob-type": "BlockBlob"},
+        )
+
+
+class LocalSignedUploadBackend(BaseSignedUploadBackend):
+    """
+    Stand-in for blob SAS URLs on FileSystemStorage.
+
+    The URL points back at this API with a signed token naming the analysis,
+    the object and its size, so the flow can run and be tested without Azure.
+    A PUT is only accepted while the analysis is still UPLOADING, so a
+    replayed URL cannot overwrite a video that has already been ingested.
+    """
+
+    def create_upload(
+        self, storage_name: str, size: int, analysis_id: int
+    ) -> SignedUpload:
+        token = signing.dumps(
+            {"analysis": analysis_id, "name": storage_name, "size": size},
+            salt=LOCAL_UPLOAD_TOKEN_SALT,
+        )
+        return SignedUpload(
+            url=reverse("videoprocessor:direct-upload-blob", args=[token]),
+            expires_at=timezone.now()
+            + timedelta(seconds=DIRECT_UPLOAD_URL_EXPIRY_SECONDS),
+            headers={"Content-Type": "application/octet-stream"},
+        )
+
+    @staticmethod
+    def read_token(token: str) -> tuple[int, str, int]:
+        try:
+            payload = signing.loads(
+                token,
+                salt=LOCAL_UPLOAD_TOKEN_SALT,
+                max_age=DIRECT_UPLOAD_URL_EXPIRY_SECONDS,
+            )
+        except signing.SignatureExpired:
+            raise DirectUploadInvalidTokenError("Upload URL has expired")
+        except signing.BadSignature:
+            raise DirectUploadInvalidTokenError()
+        try:
+            return payload["analysis"], payload["name"], payload["size"]
+        except KeyError:
+            raise DirectUploadInvalidTokenError()
+
+    @staticmethod
+    def check_uploading(analysis_id: int, storage_name: str) -> None:
+        if not VideoAnalysis.objects.filter(
+            id=analysis_id, video=storage_name, status=VideoAnalysis.Status.UPLOADING
+        ).exists():
+            raise DirectUploadInvalidTokenError("Upload URL is no longer valid")
+
+    def receive(self, token: str, stream: BinaryIO, content_length: int) -> None:
+        """Write the request body to the signed name, replacing it atomically."""
+        analysis_id, storage_name, size = self.read_token(token)
+        self.check_uploading(analysis_id, storage_name)
+        if content_length != size:
+            raise DirectUploadInvalidTokenError(
+                f"Content-Length {content_length} does not match the signed size {size}"
+            )
+
+        final_path = self.fs.path(storage_name)
+        os.makedirs(os.path.dirname(final_path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(final_path))
+        written = 0
+        digest = hashlib.sha256()
+        try:
+            with os.fdopen(fd, "wb") as temp_file:
+                reader = LimitedReader(stream, size)
+                while data := reader.read(COPY_BUFFER_SIZE):
+                    temp_file.write(data)
+                    digest.update(data)
+                    written += len(data)
+            if written != size:
+                raise ChunkReadError(f"Expected {size} bytes, received {written}.")
+            # The upload may have been completed or expired while streaming.
+            self.check_uploading(analysis_id, storage_name)
+            os.replace(temp_path, final_path)
+            # Lets completion spot a re-upload without reading the video.
+            VideoAnalysis.objects.filter(
+                id=analysis_id,
+                video=storage_name,
+                status=VideoAnalysis.Status.UPLOADING,
+            ).update(video_sha256=digest.hexdigest())
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        logger.info(f"Received direct upload of {storage_name} ({size} bytes)")
+
+
+def get_signed_upload_backend(
+    storage: Storage | None = None,
+) -> BaseSignedUploadBackend:
+    fs: Storage = storage or default_storage
+
+    if isinstance(fs, FileSystemStorage):
+        return LocalSignedUploadBackend(fs)
+
+    from storages.backends.azure_storage import AzureStorage
+
+    if isinstance(fs, AzureStorage):
+        return AzureSignedUploadBackend(fs)
+
+    logger.error(f"Signed uploads not supported for storage {type(fs).__name__}")
+    raise DirectUploadNotSupportedError()
@@ -0,0 +1,84 @@
+import json
+import logging
+import uuid
+from typing import Any, Iterable
+
+from celery import states
+from celery.result import AsyncResult
+
+from analysis.models import VideoAnalysis
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+class TaskDispatch:
+    """
+    Sends the ingest and processing tasks of an analysis and tells whether the
+    last one sent is still on its way.
+
+    Every send records its Celery task id on the analysis, so the reaper can
+    look that exact message up in the result backend and in the broker
+    instead of guessing from how long the analysis has been waiting.
+    """
+
+    @staticmethod
+    def send(task: Any, analysis_id: int, task_id: str | None = None) -> str:
+        """Send ``task`` for the analysis, recording its id unless given one."""
+        if task_id is None:
+            task_id = str(uuid.uuid4())
+            VideoAnalysis.objects.filter(id=analysis_id).update(task_id=task_id)
+        task.apply_async((analysis_id,), task_id=task_id)
+        return task_id
+
+    @staticmethod
+    def queued_task_ids(queues: Iterable[str]) -> set[str] | None:
+        """
+        Ids of the messages waiting in or reserved from ``queues``, or None
+        when the broker cannot be listed (it is down or not Redis).
+        """
+        from larvixon_site.celery import app
+
+        try:
+            with app.connection_for_read() as connection:
+                connection.ensure_connection(max_retries=1)
+                channel: Any = connection.channel()
+                with channel:
+                    if not hasattr(channel, "conn_or_acquire"):
+                        return None
+                    with channel.conn_or_acquire() as client:
+                        raw: list[bytes] = []
+                        for queue in queues:
+                            for priority in channel.priority_steps:
+                                key = channel._q_for_pri(queue, priority)
+                                raw.extend(client.lrange(key, 0, -1))
+                        # Delivered but not yet acknowledged, e.g. a task that
+                        # is running right now with acks_late.
+                        unacked = client.hvals(channel.unacked_key)
+        except Exception as e:
+            logger.warning(f"Could not list queued tasks: {e}")
+            return None
+
+        messages = [json.loads(m) for m in raw]
+        messages.extend(json.loads(m)[0] for m in unacked)
+        return {m.get("headers", {}).get("id") for m in messages} - {None}
+
+    @staticmethod
+    def is_lost(task_id: str, queued: set[str] | None) -> bool:
+        """
+        Whether the task ``task_id`` can no longer reach its analysis: it was
+        never recorded, it already finished, or the broker does not hold it.
+        Anything that cannot be confirmed counts as still on its way.
+        """
+        if not task_id:
+            return True
+        try:
+            state = AsyncResult(task_id).state
+        except Exception as e:
+            logger.warning(f"Could not read the state of task {task_id}: {e}")
+            return False
+        if state in states.READY_STATES:
+            # It ran, yet the analysis is still waiting for it.
+            return True
+        if state != states.PENDING:
+            return False
+        return queued is not None and task_id not in queued
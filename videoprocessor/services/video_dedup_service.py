@@ -0,0 +1,123 @@
+import hashlib
+import logging
+from typing import Any
+
+from django.db import transaction
+from django.utils import timezone
+
+from analysis.models import AnalysisResult, VideoAnalysis
+from larvixon_site.settings import DEDUP_REUSE_RESULTS
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+REUSABLE_STATUSES = (
+    VideoAnalysis.Status.PENDING,
+    VideoAnalysis.Status.PROCESSING,
+    VideoAnalysis.Status.COMPLETED,
+    VideoAnalysis.Status.FAILED,
+)
+
+
+class VideoDedupService:
+    """
+    Detects re-uploads of identical video content for the same user.
+
+    A duplicate shares the stored video and thumbnail of the earlier analysis
+    and, when that one has finished, copies its results instead of running
+    inference again.
+    """
+
+    @staticmethod
+    def compute_sha256(video_file) -> str:
+        digest = hashlib.sha256()
+        for chunk in video_file.chunks(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+        video_file.seek(0)
+        return digest.hexdigest()
+
+    @staticmethod
+    def find_duplicate(
+        user, sha256: str | None, exclude_id: int | None = None
+    ) -> VideoAnalysis | None:
+        """Most recent ingested analysis of the same content, if any."""
+        if not sha256:
+            return None
+
+        duplicates = (
+            VideoAnalysis.objects.filter(
+                user=user, video_sha256=sha256, status__in=REUSABLE_STATUSES
+            )
+            .exclude(video="")
+            .exclude(video__isnull=True)
+            .exclude(thumbnail="")
+            .exclude(thumbnail__isnull=True)
+        )
+        if exclude_id is not None:
+            duplicates = duplicates.exclude(id=exclude_id)
+        return duplicates.order_by("-created_at").first()
+
+    @staticmethod
+    def reuse_duplicate(analysis: VideoAnalysis, duplicate: VideoAnalysis) -> bool:
+        """
+        Point ``analysis`` at the files of ``duplicate`` and copy its results.
+
+        Moves the analysis out of INGESTING: to COMPLETED when results were
+        copied, to PENDING when inference still has to run. Returns False and
+        leaves everything as it was when the analysis is no longer ingesting.
+        """
+        fields: dict[str, Any] = {
+            "video": duplicate.video.name,
+            "thumbnail": duplicate.thumbnail.name,
+            "video_metadata": duplicate.video_metadata,
+            "video_sha256": analysis.video_sha256,
+        }
+        target = VideoAnalysis.Status.PENDING
+
+        with transaction.atomic():
+            copied = DEDUP_REUSE_RESULTS and VideoDedupService.copy_results(
+                duplicate, analysis
+            )
+            if copied:
+                target = VideoAnalysis.Status.COMPLETED
+                fields["completed_at"] = timezone.now()
+            reused = analysis.transition_to(
+                target, VideoAnalysis.Status.INGESTING, **fields
+            )
+            if not reused:
+                # Reaped or failed meanwhile; drop the copied results too.
+                transaction.set_rollback(True)
+
+        if not reused:
+            logger.warning(
+                f"Analysis {analysis.id} is no longer ingesting, not reusing "
+                f"analysis {duplicate.id}"
+            )
+            return False
+
+        logger.info(
+            f"Analysis {analysis.id} reuses the video of analysis {duplicate.id}"
+            + (" and its results" if copied else "")
+        )
+        return True
+
+    @staticmethod
+    def copy_results(source: VideoAnalysis, target: VideoAnalysis) -> bool:
+        if source.status != VideoAnalysis.Status.COMPLETED:
+            return False
+
+        results = [
+            AnalysisResult(
+                analysis=target,
+                substance_id=result.substance_id,
+                confidence_score=result.confidence_score,
+            )
+            for result in source.analysis_results.all()
+        ]
+        if not results:
+            return False
+
+        AnalysisResult.objects.bulk_create(results)
+        VideoAnalysis.objects.filter(id=target.id).refresh_top_prediction()
+        return True
@@ -1,22 +1,96 @@
+import io
 import tempfile
 import cv2
 import logging
+from contextlib import contextmanager
+from typing import Iterator
 from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
 import os
 from django.core.files.storage import Storage
 
+from videoprocessor.services.mp4_index import first_keyframe_read_limit
+
 logger: logging.Logger = logging.getLogger(__name__)
 
 THUMBNAIL_FILENAME_SUFFIX = "_thumb.jpg"
 
+# Extra bytes past the first keyframe so FFmpeg can finish probing the streams.
+FIRST_FRAME_READ_SLACK = 512 * 1024
+
+
+class BoundedStreamReader(io.BufferedIOBase):
+    """Seekable view over a file handle that reports EOF past ``limit`` bytes."""
+
+    def __init__(self, handle, limit: int) -> None:
+        super().__init__()
+        self.handle = handle
+        self.limit = limit
+        self.bytes_read = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.handle.tell()
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        self.handle.seek(offset, whence)
+        return self.handle.tell()
+
+    def read(self, size: int | None = -1) -> bytes:
+        remaining = self.limit - self.handle.tell()
+        if remaining <= 0:
+            return b""
+        if size is None or size < 0 or size > remaining:
+            size = remaining
+        data = self.handle.read(size)
+        self.bytes_read += len(data)
+        return data
+
 
 class VideoFileManager:
     def __init__(self, storage: Storage | None = None) -> None:
         self.fs: Storage = storage or default_storage
 
     @staticmethod
-    def extract_and_save_first_frame(video_file):
+    @contextmanager
+    def _open_capture(video_file) -> Iterator[cv2.VideoCapture]:
+        """
+        Open a capture over the video while reading as little of it as possible.
+
+        Files already spooled to disk are opened in place. MP4s whose index
+        precedes the media data are read through a bounded stream that stops
+        after the first keyframe. Only files with the index at the end are
+        copied to a temporary file.
+        """
+        if hasattr(video_file, "temporary_file_path"):
+            cap = cv2.VideoCapture(video_file.temporary_file_path())
+            try:
+                yield cap
+            finally:
+                cap.release()
+            return
+
+        read_limit = first_keyframe_read_limit(video_file)
+        if read_limit is not None:
+            reader = BoundedStreamReader(
+                video_file, read_limit + FIRST_FRAME_READ_SLACK
+            )
+            # OpenCV accepts any io.BufferedIOBase here; its stubs only list IStreamReader.
+            cap = cv2.VideoCapture(reader, cv2.CAP_FFMPEG, [])  # type: ignore[call-overload]
+            try:
+                yield cap
+            finally:
+                cap.release()
+                logger.debug(
+                    f"Read {reader.bytes_read} bytes of {video_file.name} for first frame"
+                )
+            return
+
         temp_path = None
         try:
             suffix = os.path.splitext(video_file.name)[1]
@@ -27,32 +101,61 @@ class VideoFileManager:
                 temp_path = temp_f.name
 
             cap = cv2.VideoCapture(temp_path)
+            try:
+                yield cap
+            finally:
+                cap.release()
+
+        finally:
+            if temp_path and os.path.exists(temp_path):
+                os.unlink(temp_path)
+
+    @staticmethod
+    def read_video_metadata(video_file) -> dict:
+        """Read basic container properties; empty if the video cannot be opened."""
+        with VideoFileManager._open_capture(video_file) as cap:
+            if not cap.isOpened():
+                logger.warning(f"Could not open {video_file.name} to read metadata")
+                return {}
+
+            fps = cap.get(cv2.CAP_PROP_FPS)
+            frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+
+        return {
+            "fps": round(fps, 3) if fps > 0 else None,
+            "frame_count": frame_count if frame_count > 0 else None,
+            "width": width or None,
+            "height": height or None,
+            "duration_seconds": (
+                round(frame_count / fps, 3) if fps > 0 and frame_count > 0 else None
+            ),
+        }
+
+    @staticmethod
+    def extract_and_save_first_frame(video_file):
+        with VideoFileManager._open_capture(video_file) as cap:
             if not cap.isOpened():
                 raise IOError("Could not open video file for frame extraction.")
 
             ret, frame = cap.read()
-            cap.release()
-            if not ret:
-                raise IOError("Could not read first frame from video.")
-
-            encode_param = [int(cv2.IMWRITE_JPEG_QUALITY), 90]
-            is_success, buffer = cv2.imencode(".jpg", frame, encode_param)
-            if not is_success:
-                raise IOError("Failed to encode frame to JPEG.")
-
-            # Handle both numpy array (real cv2) and bytes (mocked tests)
-            if hasattr(buffer, "tobytes"):
-                buffer_bytes = buffer.tobytes()
-            else:
-                buffer_bytes = (
-                    bytes(buffer) if not isinstance(buffer, bytes) else buffer
-                )
-            content_file = ContentFile(buffer_bytes)
-            base_name, _ = os.path.splitext(video_file.name)
-            thumbnail_name = base_name + THUMBNAIL_FILENAME_SUFFIX
 
-            return thumbnail_name, content_file
+        if not ret:
+            raise IOError("Could not read first frame from video.")
 
-        finally:
-            if temp_path and os.path.exists(temp_path):
-                os.unlink(temp_path)
+        encode_param = [int(cv2.IMWRITE_JPEG_QUALITY), 90]
+        is_success, buffer = cv2.imencode(".jpg", frame, encode_param)
+        if not is_success:
+            raise IOError("Failed to encode frame to JPEG.")
+
+        # Handle both numpy array (real cv2) and bytes (mocked tests)
+        if hasattr(buffer, "tobytes"):
+            buffer_bytes = buffer.tobytes()
+        else:
+            buffer_bytes = bytes(buffer) if not isinstance(buffer, bytes) else buffer
+        content_file = ContentFile(buffer_bytes)
+        base_name, _ = os.path.splitext(video_file.name)
+        thumbnail_name = base_name + THUMBNAIL_FILENAME_SUFFIX
+
+        return thumbnail_name, content_file
@@ -0,0 +1,99 @@
+import os
+import logging
+from django.core.files.storage import default_storage
+from django.utils import timezone
+
+from analysis.models import VideoAnalysis
+from videoprocessor.errors import (
+    VideoAnalysisNotFoundError,
+    VideoFileAccessError,
+    VideoIngestError,
+)
+from videoprocessor.services.video_dedup_service import VideoDedupService
+from videoprocessor.services.video_file_manager import VideoFileManager
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+class VideoIngestService:
+    """
+    Second half of an upload, run by a worker after the raw video is stored.
+
+    Hashes the video, generates the thumbnail and reads the container
+    metadata, then moves the analysis from INGESTING to PENDING so processing
+    can start. Re-uploads of known content reuse the earlier analysis instead.
+    """
+
+    @staticmethod
+    def get_analysis(analysis_id: int) -> VideoAnalysis:
+        try:
+            return VideoAnalysis.objects.get(id=analysis_id)
+        except VideoAnalysis.DoesNotExist:
+            logger.error(f"VideoAnalysis with ID {analysis_id} not found")
+            raise VideoAnalysisNotFoundError(analysis_id)
+
+    @staticmethod
+    def ingest(analysis_id: int) -> VideoAnalysis:
+        analysis = VideoIngestService.get_analysis(analysis_id)
+        if analysis.status != VideoAnalysis.Status.INGESTING:
+            raise VideoIngestError(
+                f"Analysis {analysis_id} is {analysis.status}, not ingesting"
+            )
+
+        logger.info(f"Ingesting video {analysis.video.name} for analysis {analysis_id}")
+
+        try:
+            stored_video = default_storage.open(analysis.video.name, "rb")
+        except Exception as e:
+            logger.error(f"Error opening video for analysis {analysis_id}: {e}")
+            raise VideoFileAccessError(f"Failed to access video file: {str(e)}")
+
+        with stored_video:
+            if not analysis.video_sha256:
+                # Uploads that could not be hashed while they streamed in.
+                analysis.video_sha256 = VideoDedupService.compute_sha256(stored_video)
+            duplicate = VideoDedupService.find_duplicate(
+                analysis.user, analysis.video_sha256, exclude_id=analysis.id
+            )
+            if duplicate is not None:
+                VideoIngestService._replace_with_duplicate(analysis, duplicate)
+                return analysis
+
+            try:
+                thumbnail_filename, thumbnail_content = (
+                    VideoFileManager.extract_and_save_first_frame(stored_video)
+                )
+            except IOError as e:
+                raise VideoIngestError(str(e))
+            metadata = VideoFileManager.read_video_metadata(stored_video)
+
+        analysis.thumbnail.save(
+            os.path.basename(thumbnail_filename), thumbnail_content, save=False
+        )
+        ingested = analysis.transition_to(
+            VideoAnalysis.Status.PENDING,
+            VideoAnalysis.Status.INGESTING,
+            thumbnail=analysis.thumbnail.name,
+            video_metadata=metadata,
+            video_sha256=analysis.video_sha256,
+            heartbeat_at=timezone.now(),
+        )
+        if not ingested:
+            logger.warning(f"Analysis {analysis_id} stopped ingesting meanwhile")
+            default_storage.delete(analysis.thumbnail.name)
+            return analysis
+
+        logger.info(f"Ingest finished for analysis {analysis_id}")
+        return analysis
+
+    @staticmethod
+    def _replace_with_duplicate(
+        analysis: VideoAnalysis, duplicate: VideoAnalysis
+    ) -> None:
+        """Drop the freshly stored copy and share the duplicate's files instead."""
+        uploaded_name = analysis.video.name
+        if not VideoDedupService.reuse_duplicate(analysis, duplicate):
+            return
+        if uploaded_name and uploaded_name != duplicate.video.name:
+            default_storage.delete(uploaded_name)
+            logger.info(f"Deleted duplicate upload {uploaded_name}")
@@ -1,13 +1,20 @@
 import os
+import shutil
 import logging
 from typing import Dict, List, Tuple
+from django.db import transaction
+from django.db.models import F
 from django.utils import timezone
-from django.core.files.storage import default_storage
+from django.core.files.storage import FileSystemStorage, default_storage
 from tempfile import NamedTemporaryFile
 
-from analysis.models import Substance, VideoAnalysis
+from analysis.models import AnalysisResult, Substance, VideoAnalysis
+from analysis.services.substance_catalog import SubstanceCatalog
+from videoprocessor.services.analysis_lease import AnalysisLease
 from videoprocessor.services.ml_service import ml_service
+from videoprocessor.services.processing_watchdog import ProcessingWatchdog
 from videoprocessor.errors import (
+    AnalysisLeaseLostError,
     VideoAnalysisNotFoundError,
     MLPredictionError,
     VideoFileAccessError,
@@ -15,6 +22,8 @@ from videoprocessor.errors import (
 
 logger = logging.getLogger(__name__)
 
+STREAM_BUFFER_SIZE = 1024 * 1024
+
 
 class VideoProcessingService:
     @staticmethod
@@ -25,6 +34,25 @@ class VideoProcessingService:
             return []
         return sorted(scores.items(), key=lambda item: item[1], reverse=True)
 
+    @staticmethod
+    def resolve_substance_ids(names: list[str]) -> dict[str, int]:
+        """Map names to substance ids, creating missing substances in bulk."""
+        substance_ids = SubstanceCatalog.ids_for_names(names)
+        missing = [name for name in names if name not in substance_ids]
+        if missing:
+            # A concurrent task may create the same substances; let it win.
+            Substance.objects.bulk_create(
+                [Substance(name_en=name) for name in missing], ignore_conflicts=True
+            )
+            substance_ids.update(
+                Substance.objects.filter(name_en__in=missing).values_list(
+                    "name_en", "id"
+                )
+            )
+            transaction.on_commit(SubstanceCatalog.bump)
+            logger.debug(f"Created new substances: {', '.join(missing)}")
+        return substance_ids
+
     @staticmethod
     def save_analysis_results(
         analysis: VideoAnalysis, predictions: Dict[str, float]
@@ -37,26 +65,29 @@ class VideoProcessingService:
             f"Saving {len(predictions)} prediction results for analysis {analysis.id}"
         )
 
-        try:
-            VideoAnalysis.objects.get(id=analysis.id)
-        except VideoAnalysis.DoesNotExist:
+        if not VideoAnalysis.objects.filter(id=analysis.id).exists():
             logger.error(
                 f"Analysis {analysis.id} was deleted before results could be saved"
             )
             raise VideoAnalysisNotFoundError(analysis.id)
 
-        for substance_name, score in VideoProcessingService.get_sorted_predictions(
-            predictions
-        ):
-            detected_substance, created = Substance.objects.get_or_create(
-                name_en=substance_name
-            )
-            if created:
-                logger.debug(f"Created new substance: {substance_name}")
+        sorted_predictions = VideoProcessingService.get_sorted_predictions(predictions)
 
-            analysis.analysis_results.create(  # type: ignore[attr-defined]
-                substance=detected_substance, confidence_score=score
+        substance_ids = VideoProcessingService.resolve_substance_ids(
+            [name for name, _ in sorted_predictions]
+        )
+        with transaction.atomic():
+            AnalysisResult.objects.bulk_create(
+                [
+                    AnalysisResult(
+                        analysis=analysis,
+                        substance_id=substance_ids[substance_name],
+                        confidence_score=score,
+                    )
+                    for substance_name, score in sorted_predictions
+                ]
             )
+            VideoAnalysis.objects.filter(id=analysis.id).refresh_top_prediction()
 
         logger.info(f"Successfully saved results for analysis {analysis.id}")
 
@@ -69,25 +100,71 @@ class VideoProcessingService:
             raise VideoAnalysisNotFoundError(analysis_id)
 
     @staticmethod
-    def process_video(analysis_id: int) -> None:
+    def get_local_path(video_name: str) -> str | None:
+        """Path of the stored video if the storage already keeps it on local disk."""
+        if isinstance(default_storage, FileSystemStorage):
+            return default_storage.path(video_name)
+        return None
+
+    @staticmethod
+    def download_to_temp_file(video_name: str, temp_file) -> None:
+        """Copy the stored video into ``temp_file`` without holding it in memory."""
+        from storages.backends.azure_storage import AzureStorage
+
+        if isinstance(default_storage, AzureStorage):
+            # AzureFile would spool the whole blob before the first read.
+            blob_client = default_storage.client.get_blob_client(  # type: ignore[attr-defined]
+                default_storage._get_valid_path(video_name)  # type: ignore[attr-defined]
+            )
+            blob_client.download_blob().readinto(temp_file)
+            return
+
+        with default_storage.open(video_name, "rb") as f:
+            shutil.copyfileobj(f, temp_file, STREAM_BUFFER_SIZE)
+
+    @staticmethod
+    def process_video(analysis_id: int, lease: AnalysisLease | None = None) -> None:
         logger.info(f"Starting video processing for analysis ID {analysis_id}")
         video_path = None
+        temp_path = None
 
         try:
             analysis = VideoProcessingService.get_analysis(analysis_id)
 
-            analysis.status = VideoAnalysis.Status.PENDING
-            analysis.error_message = None
-            analysis.save()
-            logger.debug(f"Set analysis {analysis_id} status to PENDING")
+            if analysis.status == VideoAnalysis.Status.COMPLETED:
+                # Redelivery of a task whose first run already committed.
+                logger.info(f"Analysis {analysis_id} already completed, skipping")
+                return
+
+            # PROCESSING is accepted too: it is a redelivery of a run whose
+            # worker died, and the lease guarantees nobody else is on it.
+            now = timezone.now()
+            if not analysis.transition_to(
+                VideoAnalysis.Status.PROCESSING,
+                [VideoAnalysis.Status.PENDING, VideoAnalysis.Status.PROCESSING],
+                started_at=now,
+                heartbeat_at=now,
+                error_message=None,
+                processing_attempts=F("processing_attempts") + 1,
+            ):
+                logger.info(
+                    f"Analysis {analysis_id} is {analysis.status}, not processing it"
+                )
+                return
+            logger.debug(f"Set analysis {analysis_id} status to PROCESSING")
 
             try:
-                with default_storage.open(analysis.video.name, "rb") as f:
+                video_path = VideoProcessingService.get_local_path(analysis.video.name)
+                if video_path is None:
                     with NamedTemporaryFile(delete=False, suffix=".mp4") as tmp_file:
-                        tmp_file.write(f.read())
-                        tmp_file.flush()
-                        video_path = tmp_file.name
-                        logger.debug(f"Created temporary file at {video_path}")
+                        temp_path = tmp_file.name
+                        VideoProcessingService.download_to_temp_file(
+                            analysis.video.name, tmp_file
+                        )
+                    video_path = temp_path
+                    logger.debug(f"Downloaded video to temporary file {temp_path}")
+                elif not os.path.exists(video_path):
+                    raise FileNotFoundError(video_path)
             except Exception as e:
                 logger.error(
                     f"Error accessing video file for analysis {analysis_id}: {e}"
@@ -96,7 +173,10 @@ class VideoProcessingService:
 
             logger.info(f"Sending video to ML service for analysis {analysis_id}")
             try:
-                results = ml_service.predict_video(video_path)
+                with ProcessingWatchdog.keep_alive(analysis_id):
+                    results = ml_service.predict_video(
+                        video_path, video_sha256=analysis.video_sha256
+                    )
             except Exception as e:
                 logger.error(f"ML prediction failed for analysis {analysis_id}: {e}")
                 raise MLPredictionError(f"ML service error: {str(e)}")
@@ -105,19 +185,29 @@ class VideoProcessingService:
                 logger.warning(f"No predictions returned for analysis {analysis_id}")
                 raise MLPredictionError("No predictions returned from ML endpoint")
 
-            VideoProcessingService.save_analysis_results(analysis, results)
-
-            analysis.completed_at = timezone.now()
-            analysis.status = VideoAnalysis.Status.COMPLETED
-            analysis.save()
+            if lease is not None and not lease.renew():
+                # Another worker may own the analysis now; leave the results to it.
+                raise AnalysisLeaseLostError(analysis_id)
+
+            with transaction.atomic():
+                VideoProcessingService.save_analysis_results(analysis, results)
+                # The reaper may have given the run up while the ML call hung;
+                # its decision stands and these results are rolled back.
+                if not analysis.transition_to(
+                    VideoAnalysis.Status.COMPLETED,
+                    VideoAnalysis.Status.PROCESSING,
+                    completed_at=timezone.now(),
+                    heartbeat_at=None,
+                ):
+                    raise AnalysisLeaseLostError(analysis_id)
 
             logger.info(f"Successfully completed processing for analysis {analysis_id}")
 
         finally:
-            # Clean up temporary file
-            if video_path and os.path.exists(video_path):
+            # Clean up temporary file; a storage path is never removed.
+            if temp_path and os.path.exists(temp_path):
                 try:
-                    os.remove(video_path)
-                    logger.debug(f"Cleaned up temporary file: {video_path}")
+                    os.remove(temp_path)
+                    logger.debug(f"Cleaned up temporary file: {temp_path}")
                 except Exception as e:
-                    logger.error(f"Error cleaning up temp file {video_path}: {e}")
+                    logger.error(f"Error cleaning up temp file {temp_path}: {e}")
@@ -1,6 +1,5 @@
 import os
 import logging
-from django.core.files import File
 from django.db import transaction
 
 from analysis.models import VideoAnalysis
@@ -13,8 +12,9 @@ from videoprocessor.errors import (
     VideoNoFileError,
     VideoWrongFormatError,
 )
-from videoprocessor.services import VideoFileManager
 from patients.services import patient_service
+from videoprocessor.services.task_dispatch import TaskDispatch
+from videoprocessor.services.video_dedup_service import VideoDedupService
 
 MAX_GIGABYTES = 3
 GIGABYTE = 1024**3
@@ -30,6 +30,21 @@ class VideoUploadService:
         if not video_file:
             raise VideoNoFileError()
 
+        VideoUploadService.validate_upload(
+            video_file.name, video_file.size, patient_guid
+        )
+
+        analysis: VideoAnalysis = VideoUploadService.save_and_process_video(
+            user=user,
+            video_file=video_file,
+            description=description,
+            patient_guid=patient_guid,
+        )
+
+        return analysis
+
+    @staticmethod
+    def validate_upload(filename: str, file_size: int, patient_guid) -> None:
         if patient_guid:
             patient_service.validate_uuid(patient_guid)
 
@@ -41,26 +56,17 @@ class VideoUploadService:
                 )
 
         try:
-            VideoUploadService.validate_file_format(video_file.name)
+            VideoUploadService.validate_file_format(filename)
         except VideoWrongFormatError as e:
             logger.warning(f"File format validation failed: {e}")
             raise
 
         try:
-            VideoUploadService.validate_file_size(video_file.size)
+            VideoUploadService.validate_file_size(file_size)
         except VideoForUploadTooLargeError as e:
             logger.warning(f"File size validation failed: {e}")
             raise
 
-        analysis: VideoAnalysis = VideoUploadService.save_and_process_video(
-            user=user,
-            video_file=video_file,
-            description=description,
-            patient_guid=patient_guid,
-        )
-
-        return analysis
-
     @staticmethod
     def validate_file_size(file_size: int) -> None:
         if file_size > MAX_FILE_SIZE:
@@ -82,32 +88,89 @@ class VideoUploadService:
         description: str = "",
         patient_guid: str | None = None,
     ) -> VideoAnalysis:
-        logger.info(f"Saving video for user {user.id}")
+        """
+        Persist the raw upload and hand thumbnail and metadata work to a worker.
 
-        thumbnail_filename, thumbnail_content = (
-            VideoFileManager.extract_and_save_first_frame(video_file)
-        )
+        Files hashed while they streamed in (see ``HashingMultiPartParser``)
+        are checked for a duplicate first, and a re-upload of known content is
+        never written to storage.
+        """
+        logger.info(f"Saving video for user {user.id}")
 
-        video_file_name = video_file.name
-        thumbnail_filename = os.path.basename(thumbnail_filename)
+        video_sha256 = getattr(video_file, "sha256", "")
+        duplicate = VideoDedupService.find_duplicate(user, video_sha256)
 
         with transaction.atomic():
             analysis = VideoAnalysis.objects.create(
                 user=user,
                 description=description,
                 patient_guid=patient_guid,
+                status=VideoAnalysis.Status.INGESTING,
+                video_sha256=video_sha256,
             )
-            analysis.video.save(video_file_name, video_file, save=True)
-            analysis.thumbnail.save(thumbnail_filename, thumbnail_content, save=True)
+            if duplicate is None:
+                analysis.video.save(video_file.name, video_file, save=True)
 
             if hasattr(user, "unmark_new_user"):
                 user.unmark_new_user()
 
         logger.info(f"Video saved successfully, analysis ID: {analysis.id}")
 
-        # Import here to avoid circular import
-        from videoprocessor.tasks import process_video_task
+        VideoUploadService.start_ingest(analysis, duplicate)
+
+        return analysis
+
+    @staticmethod
+    def create_analysis_for_stored_video(
+        user,
+        video_name: str,
+        description: str = "",
+        patient_guid: str | None = None,
+        video_sha256: str = "",
+        duplicate: VideoAnalysis | None = None,
+    ) -> VideoAnalysis:
+        """
+        Create an analysis for a video that is already in storage and start
+        ingesting it, or for a ``duplicate`` whose video it shares instead.
+        """
+        logger.info(f"Registering stored video {video_name} for user {user.id}")
+
+        with transaction.atomic():
+            analysis = VideoAnalysis(
+                user=user,
+                description=description,
+                patient_guid=patient_guid,
+                status=VideoAnalysis.Status.INGESTING,
+                video_sha256=video_sha256,
+            )
+            if duplicate is None:
+                analysis.video.name = video_name
+            analysis.save()
+
+            if hasattr(user, "unmark_new_user"):
+                user.unmark_new_user()
 
-        process_video_task.delay(analysis.id)
+        logger.info(f"Stored video registered, analysis ID: {analysis.id}")
+
+        VideoUploadService.start_ingest(analysis, duplicate)
 
         return analysis
+
+    @staticmethod
+    def start_ingest(
+        analysis: VideoAnalysis, duplicate: VideoAnalysis | None = None
+    ) -> None:
+        """
+        Queue ingest, or skip it by sharing the files of a known ``duplicate``
+        and queue processing only when its results could not be copied.
+        """
+        # Import here to avoid circular import
+        from videoprocessor.tasks import ingest_video_task, process_video_task
+
+        if duplicate is None:
+            TaskDispatch.send(ingest_video_task, analysis.id)
+            return
+
+        reused = VideoDedupService.reuse_duplicate(analysis, duplicate)
+        if reused and analysis.status == VideoAnalysis.Status.PENDING:
+            TaskDispatch.send(process_video_task, analysis.id)
@@ -2,55 +2,124 @@ import logging
 from celery import shared_task
 from analysis.models import VideoAnalysis
 
+from videoprocessor.services.analysis_lease import AnalysisLease
+from videoprocessor.services.chunked_upload_service import ChunkedUploadService
+from videoprocessor.services.direct_upload_service import DirectUploadService
+from videoprocessor.services.memory_usage import track_peak_memory
+from videoprocessor.services.processing_watchdog import ProcessingWatchdog
+from videoprocessor.services.task_dispatch import TaskDispatch
+from videoprocessor.services.video_ingest_service import VideoIngestService
 from videoprocessor.services.video_processing_service import VideoProcessingService
 from videoprocessor.errors import (
+    AnalysisLeaseLostError,
     VideoAnalysisNotFoundError,
     MLPredictionError,
     VideoFileAccessError,
+    VideoIngestError,
     VideoProcessingError,
 )
 
 logger = logging.getLogger(__name__)
 
 
+@shared_task
+def ingest_video_task(analysis_id: int) -> None:
+    """Generate the thumbnail and metadata, then chain the processing task."""
+    logger.info(f"Ingest task started for analysis ID {analysis_id}")
+
+    try:
+        analysis = VideoIngestService.ingest(analysis_id)
+
+    except VideoAnalysisNotFoundError as e:
+        logger.error(f"Analysis not found: {e}")
+        return
+
+    except Exception as e:
+        if isinstance(e, (VideoIngestError, VideoFileAccessError)):
+            logger.error(f"Ingest error for analysis {analysis_id}: {e}")
+        else:
+            logger.exception(f"Unexpected error ingesting analysis {analysis_id}: {e}")
+        VideoAnalysis.objects.filter(id=analysis_id).transition(
+            VideoAnalysis.Status.INGESTING,
+            VideoAnalysis.Status.FAILED,
+            error_message=f"Ingest failed: {str(e)}",
+        )
+        return
+
+    # Only a successfully ingested video reaches the ML stage, and a re-upload
+    # whose results were copied from an earlier analysis skips it entirely.
+    if analysis.status == VideoAnalysis.Status.PENDING:
+        TaskDispatch.send(process_video_task, analysis_id)
+    logger.info(f"Ingest task completed for analysis ID {analysis_id}")
+
+
 @shared_task
 def process_video_task(analysis_id: int) -> None:
     logger.info(f"Celery task started for analysis ID {analysis_id}")
-    analysis = None
+    with AnalysisLease(analysis_id) as lease:
+        if not lease.acquired:
+            # A retry or redelivery while another worker is still on it.
+            logger.info(f"Analysis {analysis_id} is already being processed, skipping")
+            return
+        _process_video_with_lease(analysis_id, lease)
+    logger.info(f"Celery task completed for analysis ID {analysis_id}")
+
 
+def _process_video_with_lease(analysis_id: int, lease: AnalysisLease) -> None:
     try:
-        VideoProcessingService.process_video(analysis_id)
+        with track_peak_memory(f"process_video_task[{analysis_id}]"):
+            VideoProcessingService.process_video(analysis_id, lease=lease)
 
     except VideoAnalysisNotFoundError as e:
         logger.error(f"Analysis not found: {e}")
         return
 
+    except AnalysisLeaseLostError as e:
+        logger.warning(f"Abandoning analysis {analysis_id}: {e}")
+        return
+
     except (MLPredictionError, VideoFileAccessError, VideoProcessingError) as e:
         logger.error(f"Video processing error for analysis {analysis_id}: {e}")
-        try:
-            analysis = VideoAnalysis.objects.get(id=analysis_id)
-            analysis.status = VideoAnalysis.Status.FAILED
-            analysis.error_message = f"Processing failed: {str(e)}"
-            analysis.save()
-            logger.info(f"Updated analysis {analysis_id} status to FAILED")
-        except VideoAnalysis.DoesNotExist:
-            logger.error(f"Could not update status - analysis {analysis_id} not found")
-        except Exception as update_error:
-            logger.exception(
-                f"Error updating analysis {analysis_id} status: {update_error}"
-            )
+        _mark_processing_failed(analysis_id, f"Processing failed: {str(e)}")
 
     except Exception as e:
         logger.exception(f"Unexpected error processing analysis {analysis_id}: {e}")
-        try:
-            analysis = VideoAnalysis.objects.get(id=analysis_id)
-            analysis.status = VideoAnalysis.Status.FAILED
-            analysis.error_message = f"Unexpected error: {str(e)}"
-            analysis.save()
-            logger.info(f"Updated analysis {analysis_id} status to FAILED")
-        except Exception as update_error:
-            logger.exception(
-                f"Error updating analysis {analysis_id} after unexpected error: {update_error}"
-            )
+        _mark_processing_failed(analysis_id, f"Unexpected error: {str(e)}")
 
-    logger.info(f"Celery task completed for analysis ID {analysis_id}")
+
+def _mark_processing_failed(analysis_id: int, error_message: str) -> None:
+    try:
+        failed = VideoAnalysis.objects.filter(id=analysis_id).transition(
+            [VideoAnalysis.Status.PENDING, VideoAnalysis.Status.PROCESSING],
+            VideoAnalysis.Status.FAILED,
+            error_message=error_message,
+            heartbeat_at=None,
+        )
+    except Exception as update_error:
+        logger.exception(
+            f"Error updating analysis {analysis_id} status: {update_error}"
+        )
+        return
+
+    if failed:
+        logger.info(f"Updated analysis {analysis_id} status to FAILED")
+    else:
+        logger.error(
+            f"Could not update status - analysis {analysis_id} not found "
+            "or no longer processing"
+        )
+
+
+@shared_task
+def reap_stuck_analyses() -> None:
+    """
+    Requeue or fail analyses whose worker stopped sending heartbeats or whose
+    task message was lost, and expire direct and chunked uploads that were
+    abandoned.
+    """
+    reaped = ProcessingWatchdog.reap_stuck()
+    for analysis_id in reaped["requeued"]:
+        TaskDispatch.send(process_video_task, analysis_id)
+    ProcessingWatchdog.reap_queued()
+    DirectUploadService.expire_abandoned()
+    ChunkedUploadService.expire_abandoned()
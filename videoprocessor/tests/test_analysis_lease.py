@@ -0,0 +1,194 @@
+import threading
+import time
+from unittest.mock import patch
+import fakeredis
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase
+from django.core.files.uploadedfile import SimpleUploadedFile
+from accounts.models import User
+from analysis.models import VideoAnalysis
+from videoprocessor.tasks import process_video_task
+from videoprocessor.services.analysis_lease import (
+    AnalysisLease,
+    LocalLeaseStore,
+    RedisLeaseStore,
+    get_lease_store,
+    lease_store,
+)
+from tests.common import TestFixtures, cleanup_test_media
+
+
+TEST_PASSWORD = "testpass123"
+
+
+class TestAnalysisLease(TestCase):
+    """Test acquisition, renewal and expiry of analysis leases."""
+
+    def setUp(self):
+        self.store = LocalLeaseStore()
+
+    def test_second_lease_is_refused_while_first_is_held(self):
+        """Should grant the lease to only one holder at a time."""
+        first = AnalysisLease(1, store=self.store)
+        second = AnalysisLease(1, store=self.store)
+
+        self.assertTrue(first.acquire())
+        self.assertFalse(second.acquire())
+
+        first.release()
+        self.assertTrue(second.acquire())
+
+    def test_leases_are_per_analysis(self):
+        """Should not block other analyses."""
+        self.assertTrue(AnalysisLease(1, store=self.store).acquire())
+        self.assertTrue(AnalysisLease(2, store=self.store).acquire())
+
+    def test_expired_lease_can_be_taken_over(self):
+        """Should let another worker in once the holder stopped renewing."""
+        stale = AnalysisLease(1, ttl=0.05, store=self.store)
+        stale.acquire()
+        time.sleep(0.1)
+
+        fresh = AnalysisLease(1, store=self.store)
+        self.assertTrue(fresh.acquire())
+        self.assertFalse(stale.renew())
+
+        stale.release()
+        self.assertFalse(AnalysisLease(1, store=self.store).acquire())
+
+    def test_context_manager_renews_while_held(self):
+        """Should keep the lease alive past its TTL while the block runs."""
+        with AnalysisLease(1, ttl=0.1, store=self.store) as lease:
+            self.assertTrue(lease.acquired)
+            time.sleep(0.3)
+            self.assertFalse(AnalysisLease(1, store=self.store).acquire())
+            self.assertTrue(lease.renew())
+
+        self.assertTrue(AnalysisLease(1, store=self.store).acquire())
+
+    def test_concurrent_acquire_has_single_winner(self):
+        """Should grant exactly one of many simultaneous acquisitions."""
+        barrier = threading.Barrier(8)
+        winners = []
+
+        def contend():
+            lease = AnalysisLease(1, store=self.store)
+            barrier.wait()
+            if lease.acquire():
+                winners.append(lease)
+
+        threads = [threading.Thread(target=contend) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(winners), 1)
+
+
+class TestRedisAnalysisLease(TestAnalysisLease):
+    """Run the lease tests against the Redis store and its Lua scripts."""
+
+    def setUp(self):
+        client = fakeredis.FakeRedis(server=fakeredis.FakeServer())
+        with patch("redis.Redis.from_url", return_value=client):
+            self.store = get_lease_store("redis")
+
+
+class TestGetLeaseStore(TestCase):
+    """Test that the lease store follows ANALYSIS_LEASE_BACKEND."""
+
+    def test_backends(self):
+        with patch("redis.Redis.from_url", return_value=fakeredis.FakeRedis()):
+            self.assertIsInstance(get_lease_store("redis"), RedisLeaseStore)
+        self.assertIsInstance(get_lease_store("local"), LocalLeaseStore)
+
+    def test_unknown_backend_is_rejected(self):
+        with self.assertRaises(ImproperlyConfigured):
+            get_lease_store("memcached")
+
+
+class TestProcessVideoTaskDeduplication(TestCase):
+    """Test that duplicate deliveries of process_video_task do no extra work."""
+
+    @classmethod
+    def tearDownClass(cls):
+        cleanup_test_media()
+        super().tearDownClass()
+
+    def setUp(self):
+        user_data = TestFixtures.get_test_user_data()
+        self.user = User.objects.create_user(
+            username=user_data["username"],
+            email=user_data["email"],
+            password=TEST_PASSWORD,
+        )
+        self.analysis = VideoAnalysis.objects.create(user=self.user)
+        self.analysis.video.save(
+            "test_video.mp4",
+            SimpleUploadedFile("test_video.mp4", b"video", content_type="video/mp4"),
+            save=True,
+        )
+
+    def tearDown(self):
+        # Leases held by simulated "other workers" must not leak into other tests.
+        lease_store.clear()  # type: ignore[attr-defined]
+
+    @patch("videoprocessor.services.video_processing_service.ml_service")
+    def test_task_is_noop_while_another_worker_holds_lease(self, mock_ml_service):
+        """Should skip the analysis without touching it when the lease is taken."""
+        other_worker = AnalysisLease(self.analysis.id)
+        other_worker.acquire()
+
+        process_video_task(self.analysis.id)
+
+        mock_ml_service.predict_video.assert_not_called()
+        self.analysis.refresh_from_db()
+        self.assertEqual(self.analysis.status, VideoAnalysis.Status.PENDING)
+        self.assertFalse(self.analysis.analysis_results.exists())
+
+    @patch("videoprocessor.services.video_processing_service.ml_service")
+    def test_redelivery_during_ml_call_is_skipped(self, mock_ml_service):
+        """Should run the ML call once when the task is delivered again mid-run."""
+
+        def predict(video_path, video_sha256=None):
+            process_video_task(self.analysis.id)
+            return {"cocaine": 90.0}
+
+        mock_ml_service.predict_video.side_effect = predict
+
+        process_video_task(self.analysis.id)
+
+        self.assertEqual(mock_ml_service.predict_video.call_count, 1)
+        self.analysis.refresh_from_db()
+        self.assertEqual(self.analysis.status, VideoAnalysis.Status.COMPLETED)
+        self.assertEqual(self.analysis.analysis_results.count(), 1)
+
+    @patch("videoprocessor.services.video_processing_service.ml_service")
+    def test_redelivery_after_completion_is_skipped(self, mock_ml_service):
+        """Should not reprocess an analysis whose first run already committed."""
+        mock_ml_service.predict_video.return_value = {"cocaine": 90.0}
+
+        process_video_task(self.analysis.id)
+        process_video_task(self.analysis.id)
+
+        self.assertEqual(mock_ml_service.predict_video.call_count, 1)
+        self.assertEqual(self.analysis.analysis_results.count(), 1)
+
+    @patch("videoprocessor.services.video_processing_service.ml_service")
+    def test_lost_lease_discards_results(self, mock_ml_service):
+        """Should neither save results nor fail the analysis after losing the lease."""
+
+        def predict(video_path, video_sha256=None):
+            # The lease expired and a redelivered task on another worker took it.
+            lease_store.clear()  # type: ignore[attr-defined]
+            AnalysisLease(self.analysis.id).acquire()
+            return {"cocaine": 90.0}
+
+        mock_ml_service.predict_video.side_effect = predict
+
+        process_video_task(self.analysis.id)
+
+        self.analysis.refresh_from_db()
+        self.assertEqual(self.analysis.status, VideoAnalysis.Status.PROCESSING)
+        self.assertFalse(self.analysis.analysis_results.exists())
@@ -0,0 +1,186 @@
+import json
+import os
+import socket
+import tempfile
+import threading
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+from django.test import TestCase
+
+from videoprocessor.services.api_ml_service import APIMLService
+from videoprocessor.services.ml_http_client import MultipartFileBody, get_ml_session
+
+
+VIDEO_CONTENT = os.urandom(3 * 1024 * 1024 + 17)
+PREDICTIONS = {"cocaine": 85.5, "morphine": 14.5}
+
+
+class StubMLHandler(BaseHTTPRequestHandler):
+    """Answers like the ML endpoint; behaviour is driven by the server's fields."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        server = self.server
+        length = int(self.headers["Content-Length"])
+        body = self.rfile.read(length)
+        server.requests.append(  # type: ignore[attr-defined]
+            {
+                "headers": dict(self.headers),
+                "body": body,
+                "port": self.client_address[1],
+            }
+        )
+
+        if server.delay_seconds:  # type: ignore[attr-defined]
+            # time.sleep is patched by the tests to skip retry backoff.
+            threading.Event().wait(server.delay_seconds)  # type: ignore[attr-defined]
+
+        if server.failures_left > 0:  # type: ignore[attr-defined]
+            server.failures_left -= 1  # type: ignore[attr-defined]
+            self._respond(503, {"detail": "overloaded"})
+            return
+
+        self._respond(200, {"predictions": PREDICTIONS})
+
+    def _respond(self, status_code, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def uploaded_file_content(request):
+    content_type = request["headers"]["Content-Type"]
+    message = BytesParser(policy=HTTP).parsebytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode() + request["body"]
+    )
+    part = next(message.iter_parts())  # type: ignore[attr-defined]
+    return part.get_payload(decode=True)
+
+
+class TestAPIMLServiceAgainstStubServer(TestCase):
+    """Exercise the real HTTP client against a local stub of the ML endpoint."""
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StubMLHandler)
+        self.server.requests = []  # type: ignore[attr-defined]
+        self.server.failures_left = 0  # type: ignore[attr-defined]
+        self.server.delay_seconds = 0  # type: ignore[attr-defined]
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+        url = f"http://127.0.0.1:{self.server.server_address[1]}/predict"
+        for name, value in {
+            "ML_ENDPOINT_URL": url,
+            "ML_MAX_RETRIES": 2,
+            "ML_READ_TIMEOUT_SECONDS": 2.0,
+        }.items():
+            patcher = patch(f"videoprocessor.services.api_ml_service.{name}", value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        sleep_patcher = patch("videoprocessor.services.api_ml_service.time.sleep")
+        self.mock_sleep = sleep_patcher.start()
+        self.addCleanup(sleep_patcher.stop)
+
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".mp4") as f:
+            f.write(VIDEO_CONTENT)
+            self.video_path = f.name
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        os.remove(self.video_path)
+
+    def test_streams_video_as_multipart(self):
+        result = APIMLService.predict_video(self.video_path)
+
+        self.assertEqual(result, PREDICTIONS)
+        request = self.server.requests[0]  # type: ignore[attr-defined]
+        self.assertNotIn("Transfer-Encoding", request["headers"])
+        self.assertEqual(uploaded_file_content(request), VIDEO_CONTENT)
+
+    def test_reuses_connection_between_requests(self):
+        APIMLService.predict_video(self.video_path)
+        APIMLService.predict_video(self.video_path)
+
+        ports = {r["port"] for r in self.server.requests}  # type: ignore[attr-defined]
+        self.assertEqual(len(ports), 1)
+
+    def test_retries_server_errors_and_resends_full_body(self):
+        self.server.failures_left = 2  # type: ignore[attr-defined]
+
+        result = APIMLService.predict_video(self.video_path)
+
+        self.assertEqual(result, PREDICTIONS)
+        requests = self.server.requests  # type: ignore[attr-defined]
+        self.assertEqual(len(requests), 3)
+        self.assertEqual(uploaded_file_content(requests[-1]), VIDEO_CONTENT)
+        self.assertEqual(self.mock_sleep.call_count, 2)
+
+    def test_gives_up_after_max_retries(self):
+        self.server.failures_left = 10  # type: ignore[attr-defined]
+
+        result = APIMLService.predict_video(self.video_path)
+
+        self.assertIsNone(result)
+        self.assertEqual(len(self.server.requests), 3)  # type: ignore[attr-defined]
+
+    def test_retries_connection_errors(self):
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            closed_port = sock.getsockname()[1]
+
+        with patch(
+            "videoprocessor.services.api_ml_service.ML_ENDPOINT_URL",
+            f"http://127.0.0.1:{closed_port}/predict",
+        ):
+            result = APIMLService.predict_video(self.video_path)
+
+        self.assertIsNone(result)
+        self.assertEqual(self.mock_sleep.call_count, 2)
+
+    def test_read_timeout_is_not_retried(self):
+        self.server.delay_seconds = 1  # type: ignore[attr-defined]
+
+        with patch(
+            "videoprocessor.services.api_ml_service.ML_READ_TIMEOUT_SECONDS", 0.2
+        ):
+            result = APIMLService.predict_video(self.video_path)
+
+        self.assertIsNone(result)
+        self.assertEqual(len(self.server.requests), 1)  # type: ignore[attr-defined]
+        self.mock_sleep.assert_not_called()
+
+
+class TestMLHttpClientHelpers(TestCase):
+    def test_multipart_body_length_matches_content(self):
+        with tempfile.TemporaryFile() as f:
+            f.write(VIDEO_CONTENT)
+            body = MultipartFileBody("file", f, "video.mp4", "video/webm")
+
+            chunks = []
+            while data := body.read(64 * 1024):
+                chunks.append(data)
+
+            self.assertEqual(len(b"".join(chunks)), len(body))
+
+    def test_retry_delay_is_jittered_and_capped(self):
+        with patch(
+            "videoprocessor.services.api_ml_service.ML_RETRY_BACKOFF_MAX_SECONDS", 5.0
+        ):
+            delays = [APIMLService.retry_delay(10) for _ in range(50)]
+
+        self.assertTrue(all(0 <= delay <= 5.0 for delay in delays))
+        self.assertGreater(len(set(delays)), 1)
+
+    def test_session_is_shared_within_process(self):
+        self.assertIs(get_ml_session(), get_ml_session())
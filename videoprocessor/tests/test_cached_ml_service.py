@@ -0,0 +1,112 @@
+import os
+import tempfile
+from io import StringIO
+from unittest.mock import MagicMock, patch
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+
+from videoprocessor.services.base_ml_service import BaseMLService
+from videoprocessor.services.cached_ml_service import CachedMLService
+
+
+VIDEO_SHA256 = "a" * 64
+PREDICTIONS = {"cocaine": 85.5, "morphine": 14.5}
+
+
+class TestCachedMLService(TestCase):
+    """Test the prediction cache wrapped around an ML service."""
+
+    def setUp(self):
+        cache.clear()
+        self.inner = MagicMock(spec=BaseMLService)
+        self.inner.predict_video.return_value = PREDICTIONS
+        self.service = CachedMLService(self.inner)
+
+    def test_second_prediction_for_same_digest_is_a_hit(self):
+        first = self.service.predict_video("/videos/a.mp4", VIDEO_SHA256)
+        second = self.service.predict_video("/videos/b.mp4", VIDEO_SHA256)
+
+        self.assertEqual(first, PREDICTIONS)
+        self.assertEqual(second, PREDICTIONS)
+        self.inner.predict_video.assert_called_once()
+        stats = CachedMLService.get_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+        self.assertEqual(stats["hit_rate"], 0.5)
+
+    def test_failed_prediction_is_not_cached(self):
+        self.inner.predict_video.return_value = None
+
+        self.service.predict_video("/videos/a.mp4", VIDEO_SHA256)
+        self.service.predict_video("/videos/a.mp4", VIDEO_SHA256)
+
+        self.assertEqual(self.inner.predict_video.call_count, 2)
+
+    def test_failing_cache_writes_pass_the_prediction_through(self):
+        broken = MagicMock()
+        broken.get.return_value = None
+        broken.get_or_set.return_value = 1
+        broken.set.side_effect = ConnectionError("cache down")
+        broken.incr.side_effect = ConnectionError("cache down")
+
+        with patch("videoprocessor.services.cached_ml_service.cache", broken):
+            result = self.service.predict_video("/videos/a.mp4", VIDEO_SHA256)
+
+        self.assertEqual(result, PREDICTIONS)
+        self.inner.predict_video.assert_called_once()
+        broken.set.assert_called_once()
+
+    def test_model_version_is_part_of_the_key(self):
+        self.service.predict_video("/videos/a.mp4", VIDEO_SHA256)
+
+        with patch("videoprocessor.services.cached_ml_service.ML_MODEL_VERSION", "v2"):
+            self.service.predict_video("/videos/a.mp4", VIDEO_SHA256)
+
+        self.assertEqual(self.inner.predict_video.call_count, 2)
+
+    def test_invalidate_forces_new_prediction(self):
+        self.service.predict_video("/videos/a.mp4", VIDEO_SHA256)
+
+        CachedMLService.invalidate()
+        self.service.predict_video("/videos/a.mp4", VIDEO_SHA256)
+
+        self.assertEqual(self.inner.predict_video.call_count, 2)
+
+    def test_evicted_generation_does_not_revive_invalidated_entries(self):
+        self.service.predict_video("/videos/a.mp4", VIDEO_SHA256)
+        CachedMLService.invalidate()
+
+        cache.delete("ml_prediction:generation")
+        self.service.predict_video("/videos/a.mp4", VIDEO_SHA256)
+
+        self.assertEqual(self.inner.predict_video.call_count, 2)
+
+    def test_hashes_file_when_digest_is_unknown(self):
+        with tempfile.NamedTemporaryFile(delete=False) as f:
+            f.write(b"same bytes")
+        self.addCleanup(os.remove, f.name)
+
+        self.service.predict_video(f.name)
+        self.service.predict_video(f.name)
+
+        self.inner.predict_video.assert_called_once()
+
+    def test_entries_expire_after_ttl(self):
+        with patch(
+            "videoprocessor.services.cached_ml_service.ML_PREDICTION_CACHE_TTL_SECONDS",
+            60,
+        ), patch("videoprocessor.services.cached_ml_service.cache.set") as mock_set:
+            self.service.predict_video("/videos/a.mp4", VIDEO_SHA256)
+
+        self.assertEqual(mock_set.call_args.kwargs["timeout"], 60)
+
+    def test_management_command_reports_and_invalidates(self):
+        self.service.predict_video("/videos/a.mp4", VIDEO_SHA256)
+        out = StringIO()
+
+        call_command("ml_prediction_cache", "--invalidate", stdout=out)
+
+        self.assertIn("invalidated", out.getvalue())
+        self.assertIn("misses: 1", out.getvalue())
+        self.service.predict_video("/videos/a.mp4", VIDEO_SHA256)
+        self.assertEqual(self.inner.predict_video.call_count, 2)
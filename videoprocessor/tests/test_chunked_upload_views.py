@@ -0,0 +1,309 @@
+import hashlib
+import os
+from datetime import timedelta
+from unittest.mock import ANY, patch
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from accounts.models import User
+from analysis.models import Substance, VideoAnalysis
+from videoprocessor.models import UploadSession
+from videoprocessor.services.chunk_store import PARTIAL_UPLOADS_DIR
+from videoprocessor.services.chunked_upload_service import ChunkedUploadService
+from tests.common import TestFixtures, cleanup_test_media
+
+
+VIDEO_CONTENT = b"0123456789" * 3
+VIDEO_FILENAME = "chunked_video.mp4"
+TEST_PASSWORD = "testpass123"
+
+
+class TestChunkedUploadViews(APITestCase):
+    """Test the resumable upload session endpoints."""
+
+    @classmethod
+    def tearDownClass(cls):
+        cleanup_test_media()
+        super().tearDownClass()
+
+    def setUp(self):
+        user_data = TestFixtures.get_test_user_data()
+        self.user = User.objects.create_user(
+            username=user_data["username"],
+            email=user_data["email"],
+            password=TEST_PASSWORD,
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def tearDown(self):
+        VideoAnalysis.objects.all().delete()
+        User.objects.all().delete()
+
+    def _create_session(self, size=len(VIDEO_CONTENT), filename=VIDEO_FILENAME):
+        return self.client.post(
+            reverse("videoprocessor:upload-session-create"),
+            {"filename": filename, "size": size, "description": "chunked"},
+            format="json",
+        )
+
+    def _put_chunk(self, upload_id, start, data, total=len(VIDEO_CONTENT)):
+        return self.client.put(
+            reverse("videoprocessor:upload-session-detail", args=[upload_id]),
+            data=data,
+            content_type="application/octet-stream",
+            HTTP_CONTENT_RANGE=f"bytes {start}-{start + len(data) - 1}/{total}",
+        )
+
+    def _upload_all(self, upload_id, chunk_size=10):
+        for start in range(0, len(VIDEO_CONTENT), chunk_size):
+            response = self._put_chunk(
+                upload_id, start, VIDEO_CONTENT[start : start + chunk_size]
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response
+
+    def test_create_session(self):
+        response = self._create_session()
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["offset"], 0)
+        self.assertEqual(response.data["size"], len(VIDEO_CONTENT))
+        session = UploadSession.objects.get(id=response.data["upload_id"])
+        self.assertEqual(session.user, self.user)
+        self.assertTrue(session.storage_name.endswith(VIDEO_FILENAME))
+
+    def test_create_session_rejects_wrong_format(self):
+        response = self._create_session(filename="video.avi")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("Unsupported file format", response.data["error"])
+
+    def test_create_session_rejects_too_large(self):
+        response = self._create_session(size=4 * 1024**3)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("too large", response.data["error"])
+
+    def test_chunks_advance_offset(self):
+        upload_id = self._create_session().data["upload_id"]
+
+        response = self._put_chunk(upload_id, 0, VIDEO_CONTENT[:10])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["offset"], 10)
+
+        status_response = self.client.get(
+            reverse("videoprocessor:upload-session-detail", args=[upload_id])
+        )
+        self.assertEqual(status_response.data["offset"], 10)
+
+    def test_out_of_order_chunk_returns_expected_offset(self):
+        upload_id = self._create_session().data["upload_id"]
+        self._put_chunk(upload_id, 0, VIDEO_CONTENT[:10])
+
+        response = self._put_chunk(upload_id, 20, VIDEO_CONTENT[20:])
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data["offset"], 10)
+
+    def test_resent_chunk_after_lost_ack_is_rejected_without_corruption(self):
+        upload_id = self._create_session().data["upload_id"]
+        self._put_chunk(upload_id, 0, VIDEO_CONTENT[:10])
+
+        response = self._put_chunk(upload_id, 0, b"x" * 10)
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data["offset"], 10)
+
+    def test_missing_content_range(self):
+        upload_id = self._create_session().data["upload_id"]
+
+        response = self.client.put(
+            reverse("videoprocessor:upload-session-detail", args=[upload_id]),
+            data=VIDEO_CONTENT[:10],
+            content_type="application/octet-stream",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_content_range_length_mismatch(self):
+        upload_id = self._create_session().data["upload_id"]
+
+        response = self.client.put(
+            reverse("videoprocessor:upload-session-detail", args=[upload_id]),
+            data=VIDEO_CONTENT[:5],
+            content_type="application/octet-stream",
+            HTTP_CONTENT_RANGE=f"bytes 0-9/{len(VIDEO_CONTENT)}",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_other_user_cannot_access_session(self):
+        upload_id = self._create_session().data["upload_id"]
+        other_data = TestFixtures.get_test_user_data()
+        other_user = User.objects.create_user(
+            username=other_data["username"],
+            email=other_data["email"],
+            password=TEST_PASSWORD,
+        )
+        self.client.force_authenticate(user=other_user)
+
+        response = self._put_chunk(upload_id, 0, VIDEO_CONTENT[:10])
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_complete_before_all_bytes_received(self):
+        upload_id = self._create_session().data["upload_id"]
+        self._put_chunk(upload_id, 0, VIDEO_CONTENT[:10])
+
+        response = self.client.post(
+            reverse("videoprocessor:upload-session-complete", args=[upload_id])
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data["offset"], 10)
+
+    @patch("videoprocessor.tasks.ingest_video_task.apply_async")
+    @patch(
+        "videoprocessor.services.video_file_manager.VideoFileManager.extract_and_save_first_frame"
+    )
+    def test_complete_assembles_video_and_starts_analysis(
+        self, mock_extract, mock_delay
+    ):
+        mock_extract.return_value = ("test_thumb.jpg", ContentFile(b"fake thumbnail"))
+        upload_id = self._create_session().data["upload_id"]
+        self._upload_all(upload_id)
+
+        response = self.client.post(
+            reverse("videoprocessor:upload-session-complete", args=[upload_id])
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        analysis = VideoAnalysis.objects.get(id=response.data["analysis_id"])
+        self.assertEqual(analysis.description, "chunked")
+        with default_storage.open(analysis.video.name, "rb") as stored:
+            self.assertEqual(stored.read(), VIDEO_CONTENT)
+        self.assertFalse(
+            os.path.exists(
+                default_storage.path(f"{PARTIAL_UPLOADS_DIR}/{upload_id}.part")
+            )
+        )
+        self.assertEqual(
+            analysis.video_sha256, hashlib.sha256(VIDEO_CONTENT).hexdigest()
+        )
+        mock_delay.assert_called_once_with((analysis.id,), task_id=ANY)
+
+        session = UploadSession.objects.get(id=upload_id)
+        self.assertEqual(session.status, UploadSession.Status.COMPLETED)
+        self.assertEqual(session.analysis, analysis)
+
+    @patch("videoprocessor.tasks.ingest_video_task.apply_async")
+    def test_complete_of_known_content_shares_the_earlier_video(self, mock_delay):
+        """Should drop the staged bytes instead of assembling a second copy."""
+        earlier = VideoAnalysis.objects.create(
+            user=self.user,
+            status=VideoAnalysis.Status.COMPLETED,
+            video_sha256=hashlib.sha256(VIDEO_CONTENT).hexdigest(),
+        )
+        earlier.video.save("earlier.mp4", ContentFile(VIDEO_CONTENT))
+        earlier.thumbnail.save("earlier_thumb.jpg", ContentFile(b"thumbnail"))
+        substance = Substance.objects.create(name_en="chunked_dedup")
+        earlier.analysis_results.create(substance=substance, confidence_score=61.0)
+        upload_id = self._create_session().data["upload_id"]
+        self._upload_all(upload_id)
+
+        response = self.client.post(
+            reverse("videoprocessor:upload-session-complete", args=[upload_id])
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        analysis = VideoAnalysis.objects.get(id=response.data["analysis_id"])
+        self.assertEqual(analysis.status, VideoAnalysis.Status.COMPLETED)
+        self.assertEqual(analysis.video.name, earlier.video.name)
+        self.assertEqual(analysis.analysis_results.get().confidence_score, 61.0)
+        session = UploadSession.objects.get(id=upload_id)
+        self.assertEqual(session.analysis, analysis)
+        self.assertFalse(default_storage.exists(session.storage_name))
+        self.assertFalse(
+            os.path.exists(
+                default_storage.path(f"{PARTIAL_UPLOADS_DIR}/{upload_id}.part")
+            )
+        )
+        mock_delay.assert_not_called()
+
+    @patch("videoprocessor.tasks.ingest_video_task.apply_async")
+    @patch(
+        "videoprocessor.services.video_file_manager.VideoFileManager.extract_and_save_first_frame"
+    )
+    def test_complete_twice_is_rejected(self, mock_extract, mock_delay):
+        mock_extract.return_value = ("test_thumb.jpg", ContentFile(b"fake thumbnail"))
+        upload_id = self._create_session().data["upload_id"]
+        self._upload_all(upload_id)
+        complete_url = reverse(
+            "videoprocessor:upload-session-complete", args=[upload_id]
+        )
+
+        self.client.post(complete_url)
+        response = self.client.post(complete_url)
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(VideoAnalysis.objects.count(), 1)
+        mock_delay.assert_called_once()
+
+    def test_abort_session(self):
+        upload_id = self._create_session().data["upload_id"]
+        self._put_chunk(upload_id, 0, VIDEO_CONTENT[:10])
+
+        response = self.client.delete(
+            reverse("videoprocessor:upload-session-detail", args=[upload_id])
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        session = UploadSession.objects.get(id=upload_id)
+        self.assertEqual(session.status, UploadSession.Status.ABORTED)
+        self.assertFalse(
+            os.path.exists(
+                default_storage.path(f"{PARTIAL_UPLOADS_DIR}/{upload_id}.part")
+            )
+        )
+
+    def test_abandoned_sessions_are_expired(self):
+        abandoned = self._create_session().data["upload_id"]
+        self._put_chunk(abandoned, 0, VIDEO_CONTENT[:10])
+        fresh = self._create_session().data["upload_id"]
+        UploadSession.objects.filter(id=abandoned).update(
+            updated_at=timezone.now() - timedelta(days=2)
+        )
+
+        expired = ChunkedUploadService.expire_abandoned()
+
+        self.assertEqual(expired, [abandoned])
+        session = UploadSession.objects.get(id=abandoned)
+        self.assertEqual(session.status, UploadSession.Status.EXPIRED)
+        self.assertFalse(
+            os.path.exists(
+                default_storage.path(f"{PARTIAL_UPLOADS_DIR}/{abandoned}.part")
+            )
+        )
+        self.assertEqual(
+            UploadSession.objects.get(id=fresh).status, UploadSession.Status.ACTIVE
+        )
+        response = self._put_chunk(abandoned, 10, VIDEO_CONTENT[10:20])
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+    def test_new_chunk_keeps_an_old_session_alive(self):
+        upload_id = self._create_session().data["upload_id"]
+        UploadSession.objects.filter(id=upload_id).update(
+            updated_at=timezone.now() - timedelta(days=2)
+        )
+
+        self._put_chunk(upload_id, 0, VIDEO_CONTENT[:10])
+
+        self.assertEqual(ChunkedUploadService.expire_abandoned(), [])
+        self.assertEqual(
+            UploadSession.objects.get(id=upload_id).status,
+            UploadSession.Status.ACTIVE,
+        )
@@ -0,0 +1,248 @@
+import hashlib
+from datetime import timedelta
+from unittest.mock import ANY, patch
+from django.core import signing
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from accounts.models import User
+from analysis.models import Substance, VideoAnalysis
+from videoprocessor.services.direct_upload_service import DirectUploadService
+from videoprocessor.services.signed_upload import LOCAL_UPLOAD_TOKEN_SALT
+from tests.common import TestFixtures, cleanup_test_media
+
+
+VIDEO_CONTENT = b"0123456789" * 3
+VIDEO_FILENAME = "direct_video.mp4"
+TEST_PASSWORD = "testpass123"
+
+
+class TestDirectUploadViews(APITestCase):
+    """Test the signed-URL direct upload flow against the local stand-in."""
+
+    @classmethod
+    def tearDownClass(cls):
+        cleanup_test_media()
+        super().tearDownClass()
+
+    def setUp(self):
+        user_data = TestFixtures.get_test_user_data()
+        self.user = User.objects.create_user(
+            username=user_data["username"],
+            email=user_data["email"],
+            password=TEST_PASSWORD,
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def tearDown(self):
+        VideoAnalysis.objects.all().delete()
+        User.objects.all().delete()
+
+    def _create_upload(self, size=len(VIDEO_CONTENT), filename=VIDEO_FILENAME):
+        return self.client.post(
+            reverse("videoprocessor:direct-upload-create"),
+            {"filename": filename, "size": size, "description": "direct"},
+            format="json",
+        )
+
+    def _put_blob(self, upload_url, data=VIDEO_CONTENT):
+        # The signed URL is the only credential the storage endpoint accepts.
+        self.client.force_authenticate(user=None)
+        response = self.client.put(
+            upload_url, data=data, content_type="application/octet-stream"
+        )
+        self.client.force_authenticate(user=self.user)
+        return response
+
+    def _complete(self, analysis_id):
+        return self.client.post(
+            reverse("videoprocessor:direct-upload-complete", args=[analysis_id])
+        )
+
+    def test_create_returns_signed_url_and_uploading_analysis(self):
+        response = self._create_upload()
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["method"], "PUT")
+        self.assertTrue(response.data["upload_url"].startswith("http://testserver/"))
+        analysis = VideoAnalysis.objects.get(id=response.data["analysis_id"])
+        self.assertEqual(analysis.status, VideoAnalysis.Status.UPLOADING)
+        self.assertTrue(analysis.video.name.endswith(VIDEO_FILENAME))
+        self.assertFalse(default_storage.exists(analysis.video.name))
+
+    def test_create_rejects_wrong_format(self):
+        response = self._create_upload(filename="video.avi")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(VideoAnalysis.objects.exists())
+
+    @patch("videoprocessor.tasks.ingest_video_task.apply_async")
+    def test_full_flow_writes_video_and_starts_ingest(self, mock_delay):
+        created = self._create_upload().data
+
+        put_response = self._put_blob(created["upload_url"])
+        self.assertEqual(put_response.status_code, status.HTTP_201_CREATED)
+
+        response = self._complete(created["analysis_id"])
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        analysis = VideoAnalysis.objects.get(id=created["analysis_id"])
+        self.assertEqual(analysis.status, VideoAnalysis.Status.INGESTING)
+        with default_storage.open(analysis.video.name, "rb") as stored:
+            self.assertEqual(stored.read(), VIDEO_CONTENT)
+        self.assertEqual(
+            analysis.video_sha256, hashlib.sha256(VIDEO_CONTENT).hexdigest()
+        )
+        mock_delay.assert_called_once_with((analysis.id,), task_id=ANY)
+
+    @patch("videoprocessor.tasks.ingest_video_task.apply_async")
+    def test_complete_of_known_content_shares_the_earlier_video(self, mock_delay):
+        """Should reuse the earlier analysis and drop the received copy."""
+        earlier = VideoAnalysis.objects.create(
+            user=self.user,
+            status=VideoAnalysis.Status.COMPLETED,
+            video_sha256=hashlib.sha256(VIDEO_CONTENT).hexdigest(),
+        )
+        earlier.video.save("earlier.mp4", ContentFile(VIDEO_CONTENT))
+        earlier.thumbnail.save("earlier_thumb.jpg", ContentFile(b"thumbnail"))
+        substance = Substance.objects.create(name_en="direct_dedup")
+        earlier.analysis_results.create(substance=substance, confidence_score=52.0)
+        created = self._create_upload().data
+        self._put_blob(created["upload_url"])
+        received_name = VideoAnalysis.objects.get(id=created["analysis_id"]).video.name
+
+        response = self._complete(created["analysis_id"])
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        analysis = VideoAnalysis.objects.get(id=created["analysis_id"])
+        self.assertEqual(analysis.status, VideoAnalysis.Status.COMPLETED)
+        self.assertEqual(analysis.video.name, earlier.video.name)
+        self.assertEqual(analysis.analysis_results.get().confidence_score, 52.0)
+        self.assertFalse(default_storage.exists(received_name))
+        mock_delay.assert_not_called()
+
+    @patch("videoprocessor.tasks.ingest_video_task.apply_async")
+    def test_complete_before_upload_is_rejected(self, mock_delay):
+        created = self._create_upload().data
+
+        response = self._complete(created["analysis_id"])
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        analysis = VideoAnalysis.objects.get(id=created["analysis_id"])
+        self.assertEqual(analysis.status, VideoAnalysis.Status.UPLOADING)
+        mock_delay.assert_not_called()
+
+    @patch("videoprocessor.tasks.ingest_video_task.apply_async")
+    def test_complete_twice_starts_ingest_once(self, mock_delay):
+        created = self._create_upload().data
+        self._put_blob(created["upload_url"])
+
+        self._complete(created["analysis_id"])
+        response = self._complete(created["analysis_id"])
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        mock_delay.assert_called_once()
+
+    def test_other_user_cannot_complete(self):
+        created = self._create_upload().data
+        self._put_blob(created["upload_url"])
+        other_data = TestFixtures.get_test_user_data()
+        other_user = User.objects.create_user(
+            username=other_data["username"],
+            email=other_data["email"],
+            password=TEST_PASSWORD,
+        )
+        self.client.force_authenticate(user=other_user)
+
+        response = self._complete(created["analysis_id"])
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_put_with_tampered_token_is_forbidden(self):
+        created = self._create_upload().data
+        upload_url = created["upload_url"].rstrip("/") + "x/"
+
+        response = self._put_blob(upload_url)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_put_with_wrong_size_is_forbidden(self):
+        created = self._create_upload().data
+
+        response = self._put_blob(created["upload_url"], data=VIDEO_CONTENT[:5])
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        analysis = VideoAnalysis.objects.get(id=created["analysis_id"])
+        self.assertFalse(default_storage.exists(analysis.video.name))
+
+    def test_put_with_expired_token_is_forbidden(self):
+        token = signing.dumps(
+            {"analysis": 1, "name": "users/expired.mp4", "size": len(VIDEO_CONTENT)},
+            salt=LOCAL_UPLOAD_TOKEN_SALT,
+        )
+        upload_url = reverse("videoprocessor:direct-upload-blob", args=[token])
+
+        with patch(
+            "videoprocessor.services.signed_upload.DIRECT_UPLOAD_URL_EXPIRY_SECONDS",
+            -1,
+        ):
+            response = self._put_blob(upload_url)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertIn("expired", response.data["error"])
+
+    @patch("videoprocessor.tasks.ingest_video_task.apply_async")
+    def test_put_after_complete_is_forbidden(self, mock_delay):
+        created = self._create_upload().data
+        self._put_blob(created["upload_url"])
+        self._complete(created["analysis_id"])
+
+        response = self._put_blob(created["upload_url"], data=b"x" * len(VIDEO_CONTENT))
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        analysis = VideoAnalysis.objects.get(id=created["analysis_id"])
+        with default_storage.open(analysis.video.name, "rb") as stored:
+            self.assertEqual(stored.read(), VIDEO_CONTENT)
+
+    def test_token_is_bound_to_its_analysis(self):
+        created = self._create_upload().data
+        other = self._create_upload().data
+        other_name = VideoAnalysis.objects.get(id=other["analysis_id"]).video.name
+        token = signing.dumps(
+            {
+                "analysis": created["analysis_id"],
+                "name": other_name,
+                "size": len(VIDEO_CONTENT),
+            },
+            salt=LOCAL_UPLOAD_TOKEN_SALT,
+        )
+
+        response = self._put_blob(
+            reverse("videoprocessor:direct-upload-blob", args=[token])
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(default_storage.exists(other_name))
+
+    def test_abandoned_uploads_are_failed(self):
+        abandoned = self._create_upload().data
+        self._put_blob(abandoned["upload_url"])
+        fresh = self._create_upload().data
+        VideoAnalysis.objects.filter(id=abandoned["analysis_id"]).update(
+            created_at=timezone.now() - timedelta(days=1)
+        )
+
+        failed = DirectUploadService.expire_abandoned()
+
+        self.assertEqual(failed, [abandoned["analysis_id"]])
+        analysis = VideoAnalysis.objects.get(id=abandoned["analysis_id"])
+        self.assertEqual(analysis.status, VideoAnalysis.Status.FAILED)
+        self.assertFalse(default_storage.exists(analysis.video.name))
+        self.assertEqual(
+            VideoAnalysis.objects.get(id=fresh["analysis_id"]).status,
+            VideoAnalysis.Status.UPLOADING,
+        )
+        self.assertEqual(self._put_blob(abandoned["upload_url"]).status_code, 403)
@@ -0,0 +1,351 @@
+from datetime import timedelta
+from unittest.mock import ANY, MagicMock, patch
+from django.test import TestCase
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.utils import timezone
+from accounts.models import User
+from analysis.models import VideoAnalysis
+from videoprocessor.tasks import process_video_task, reap_stuck_analyses
+from videoprocessor.services.processing_watchdog import ProcessingWatchdog
+from tests.common import TestFixtures, cleanup_test_media
+
+
+TEST_PASSWORD = "testpass123"
+
+
+class ProcessingTestCase(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        cleanup_test_media()
+        super().tearDownClass()
+
+    def setUp(self):
+        user_data = TestFixtures.get_test_user_data()
+        self.user = User.objects.create_user(
+            username=user_data["username"],
+            email=user_data["email"],
+            password=TEST_PASSWORD,
+        )
+        self.analysis = VideoAnalysis.objects.create(user=self.user)
+        self.analysis.video.save(
+            "test_video.mp4",
+            SimpleUploadedFile("test_video.mp4", b"video", content_type="video/mp4"),
+            save=True,
+        )
+
+    def make_processing(self, heartbeat_age: timedelta, attempts: int = 1):
+        heartbeat_at = timezone.now() - heartbeat_age
+        VideoAnalysis.objects.filter(id=self.analysis.id).update(
+            status=VideoAnalysis.Status.PROCESSING,
+            started_at=heartbeat_at,
+            heartbeat_at=heartbeat_at,
+            processing_attempts=attempts,
+        )
+
+
+class TestStatusTransitions(ProcessingTestCase):
+    """Test the conditional status transitions of VideoAnalysis."""
+
+    def test_transition_applies_from_expected_status(self):
+        """Should update the row and report it when the status matches."""
+        rows = VideoAnalysis.objects.filter(id=self.analysis.id).transition(
+            VideoAnalysis.Status.PENDING, VideoAnalysis.Status.PROCESSING
+        )
+
+        self.assertEqual(rows, 1)
+        self.analysis.refresh_from_db()
+        self.assertEqual(self.analysis.status, VideoAnalysis.Status.PROCESSING)
+
+    def test_transition_skips_row_in_other_status(self):
+        """Should leave a row alone once another writer moved it on."""
+        VideoAnalysis.objects.filter(id=self.analysis.id).update(
+            status=VideoAnalysis.Status.COMPLETED
+        )
+
+        rows = VideoAnalysis.objects.filter(id=self.analysis.id).transition(
+            [VideoAnalysis.Status.PENDING, VideoAnalysis.Status.PROCESSING],
+            VideoAnalysis.Status.FAILED,
+            error_message="late failure",
+        )
+
+        self.assertEqual(rows, 0)
+        self.analysis.refresh_from_db()
+        self.assertEqual(self.analysis.status, VideoAnalysis.Status.COMPLETED)
+        self.assertIsNone(self.analysis.error_message)
+
+    def test_invalid_transition_is_rejected(self):
+        """Should refuse transitions the state machine does not allow."""
+        with self.assertRaises(ValueError):
+            VideoAnalysis.objects.filter(id=self.analysis.id).transition(
+                VideoAnalysis.Status.COMPLETED, VideoAnalysis.Status.PENDING
+            )
+
+
+class TestProcessingLifecycle(ProcessingTestCase):
+    """Test that process_video records the PROCESSING phase."""
+
+    @patch("videoprocessor.services.video_processing_service.ml_service")
+    def test_analysis_is_processing_during_ml_call(self, mock_ml_service):
+        """Should be PROCESSING with a start time and heartbeat while the ML call runs."""
+        seen = {}
+
+        def predict(video_path, video_sha256=None):
+            seen["analysis"] = VideoAnalysis.objects.get(id=self.analysis.id)
+            return {"cocaine": 90.0}
+
+        mock_ml_service.predict_video.side_effect = predict
+
+        process_video_task(self.analysis.id)
+
+        during = seen["analysis"]
+        self.assertEqual(during.status, VideoAnalysis.Status.PROCESSING)
+        self.assertIsNotNone(during.started_at)
+        self.assertIsNotNone(during.heartbeat_at)
+        self.assertEqual(during.processing_attempts, 1)
+
+        self.analysis.refresh_from_db()
+        self.assertEqual(self.analysis.status, VideoAnalysis.Status.COMPLETED)
+        self.assertIsNone(self.analysis.heartbeat_at)
+
+    @patch("videoprocessor.services.video_processing_service.ml_service")
+    def test_results_discarded_if_reaped_during_ml_call(self, mock_ml_service):
+        """Should roll back results when the run was failed while the ML call hung."""
+
+        def predict(video_path, video_sha256=None):
+            VideoAnalysis.objects.filter(id=self.analysis.id).update(
+                status=VideoAnalysis.Status.FAILED, error_message="timed out"
+            )
+            return {"cocaine": 90.0}
+
+        mock_ml_service.predict_video.side_effect = predict
+
+        process_video_task(self.analysis.id)
+
+        self.analysis.refresh_from_db()
+        self.assertEqual(self.analysis.status, VideoAnalysis.Status.FAILED)
+        self.assertEqual(self.analysis.error_message, "timed out")
+        self.assertFalse(self.analysis.analysis_results.exists())
+
+    @patch("videoprocessor.services.video_processing_service.ml_service")
+    def test_failed_analysis_is_not_processed(self, mock_ml_service):
+        """Should not pick up an analysis that is not pending."""
+        VideoAnalysis.objects.filter(id=self.analysis.id).update(
+            status=VideoAnalysis.Status.FAILED
+        )
+
+        process_video_task(self.analysis.id)
+
+        mock_ml_service.predict_video.assert_not_called()
+
+    def test_heartbeat_only_touches_processing_analyses(self):
+        """Should refresh the heartbeat of a processing analysis only."""
+        self.assertFalse(ProcessingWatchdog.heartbeat(self.analysis.id))
+
+        self.make_processing(timedelta(minutes=1))
+        self.assertTrue(ProcessingWatchdog.heartbeat(self.analysis.id))
+
+        self.analysis.refresh_from_db()
+        self.assertLess(
+            timezone.now() - self.analysis.heartbeat_at, timedelta(seconds=5)
+        )
+
+    @patch.object(ProcessingWatchdog, "heartbeat", return_value=True)
+    def test_keep_alive_beats_in_background(self, mock_heartbeat):
+        """Should keep sending heartbeats until the block ends."""
+        with ProcessingWatchdog.keep_alive(self.analysis.id, interval=0.01):
+            while mock_heartbeat.call_count < 3:
+                pass
+
+        calls = mock_heartbeat.call_count
+        self.assertGreaterEqual(calls, 3)
+        mock_heartbeat.assert_called_with(self.analysis.id)
+
+
+class TestStuckAnalysisReaper(ProcessingTestCase):
+    """Test the reaper that recovers analyses from dead workers."""
+
+    def test_fresh_heartbeat_is_left_alone(self):
+        """Should not touch analyses whose worker is still alive."""
+        self.make_processing(timedelta(seconds=10))
+
+        reaped = ProcessingWatchdog.reap_stuck()
+
+        self.assertEqual(reaped, {"requeued": [], "failed": []})
+        self.analysis.refresh_from_db()
+        self.assertEqual(self.analysis.status, VideoAnalysis.Status.PROCESSING)
+
+    def test_expired_heartbeat_is_requeued(self):
+        """Should put an abandoned analysis back to PENDING."""
+        self.make_processing(timedelta(hours=1))
+
+        reaped = ProcessingWatchdog.reap_stuck()
+
+        self.assertEqual(reaped["requeued"], [self.analysis.id])
+        self.analysis.refresh_from_db()
+        self.assertEqual(self.analysis.status, VideoAnalysis.Status.PENDING)
+        # Stamped as the time the task was sent again.
+        self.assertIsNotNone(self.analysis.heartbeat_at)
+
+    @patch(
+        "videoprocessor.services.processing_watchdog.ANALYSIS_MAX_PROCESSING_ATTEMPTS",
+        3,
+    )
+    def test_expired_heartbeat_fails_after_max_attempts(self):
+        """Should fail an analysis that keeps killing its workers."""
+        self.make_processing(timedelta(hours=1), attempts=3)
+
+        reaped = ProcessingWatchdog.reap_stuck()
+
+        self.assertEqual(reaped["failed"], [self.analysis.id])
+        self.analysis.refresh_from_db()
+        self.assertEqual(self.analysis.status, VideoAnalysis.Status.FAILED)
+        self.assertIn("timed out", self.analysis.error_message)
+
+    @patch("videoprocessor.tasks.process_video_task.apply_async")
+    def test_reaper_task_requeues_processing(self, mock_delay):
+        """Should enqueue processing again for every requeued analysis."""
+        self.make_processing(timedelta(hours=1))
+
+        reap_stuck_analyses()
+
+        mock_delay.assert_called_once_with((self.analysis.id,), task_id=ANY)
+
+
+class TestQueuedAnalysisReaper(ProcessingTestCase):
+    """Test the sweep for INGESTING/PENDING analyses whose task was lost."""
+
+    TASK_ID = "5b7c4f4e-0d3a-4f7e-9a59-2f0c1f6b1e11"
+
+    def setUp(self):
+        super().setUp()
+        self.broker_ids: set[str] | None = set()
+        self.task_state = "PENDING"
+        patch(
+            "videoprocessor.services.task_dispatch.TaskDispatch.queued_task_ids",
+            side_effect=lambda queues: self.broker_ids,
+        ).start()
+        patch(
+            "videoprocessor.services.task_dispatch.AsyncResult",
+            side_effect=lambda task_id: MagicMock(state=self.task_state),
+        ).start()
+        self.ingest = patch(
+            "videoprocessor.tasks.ingest_video_task.apply_async"
+        ).start()
+        self.process = patch(
+            "videoprocessor.tasks.process_video_task.apply_async"
+        ).start()
+        self.addCleanup(patch.stopall)
+
+    def make_queued(
+        self,
+        status: str,
+        age: timedelta,
+        task_id: str = TASK_ID,
+        resends: int = 0,
+    ):
+        VideoAnalysis.objects.filter(id=self.analysis.id).update(
+            status=status,
+            created_at=timezone.now() - timedelta(days=1),
+            heartbeat_at=timezone.now() - age,
+            task_id=task_id,
+            requeue_count=resends,
+        )
+
+    def test_recently_queued_is_left_alone(self):
+        """Should not look at a task that was only just sent."""
+        self.make_queued(VideoAnalysis.Status.PENDING, timedelta(minutes=1))
+
+        reaped = ProcessingWatchdog.reap_queued()
+
+        self.assertEqual(reaped, {"ingest": [], "process": [], "failed": []})
+
+    @patch("videoprocessor.services.processing_watchdog.ANALYSIS_MAX_TASK_RESENDS", 3)
+    def test_task_still_in_the_broker_waits_however_long(self):
+        """Should neither resend nor fail an analysis stuck behind a backlog."""
+        self.make_queued(VideoAnalysis.Status.PENDING, timedelta(days=1), resends=3)
+        self.broker_ids = {self.TASK_ID}
+
+        reaped = ProcessingWatchdog.reap_queued()
+
+        self.assertEqual(reaped, {"ingest": [], "process": [], "failed": []})
+        self.process.assert_not_called()
+        self.analysis.refresh_from_db()
+        self.assertEqual(self.analysis.status, VideoAnalysis.Status.PENDING)
+
+    def test_unlistable_broker_counts_as_queued(self):
+        """Should not resend when the broker cannot confirm the task is gone."""
+        self.make_queued(VideoAnalysis.Status.PENDING, timedelta(hours=1))
+        self.broker_ids = None
+
+        self.assertEqual(ProcessingWatchdog.reap_queued()["process"], [])
+
+    def test_started_task_is_left_alone(self):
+        """Should leave an analysis whose task is running."""
+        self.make_queued(VideoAnalysis.Status.INGESTING, timedelta(hours=1))
+        self.task_state = "STARTED"
+
+        self.assertEqual(ProcessingWatchdog.reap_queued()["ingest"], [])
+
+    def test_lost_task_is_resent_under_a_new_id(self):
+        """Should resend a task the broker lost and count it as a resend."""
+        self.make_queued(VideoAnalysis.Status.PENDING, timedelta(hours=1))
+
+        reaped = ProcessingWatchdog.reap_queued()
+
+        self.assertEqual(reaped["process"], [self.analysis.id])
+        self.analysis.refresh_from_db()
+        self.assertEqual(self.analysis.status, VideoAnalysis.Status.PENDING)
+        self.assertEqual(self.analysis.requeue_count, 1)
+        self.assertEqual(self.analysis.processing_attempts, 0)
+        self.assertNotEqual(self.analysis.task_id, self.TASK_ID)
+        self.process.assert_called_once_with(
+            (self.analysis.id,), task_id=self.analysis.task_id
+        )
+        self.assertLess(
+            timezone.now() - self.analysis.heartbeat_at, timedelta(seconds=5)
+        )
+        # The fresh stamp keeps the next sweep from looking at it again.
+        self.assertEqual(ProcessingWatchdog.reap_queued()["process"], [])
+
+    def test_finished_task_with_waiting_analysis_is_resent(self):
+        """Should resend ingest when its task ended without moving the analysis on."""
+        self.make_queued(VideoAnalysis.Status.INGESTING, timedelta(hours=1))
+        self.broker_ids = None
+        self.task_state = "FAILURE"
+
+        reaped = ProcessingWatchdog.reap_queued()
+
+        self.assertEqual(reaped["ingest"], [self.analysis.id])
+        self.ingest.assert_called_once()
+        self.process.assert_not_called()
+
+    def test_never_dispatched_row_falls_back_to_created_at(self):
+        """Should resend an analysis with no recorded task once it is old."""
+        VideoAnalysis.objects.filter(id=self.analysis.id).update(
+            created_at=timezone.now() - timedelta(hours=2), heartbeat_at=None
+        )
+
+        reaped = ProcessingWatchdog.reap_queued()
+
+        self.assertEqual(reaped["process"], [self.analysis.id])
+
+    @patch("videoprocessor.services.processing_watchdog.ANALYSIS_MAX_TASK_RESENDS", 3)
+    def test_lost_task_fails_after_max_resends(self):
+        """Should fail an analysis whose task keeps getting lost."""
+        self.make_queued(VideoAnalysis.Status.PENDING, timedelta(hours=1), resends=3)
+
+        reaped = ProcessingWatchdog.reap_queued()
+
+        self.assertEqual(reaped["failed"], [self.analysis.id])
+        self.analysis.refresh_from_db()
+        self.assertEqual(self.analysis.status, VideoAnalysis.Status.FAILED)
+        self.assertIn("lost", self.analysis.error_message)
+
+    def test_reaper_task_resends_lost_ingest(self):
+        """Should send the ingest task again from the periodic reaper."""
+        self.make_queued(VideoAnalysis.Status.INGESTING, timedelta(hours=1))
+
+        reap_stuck_analyses()
+
+        self.ingest.assert_called_once_with((self.analysis.id,), task_id=ANY)
+        self.process.assert_not_called()
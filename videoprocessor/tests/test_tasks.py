@@ -1,10 +1,18 @@
-from unittest.mock import patch
+import hashlib
+import os
+from unittest.mock import ANY, patch
+from django.conf import settings
 from django.test import TestCase
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
 from django.core.files.uploadedfile import SimpleUploadedFile
 from accounts.models import User
 from analysis.models import VideoAnalysis, Substance
-from videoprocessor.tasks import process_video_task
+from videoprocessor.tasks import ingest_video_task, process_video_task
+from videoprocessor.errors import VideoAnalysisNotFoundError
+from videoprocessor.services.video_dedup_service import VideoDedupService
 from videoprocessor.services.video_processing_service import VideoProcessingService
+from larvixon_site.celery import app as celery_app
 from tests.common import TestFixtures, cleanup_test_media
 
 
@@ -157,9 +165,13 @@ class TestProcessVideoTask(TestCase):
         self.assertIsNotNone(self.analysis.error_message)
         self.assertIn("ML service error", self.analysis.error_message)
 
+    @patch(
+        "videoprocessor.services.video_processing_service.VideoProcessingService.get_local_path",
+        return_value=None,
+    )
     @patch("videoprocessor.services.video_processing_service.ml_service")
     @patch("videoprocessor.services.video_processing_service.os.remove")
-    def test_task_cleans_up_temp_file(self, mock_remove, mock_ml_service):
+    def test_task_cleans_up_temp_file(self, mock_remove, mock_ml_service, _):
         """Should clean up temporary file after processing."""
         mock_ml_service.predict_video.return_value = {"cocaine": 90.0}
 
@@ -168,9 +180,13 @@ class TestProcessVideoTask(TestCase):
         # Verify temp file cleanup was called
         mock_remove.assert_called()
 
+    @patch(
+        "videoprocessor.services.video_processing_service.VideoProcessingService.get_local_path",
+        return_value=None,
+    )
     @patch("videoprocessor.services.video_processing_service.ml_service")
     @patch("videoprocessor.services.video_processing_service.os.remove")
-    def test_task_cleans_up_temp_file_on_error(self, mock_remove, mock_ml_service):
+    def test_task_cleans_up_temp_file_on_error(self, mock_remove, mock_ml_service, _):
         """Should clean up temp file even when processing fails."""
         mock_ml_service.predict_video.side_effect = Exception("Error")
 
@@ -193,3 +209,262 @@ class TestProcessVideoTask(TestCase):
         self.analysis.refresh_from_db()
         self.assertIsNone(self.analysis.error_message)
         self.assertEqual(self.analysis.status, VideoAnalysis.Status.COMPLETED)
+
+    @patch("videoprocessor.services.video_processing_service.NamedTemporaryFile")
+    @patch("videoprocessor.services.video_processing_service.ml_service")
+    def test_task_uses_storage_path_without_copy(self, mock_ml_service, mock_temp):
+        """Should hand FileSystemStorage paths to the ML service as they are."""
+        mock_ml_service.predict_video.return_value = {"cocaine": 90.0}
+
+        process_video_task(self.analysis.id)
+
+        mock_ml_service.predict_video.assert_called_once_with(
+            default_storage.path(self.analysis.video.name), video_sha256=None
+        )
+        mock_temp.assert_not_called()
+        self.assertTrue(default_storage.exists(self.analysis.video.name))
+
+    @patch(
+        "videoprocessor.services.video_processing_service.VideoProcessingService.get_local_path",
+        return_value=None,
+    )
+    @patch("videoprocessor.services.video_processing_service.ml_service")
+    def test_task_streams_remote_video_to_temp_file(self, mock_ml_service, _):
+        """Should copy remote videos to a temp file that is removed afterwards."""
+        received = {}
+
+        def predict(video_path, video_sha256=None):
+            with open(video_path, "rb") as f:
+                received["content"] = f.read()
+            received["path"] = video_path
+            return {"cocaine": 90.0}
+
+        mock_ml_service.predict_video.side_effect = predict
+
+        process_video_task(self.analysis.id)
+
+        self.assertEqual(received["content"], VIDEO_CONTENT)
+        self.assertFalse(os.path.exists(received["path"]))
+
+    @patch("videoprocessor.services.video_processing_service.ml_service")
+    def test_task_reports_peak_memory(self, mock_ml_service):
+        """Should log the worker's peak memory after each task."""
+        mock_ml_service.predict_video.return_value = {"cocaine": 90.0}
+
+        with self.assertLogs("videoprocessor.services.memory_usage", "INFO") as logs:
+            process_video_task(self.analysis.id)
+
+        self.assertIn(f"process_video_task[{self.analysis.id}]", logs.output[0])
+        self.assertIn("peak RSS", logs.output[0])
+
+
+class TestIngestVideoTask(TestCase):
+    """Test the ingest_video_task Celery task."""
+
+    @classmethod
+    def tearDownClass(cls):
+        cleanup_test_media()
+        super().tearDownClass()
+
+    def setUp(self):
+        user_data = TestFixtures.get_test_user_data()
+        self.user = User.objects.create_user(
+            username=user_data["username"],
+            email=user_data["email"],
+            password=TEST_PASSWORD,
+        )
+
+        video_file = SimpleUploadedFile(
+            "test_video.mp4", VIDEO_CONTENT, content_type="video/mp4"
+        )
+        self.analysis = VideoAnalysis.objects.create(
+            user=self.user,
+            description="Test analysis",
+            status=VideoAnalysis.Status.INGESTING,
+        )
+        self.analysis.video.save("test_video.mp4", video_file, save=True)
+
+    def tearDown(self):
+        VideoAnalysis.objects.all().delete()
+        User.objects.all().delete()
+
+    @patch("videoprocessor.tasks.process_video_task.apply_async")
+    @patch(
+        "videoprocessor.services.video_file_manager.VideoFileManager.read_video_metadata"
+    )
+    @patch(
+        "videoprocessor.services.video_file_manager.VideoFileManager.extract_and_save_first_frame"
+    )
+    def test_ingest_saves_thumbnail_and_chains_processing(
+        self, mock_extract, mock_metadata, mock_delay
+    ):
+        """Should store the thumbnail and metadata, then queue processing."""
+        mock_extract.return_value = ("test_thumb.jpg", ContentFile(b"fake thumbnail"))
+        mock_metadata.return_value = {"fps": 30.0, "frame_count": 90}
+
+        ingest_video_task(self.analysis.id)
+
+        self.analysis.refresh_from_db()
+        self.assertEqual(self.analysis.status, VideoAnalysis.Status.PENDING)
+        self.assertTrue(self.analysis.thumbnail)
+        self.assertEqual(self.analysis.video_metadata["frame_count"], 90)
+        mock_delay.assert_called_once_with((self.analysis.id,), task_id=ANY)
+
+    @patch("videoprocessor.tasks.process_video_task.apply_async")
+    @patch(
+        "videoprocessor.services.video_file_manager.VideoFileManager.extract_and_save_first_frame"
+    )
+    def test_ingest_failure_marks_failed_without_processing(
+        self, mock_extract, mock_delay
+    ):
+        """Should mark the analysis FAILED and never reach the ML stage."""
+        mock_extract.side_effect = IOError("Could not read first frame from video.")
+
+        ingest_video_task(self.analysis.id)
+
+        self.analysis.refresh_from_db()
+        self.assertEqual(self.analysis.status, VideoAnalysis.Status.FAILED)
+        self.assertIn("Ingest failed", self.analysis.error_message)
+        mock_delay.assert_not_called()
+
+    @patch("videoprocessor.tasks.process_video_task.apply_async")
+    def test_ingest_skips_analysis_that_is_not_ingesting(self, mock_delay):
+        """Should leave an already ingested analysis untouched."""
+        self.analysis.status = VideoAnalysis.Status.COMPLETED
+        self.analysis.save()
+
+        ingest_video_task(self.analysis.id)
+
+        self.analysis.refresh_from_db()
+        self.assertEqual(self.analysis.status, VideoAnalysis.Status.COMPLETED)
+        mock_delay.assert_not_called()
+
+    @patch("videoprocessor.tasks.process_video_task.apply_async")
+    @patch(
+        "videoprocessor.services.video_file_manager.VideoFileManager.extract_and_save_first_frame"
+    )
+    def test_ingest_of_known_content_reuses_earlier_analysis(
+        self, mock_extract, mock_delay
+    ):
+        """Should drop the new copy and copy results of the earlier analysis."""
+        earlier = VideoAnalysis.objects.create(
+            user=self.user,
+            status=VideoAnalysis.Status.COMPLETED,
+            video_sha256=hashlib.sha256(VIDEO_CONTENT).hexdigest(),
+        )
+        earlier.video.save(
+            "earlier.mp4", SimpleUploadedFile("earlier.mp4", VIDEO_CONTENT)
+        )
+        earlier.thumbnail.save("earlier_thumb.jpg", ContentFile(b"thumbnail"))
+        substance = Substance.objects.create(name_en="dedup_substance")
+        earlier.analysis_results.create(substance=substance, confidence_score=77.0)
+        uploaded_name = self.analysis.video.name
+
+        ingest_video_task(self.analysis.id)
+
+        self.analysis.refresh_from_db()
+        self.assertEqual(self.analysis.status, VideoAnalysis.Status.COMPLETED)
+        self.assertEqual(self.analysis.video.name, earlier.video.name)
+        self.assertEqual(self.analysis.analysis_results.get().confidence_score, 77.0)
+        self.assertFalse(default_storage.exists(uploaded_name))
+        mock_extract.assert_not_called()
+        mock_delay.assert_not_called()
+
+    def test_reuse_does_not_overwrite_a_failed_analysis(self):
+        """Should leave an analysis that was failed meanwhile untouched."""
+        earlier = VideoAnalysis.objects.create(
+            user=self.user, status=VideoAnalysis.Status.COMPLETED
+        )
+        earlier.video.save("earlier.mp4", ContentFile(VIDEO_CONTENT))
+        earlier.thumbnail.save("earlier_thumb.jpg", ContentFile(b"thumbnail"))
+        substance = Substance.objects.create(name_en="failed_dedup")
+        earlier.analysis_results.create(substance=substance, confidence_score=40.0)
+        VideoAnalysis.objects.filter(id=self.analysis.id).transition(
+            VideoAnalysis.Status.INGESTING,
+            VideoAnalysis.Status.FAILED,
+            error_message="Reaped",
+        )
+
+        reused = VideoDedupService.reuse_duplicate(self.analysis, earlier)
+
+        self.assertFalse(reused)
+        self.analysis.refresh_from_db()
+        self.assertEqual(self.analysis.status, VideoAnalysis.Status.FAILED)
+        self.assertNotEqual(self.analysis.video.name, earlier.video.name)
+        self.assertFalse(self.analysis.analysis_results.exists())
+
+
+class TestSaveAnalysisResults(TestCase):
+    """Pin the number of queries used to persist predictions."""
+
+    def setUp(self):
+        user_data = TestFixtures.get_test_user_data()
+        self.user = User.objects.create_user(
+            username=user_data["username"],
+            email=user_data["email"],
+            password=TEST_PASSWORD,
+        )
+
+    def _predictions(self, count, prefix="label"):
+        return {f"{prefix}_{i}": float(i) for i in range(count)}
+
+    def _analysis(self):
+        return VideoAnalysis.objects.create(user=self.user, description="queries")
+
+    def test_query_count_does_not_grow_with_label_set(self):
+        for label_count in (3, 30):
+            with self.subTest(label_count=label_count):
+                analysis = self._analysis()
+                predictions = self._predictions(label_count, f"new{label_count}")
+
+                # exists, select substances, insert missing, reselect, insert results,
+                # top prediction update, plus the savepoint pair of the transaction
+                with self.assertNumQueries(8):
+                    VideoProcessingService.save_analysis_results(analysis, predictions)
+
+                self.assertEqual(analysis.analysis_results.count(), label_count)
+
+    def test_known_substances_skip_the_insert(self):
+        predictions = self._predictions(50)
+        VideoProcessingService.save_analysis_results(self._analysis(), predictions)
+        analysis = self._analysis()
+
+        with self.assertNumQueries(6):
+            VideoProcessingService.save_analysis_results(analysis, predictions)
+
+        self.assertEqual(
+            Substance.objects.filter(name_en__startswith="label_").count(), 50
+        )
+        self.assertEqual(analysis.analysis_results.count(), 50)
+
+    def test_deleted_analysis_raises(self):
+        analysis = self._analysis()
+        VideoAnalysis.objects.filter(id=analysis.id).delete()
+
+        with self.assertRaises(VideoAnalysisNotFoundError):
+            VideoProcessingService.save_analysis_results(analysis, {"cocaine": 1.0})
+
+
+class TestTaskRouting(TestCase):
+    """Test that each pipeline stage is routed to its own Celery queue."""
+
+    def route(self, task_name):
+        return celery_app.amqp.router.route({}, task_name)["queue"].name
+
+    def test_ingest_task_uses_ingest_queue(self):
+        self.assertEqual(self.route(ingest_video_task.name), "ingest")
+
+    def test_process_task_uses_inference_queue(self):
+        self.assertEqual(self.route(process_video_task.name), "inference")
+
+    def test_unrouted_task_uses_maintenance_queue(self):
+        self.assertEqual(self.route("analysis.tasks.some_cleanup"), "maintenance")
+
+    def test_process_task_has_time_limits(self):
+        self.assertEqual(
+            process_video_task.soft_time_limit,
+            settings.CELERY_INFERENCE_SOFT_TIME_LIMIT,
+        )
+        self.assertEqual(
+            process_video_task.time_limit, settings.CELERY_INFERENCE_TIME_LIMIT
+        )
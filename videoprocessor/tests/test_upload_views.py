@@ -1,6 +1,9 @@
-from unittest.mock import patch, MagicMock
+import hashlib
+from unittest.mock import ANY, MagicMock, patch
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.core.files.base import ContentFile
+from django.core.cache import cache
+from django.core.files.storage import FileSystemStorage, default_storage
 from django.urls import reverse
 from django.test import override_settings
 from rest_framework.test import APIRequestFactory, force_authenticate, APITestCase
@@ -26,6 +29,8 @@ class TestVideoUploadView(APITestCase):
         super().tearDownClass()
 
     def setUp(self):
+        # Identical test videos must not be answered from the prediction cache.
+        cache.clear()
         self.factory = APIRequestFactory()
         user_data = TestFixtures.get_test_user_data()
         self.user = User.objects.create_user(
@@ -47,7 +52,7 @@ class TestVideoUploadView(APITestCase):
     @patch(
         "videoprocessor.services.video_file_manager.VideoFileManager.extract_and_save_first_frame"
     )
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_upload_with_default_video_manager(self, mock_requests_post, mock_extract):
         """Should work with default VideoFileManager and make request to ML endpoint."""
         mock_extract.return_value = ("test_thumb.jpg", ContentFile(b"fake thumbnail"))
@@ -80,7 +85,7 @@ class TestVideoUploadView(APITestCase):
     @patch(
         "videoprocessor.services.video_file_manager.VideoFileManager.extract_and_save_first_frame"
     )
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_upload_with_injected_video_manager(self, mock_requests_post, mock_extract):
         """Should accept injected VideoFileManager and process with real ML service."""
         mock_extract.return_value = (
@@ -152,7 +157,7 @@ class TestVideoUploadView(APITestCase):
     @patch(
         "videoprocessor.services.video_upload_service.patient_service.get_patient_by_guid"
     )
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_upload_with_valid_patient_guid(
         self, mock_requests_post, mock_get_patient, mock_extract
     ):
@@ -262,7 +267,7 @@ class TestVideoUploadView(APITestCase):
     @patch(
         "videoprocessor.services.video_file_manager.VideoFileManager.extract_and_save_first_frame"
     )
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_upload_triggers_background_task(self, mock_requests_post, mock_extract):
         """Should process video with ML service after successful upload."""
         mock_extract.return_value = ("test_thumb.jpg", ContentFile(b"fake thumbnail"))
@@ -299,8 +304,11 @@ class TestVideoUploadView(APITestCase):
     @patch(
         "videoprocessor.services.video_file_manager.VideoFileManager.extract_and_save_first_frame"
     )
-    @patch("requests.post")
-    def test_upload_handles_ml_service_error(self, mock_requests_post, mock_extract):
+    @patch("videoprocessor.services.api_ml_service.time.sleep")
+    @patch("requests.Session.post")
+    def test_upload_handles_ml_service_error(
+        self, mock_requests_post, mock_sleep, mock_extract
+    ):
         """Should mark analysis as FAILED when ML service returns error."""
         mock_extract.return_value = ("test_thumb.jpg", ContentFile(b"fake thumbnail"))
 
@@ -332,7 +340,7 @@ class TestVideoUploadView(APITestCase):
     @patch(
         "videoprocessor.services.video_file_manager.VideoFileManager.extract_and_save_first_frame"
     )
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_upload_handles_ml_service_request_exception(
         self, mock_requests_post, mock_extract
     ):
@@ -359,3 +367,137 @@ class TestVideoUploadView(APITestCase):
         analysis = VideoAnalysis.objects.get(id=analysis_id)
         self.assertEqual(analysis.status, VideoAnalysis.Status.FAILED)
         self.assertIsNotNone(analysis.error_message)
+
+    @patch("videoprocessor.tasks.ingest_video_task.apply_async")
+    @patch(
+        "videoprocessor.services.video_file_manager.VideoFileManager.extract_and_save_first_frame"
+    )
+    def test_upload_returns_before_ingest(self, mock_extract, mock_delay):
+        """Should store the raw video and leave thumbnail work to the ingest task."""
+        video_file = self._create_video_file()
+
+        request = self.factory.post(
+            reverse("videoprocessor:video-upload"),
+            {"description": "test", "video": video_file},
+            format="multipart",
+        )
+        force_authenticate(request, user=self.user)
+
+        response = VideoUploadView.as_view()(request)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["status"], VideoAnalysis.Status.INGESTING)
+        analysis = VideoAnalysis.objects.get(id=response.data["analysis_id"])
+        self.assertTrue(analysis.video.name.endswith(VIDEO_FILENAME))
+        self.assertFalse(analysis.thumbnail)
+        self.assertEqual(
+            analysis.video_sha256, hashlib.sha256(VIDEO_CONTENT).hexdigest()
+        )
+        mock_extract.assert_not_called()
+        mock_delay.assert_called_once_with((analysis.id,), task_id=ANY)
+
+    def _upload(self, description="test"):
+        request = self.factory.post(
+            reverse("videoprocessor:video-upload"),
+            {"description": description, "video": self._create_video_file()},
+            format="multipart",
+        )
+        force_authenticate(request, user=self.user)
+        response = VideoUploadView.as_view()(request)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return VideoAnalysis.objects.get(id=response.data["analysis_id"])
+
+    def _mock_ml_response(self, mock_requests_post):
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {
+            "predictions": {"cocaine": 85.5, "morphine": 10.2}
+        }
+        mock_requests_post.return_value = mock_response
+
+    @override_settings(CELERY_TASK_ALWAYS_EAGER=True)
+    @patch(
+        "videoprocessor.services.video_file_manager.VideoFileManager.extract_and_save_first_frame"
+    )
+    @patch("requests.Session.post")
+    def test_reupload_reuses_video_and_results(self, mock_requests_post, mock_extract):
+        """Should share the stored video and copy results for identical content."""
+        mock_extract.return_value = ("test_thumb.jpg", ContentFile(b"fake thumbnail"))
+        self._mock_ml_response(mock_requests_post)
+
+        first = self._upload("first")
+        second = self._upload("second")
+
+        self.assertEqual(first.video_sha256, second.video_sha256)
+        self.assertEqual(first.video.name, second.video.name)
+        self.assertEqual(first.thumbnail.name, second.thumbnail.name)
+        self.assertEqual(second.status, VideoAnalysis.Status.COMPLETED)
+        self.assertEqual(second.analysis_results.count(), 2)
+        mock_requests_post.assert_called_once()
+        mock_extract.assert_called_once()
+
+    @override_settings(CELERY_TASK_ALWAYS_EAGER=True)
+    @patch(
+        "videoprocessor.services.video_file_manager.VideoFileManager.extract_and_save_first_frame"
+    )
+    @patch("requests.Session.post")
+    def test_reupload_is_not_written_to_storage(self, mock_requests_post, mock_extract):
+        """Should find the duplicate from the streamed hash before saving."""
+        mock_extract.return_value = ("test_thumb.jpg", ContentFile(b"fake thumbnail"))
+        self._mock_ml_response(mock_requests_post)
+        first = self._upload("first")
+
+        with (
+            patch.object(FileSystemStorage, "save") as mock_save,
+            patch("videoprocessor.tasks.ingest_video_task.apply_async") as mock_ingest,
+        ):
+            second = self._upload("second")
+
+        self.assertEqual(second.video.name, first.video.name)
+        self.assertEqual(second.status, VideoAnalysis.Status.COMPLETED)
+        mock_save.assert_not_called()
+        mock_ingest.assert_not_called()
+
+    @override_settings(CELERY_TASK_ALWAYS_EAGER=True)
+    @patch("videoprocessor.services.video_dedup_service.DEDUP_REUSE_RESULTS", False)
+    @patch(
+        "videoprocessor.services.video_file_manager.VideoFileManager.extract_and_save_first_frame"
+    )
+    @patch("requests.Session.post")
+    def test_reupload_without_result_reuse_runs_processing(
+        self, mock_requests_post, mock_extract
+    ):
+        """Should share the video but process it again when reuse is off."""
+        mock_extract.return_value = ("test_thumb.jpg", ContentFile(b"fake thumbnail"))
+        self._mock_ml_response(mock_requests_post)
+
+        first = self._upload("first")
+        second = self._upload("second")
+
+        self.assertEqual(first.video.name, second.video.name)
+        second.refresh_from_db()
+        self.assertEqual(second.status, VideoAnalysis.Status.COMPLETED)
+        self.assertEqual(second.analysis_results.count(), 2)
+        # The prediction cache answers for the identical content.
+        mock_requests_post.assert_called_once()
+
+    @override_settings(CELERY_TASK_ALWAYS_EAGER=True)
+    @patch(
+        "videoprocessor.services.video_file_manager.VideoFileManager.extract_and_save_first_frame"
+    )
+    @patch("requests.Session.post")
+    def test_deleting_duplicate_keeps_shared_video(
+        self, mock_requests_post, mock_extract
+    ):
+        """Should only delete a shared video with the last analysis using it."""
+        mock_extract.return_value = ("test_thumb.jpg", ContentFile(b"fake thumbnail"))
+        self._mock_ml_response(mock_requests_post)
+        first = self._upload("first")
+        second = self._upload("second")
+        video_name = first.video.name
+
+        first.delete()
+        self.assertTrue(default_storage.exists(video_name))
+
+        second.delete()
+        self.assertFalse(default_storage.exists(video_name))
@@ -1,8 +1,17 @@
+import io
+import os
+import struct
+import tempfile
 from unittest.mock import MagicMock, patch
+
+import cv2
+import numpy as np
 from django.test import TestCase
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.core.files.storage import default_storage
 from videoprocessor.services import VideoFileManager
+from videoprocessor.services.mp4_index import first_keyframe_read_limit
+from videoprocessor.services.video_file_manager import BoundedStreamReader
 
 
 class TestVideoFileManager(TestCase):
@@ -134,3 +143,115 @@ class TestVideoFileManager(TestCase):
 
         # Verify temp file cleanup was attempted
         mock_unlink.assert_called()
+
+
+def _write_test_mp4(path, frames=60, size=(320, 240)):
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), 10, size)
+    rng = np.random.default_rng(0)
+    for _ in range(frames):
+        writer.write(rng.integers(0, 255, (size[1], size[0], 3), dtype=np.uint8))
+    writer.release()
+
+
+def _patch_chunk_offsets(data: bytearray, start: int, end: int, shift: int) -> None:
+    offset = start
+    while offset < end:
+        size, box_type = struct.unpack_from(">I4s", data, offset)
+        if box_type in (b"moov", b"trak", b"mdia", b"minf", b"stbl"):
+            _patch_chunk_offsets(data, offset + 8, offset + size, shift)
+        elif box_type == b"stco":
+            count = struct.unpack_from(">I", data, offset + 12)[0]
+            for i in range(count):
+                pos = offset + 16 + 4 * i
+                value = struct.unpack_from(">I", data, pos)[0]
+                struct.pack_into(">I", data, pos, value + shift)
+        offset += size
+
+
+def _move_moov_to_front(data: bytes) -> bytes:
+    """Rewrite an MP4 so the moov atom precedes mdat (like ``-movflags faststart``)."""
+    boxes = []
+    offset = 0
+    while offset < len(data):
+        size, box_type = struct.unpack_from(">I4s", data, offset)
+        boxes.append((box_type, data[offset : offset + size]))
+        offset += size
+
+    moov = bytearray(next(box for box_type, box in boxes if box_type == b"moov"))
+    _patch_chunk_offsets(moov, 0, len(moov), len(moov))
+
+    head = [box for box_type, box in boxes if box_type == b"ftyp"]
+    rest = [box for box_type, box in boxes if box_type not in (b"ftyp", b"moov")]
+    return b"".join(head + [bytes(moov)] + rest)
+
+
+class TestBoundedFirstFrameExtraction(TestCase):
+    """Extract thumbnails from real MP4 files without mocking OpenCV."""
+
+    def setUp(self):
+        with tempfile.NamedTemporaryFile(suffix=".mp4", delete=False) as temp_f:
+            self.video_path = temp_f.name
+        _write_test_mp4(self.video_path)
+        with open(self.video_path, "rb") as video:
+            self.moov_at_end = video.read()
+        self.faststart = _move_moov_to_front(self.moov_at_end)
+
+    def tearDown(self):
+        os.unlink(self.video_path)
+
+    def test_read_limit_is_none_when_index_at_end(self):
+        self.assertIsNone(first_keyframe_read_limit(io.BytesIO(self.moov_at_end)))
+
+    def test_read_limit_stops_after_first_keyframe(self):
+        limit = first_keyframe_read_limit(io.BytesIO(self.faststart))
+
+        self.assertIsNotNone(limit)
+        self.assertLess(limit, len(self.faststart) // 4)
+
+    def test_read_limit_is_none_for_non_mp4(self):
+        self.assertIsNone(first_keyframe_read_limit(io.BytesIO(b"not a video")))
+
+    @patch("videoprocessor.services.video_file_manager.tempfile.NamedTemporaryFile")
+    def test_faststart_video_is_not_copied(self, mock_temp_file):
+        video_file = SimpleUploadedFile(
+            "fast.mp4", self.faststart, content_type="video/mp4"
+        )
+
+        with patch(
+            "videoprocessor.services.video_file_manager.BoundedStreamReader",
+            wraps=BoundedStreamReader,
+        ) as reader_class:
+            thumbnail_name, content_file = (
+                VideoFileManager.extract_and_save_first_frame(video_file)
+            )
+
+        self.assertEqual(thumbnail_name, "fast_thumb.jpg")
+        self.assertTrue(content_file.read().startswith(b"\xff\xd8"))
+        mock_temp_file.assert_not_called()
+        reader_class.assert_called_once()
+
+    def test_index_at_end_falls_back_to_full_copy(self):
+        video_file = SimpleUploadedFile(
+            "slow.mp4", self.moov_at_end, content_type="video/mp4"
+        )
+
+        with patch(
+            "videoprocessor.services.video_file_manager.tempfile.NamedTemporaryFile",
+            wraps=tempfile.NamedTemporaryFile,
+        ) as mock_temp_file:
+            thumbnail_name, content_file = (
+                VideoFileManager.extract_and_save_first_frame(video_file)
+            )
+
+        self.assertEqual(thumbnail_name, "slow_thumb.jpg")
+        self.assertTrue(content_file.read().startswith(b"\xff\xd8"))
+        mock_temp_file.assert_called_once()
+
+    def test_bounded_reader_reports_eof_past_limit(self):
+        reader = BoundedStreamReader(io.BytesIO(b"0123456789"), 4)
+
+        self.assertEqual(reader.read(), b"0123")
+        self.assertEqual(reader.read(), b"")
+        reader.seek(2)
+        self.assertEqual(reader.read(10), b"23")
+        self.assertEqual(reader.bytes_read, 6)
@@ -1,9 +1,47 @@
 from django.urls import path
 from django.urls.resolvers import URLPattern
-from .views import VideoUploadView
+from .views import (
+    VideoUploadView,
+    UploadSessionCreateView,
+    UploadSessionDetailView,
+    UploadSessionCompleteView,
+    DirectUploadCreateView,
+    DirectUploadCompleteView,
+    DirectUploadBlobView,
+)
 
 app_name = "videoprocessor"
 
 urlpatterns: list[URLPattern] = [
     path("upload/", VideoUploadView.as_view(), name="video-upload"),
+    path(
+        "upload/sessions/",
+        UploadSessionCreateView.as_view(),
+        name="upload-session-create",
+    ),
+    path(
+        "upload/sessions/<uuid:upload_id>/",
+        UploadSessionDetailView.as_view(),
+        name="upload-session-detail",
+    ),
+    path(
+        "upload/sessions/<uuid:upload_id>/complete/",
+        UploadSessionCompleteView.as_view(),
+        name="upload-session-complete",
+    ),
+    path(
+        "upload/direct/",
+        DirectUploadCreateView.as_view(),
+        name="direct-upload-create",
+    ),
+    path(
+        "upload/direct/<int:analysis_id>/complete/",
+        DirectUploadCompleteView.as_view(),
+        name="direct-upload-complete",
+    ),
+    path(
+        "upload/direct/blob/<str:token>/",
+        DirectUploadBlobView.as_view(),
+        name="direct-upload-blob",
+    ),
 ]
@@ -1 +1,11 @@
 from .upload import VideoUploadView
+from .chunked_upload import (
+    UploadSessionCreateView,
+    UploadSessionDetailView,
+    UploadSessionCompleteView,
+)
+from .direct_upload import (
+    DirectUploadCreateView,
+    DirectUploadCompleteView,
+    DirectUploadBlobView,
+)
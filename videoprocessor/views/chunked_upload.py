@@ -0,0 +1,143 @@
+import logging
+
+from rest_framework import status, permissions
+from rest_framework.parsers import JSONParser, FormParser, MultiPartParser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiResponse
+from drf_spectacular.types import OpenApiTypes
+
+from videoprocessor.serializers import (
+    UploadSessionCreateSerializer,
+    UploadSessionSerializer,
+)
+from videoprocessor.services import ChunkedUploadService
+from videoprocessor.views.upload_errors import upload_error_response
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+class UploadSessionCreateView(APIView):
+    parser_classes = (JSONParser, FormParser, MultiPartParser)
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = UploadSessionSerializer
+
+    @extend_schema(
+        summary="Start a resumable upload",
+        request=UploadSessionCreateSerializer,
+        responses={201: UploadSessionSerializer},
+    )
+    def post(self, request, *args, **kwargs):
+        serializer = UploadSessionCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        try:
+            session = ChunkedUploadService.create_session(
+                user=request.user,
+                filename=data["filename"],
+                total_size=data["size"],
+                description=data.get("description", ""),
+                patient_guid=data.get("patient_guid"),
+            )
+        except Exception as e:
+            return upload_error_response(e)
+
+        return Response(
+            UploadSessionSerializer(session).data, status=status.HTTP_201_CREATED
+        )
+
+
+class UploadSessionDetailView(APIView):
+    # Chunks are read straight from the request stream, never parsed.
+    parser_classes = ()
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = UploadSessionSerializer
+
+    @extend_schema(summary="Get resumable upload status")
+    def get(self, request, upload_id, *args, **kwargs):
+        try:
+            session = ChunkedUploadService.get_session(upload_id, request.user)
+        except Exception as e:
+            return upload_error_response(e)
+
+        return Response(UploadSessionSerializer(session).data)
+
+    @extend_schema(
+        summary="Upload a chunk",
+        description=(
+            "Send the raw chunk bytes as the request body with a "
+            "`Content-Range: bytes <start>-<end>/<total>` header. "
+            "The chunk must start at the session's current offset."
+        ),
+        request={"application/octet-stream": {"type": "string", "format": "binary"}},
+        parameters=[
+            OpenApiParameter(
+                name="Content-Range",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.HEADER,
+                required=True,
+            )
+        ],
+        responses={
+            200: UploadSessionSerializer,
+            409: OpenApiResponse(description="Chunk does not start at the offset"),
+        },
+    )
+    def put(self, request, upload_id, *args, **kwargs):
+        try:
+            content_length = int(request.META.get("CONTENT_LENGTH") or 0)
+        except ValueError:
+            content_length = 0
+
+        try:
+            session = ChunkedUploadService.get_session(upload_id, request.user)
+            session = ChunkedUploadService.write_chunk(
+                session,
+                content_range=request.headers.get("Content-Range"),
+                stream=request.stream,
+                content_length=content_length,
+            )
+        except Exception as e:
+            return upload_error_response(e)
+
+        return Response(UploadSessionSerializer(session).data)
+
+    @extend_schema(summary="Abort a resumable upload", responses={204: None})
+    def delete(self, request, upload_id, *args, **kwargs):
+        try:
+            session = ChunkedUploadService.get_session(upload_id, request.user)
+            ChunkedUploadService.abort(session)
+        except Exception as e:
+            return upload_error_response(e)
+
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class UploadSessionCompleteView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = UploadSessionSerializer
+
+    @extend_schema(
+        summary="Complete a resumable upload",
+        request=None,
+        responses={
+            201: OpenApiResponse(description="Video assembled and ingest queued"),
+            409: OpenApiResponse(description="Upload is incomplete or already closed"),
+        },
+    )
+    def post(self, request, upload_id, *args, **kwargs):
+        try:
+            session = ChunkedUploadService.get_session(upload_id, request.user)
+            analysis = ChunkedUploadService.complete(session)
+        except Exception as e:
+            return upload_error_response(e)
+
+        return Response(
+            {
+                "message": "Video uploaded, thumbnail and analysis queued.",
+                "analysis_id": analysis.id,
+                "status": analysis.status,
+            },
+            status=status.HTTP_201_CREATED,
+        )
@@ -0,0 +1,126 @@
+import logging
+
+from rest_framework import status, permissions
+from rest_framework.parsers import JSONParser, FormParser, MultiPartParser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from drf_spectacular.utils import extend_schema, OpenApiResponse
+
+from videoprocessor.serializers import (
+    DirectUploadSerializer,
+    UploadSessionCreateSerializer,
+)
+from videoprocessor.services import DirectUploadService
+from videoprocessor.errors import DirectUploadNotSupportedError
+from videoprocessor.services.signed_upload import (
+    LocalSignedUploadBackend,
+    get_signed_upload_backend,
+)
+from videoprocessor.views.upload_errors import upload_error_response
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+class DirectUploadCreateView(APIView):
+    parser_classes = (JSONParser, FormParser, MultiPartParser)
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = DirectUploadSerializer
+
+    @extend_schema(
+        summary="Request a signed URL for a direct-to-storage upload",
+        description=(
+            "Creates the analysis and returns a short-lived URL. Send the video "
+            "to it with the returned method and headers, then call the "
+            "completion endpoint."
+        ),
+        request=UploadSessionCreateSerializer,
+        responses={201: DirectUploadSerializer},
+    )
+    def post(self, request, *args, **kwargs):
+        serializer = UploadSessionCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        try:
+            analysis, signed_upload = DirectUploadService.create_upload(
+                user=request.user,
+                filename=data["filename"],
+                size=data["size"],
+                description=data.get("description", ""),
+                patient_guid=data.get("patient_guid"),
+            )
+        except Exception as e:
+            return upload_error_response(e)
+
+        response = DirectUploadSerializer(
+            {
+                "analysis_id": analysis.id,
+                "status": analysis.status,
+                "upload_url": request.build_absolute_uri(signed_upload.url),
+                "method": signed_upload.method,
+                "headers": signed_upload.headers,
+                "expires_at": signed_upload.expires_at,
+            }
+        )
+        return Response(response.data, status=status.HTTP_201_CREATED)
+
+
+class DirectUploadCompleteView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = DirectUploadSerializer
+
+    @extend_schema(
+        summary="Complete a direct-to-storage upload",
+        request=None,
+        responses={
+            201: OpenApiResponse(description="Video verified and ingest queued"),
+            404: OpenApiResponse(description="No direct upload pending"),
+            409: OpenApiResponse(description="Video is not in storage yet"),
+        },
+    )
+    def post(self, request, analysis_id, *args, **kwargs):
+        try:
+            analysis = DirectUploadService.complete(analysis_id, request.user)
+        except Exception as e:
+            return upload_error_response(e)
+
+        return Response(
+            {
+                "message": "Video uploaded, thumbnail and analysis queued.",
+                "analysis_id": analysis.id,
+                "status": analysis.status,
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+
+class DirectUploadBlobView(APIView):
+    """Local stand-in for a storage SAS endpoint; the signed token is the credential."""
+
+    # The body is the raw video and is streamed to disk, never parsed.
+    parser_classes = ()
+    authentication_classes = ()
+    permission_classes = [permissions.AllowAny]
+
+    @extend_schema(
+        summary="Write a video to local storage through a signed URL",
+        request={"application/octet-stream": {"type": "string", "format": "binary"}},
+        responses={201: None, 403: OpenApiResponse(description="Invalid upload URL")},
+    )
+    def put(self, request, token, *args, **kwargs):
+        try:
+            content_length = int(request.META.get("CONTENT_LENGTH") or 0)
+        except ValueError:
+            content_length = 0
+
+        try:
+            backend = get_signed_upload_backend()
+            if not isinstance(backend, LocalSignedUploadBackend):
+                raise DirectUploadNotSupportedError(
+                    "Uploads go straight to blob storage in this deployment"
+                )
+            backend.receive(token, request.stream, content_length)
+        except Exception as e:
+            return upload_error_response(e)
+
+        return Response(status=status.HTTP_201_CREATED)
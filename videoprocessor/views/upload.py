@@ -1,7 +1,7 @@
 import logging
 
 from rest_framework import status, permissions
-from rest_framework.parsers import MultiPartParser, FormParser
+from rest_framework.parsers import FormParser
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from drf_spectacular.utils import extend_schema
@@ -12,6 +12,7 @@ from patients.errors import (
     PatientServiceUnavailableError,
     PatientServiceResponseError,
 )
+from videoprocessor.parsers import HashingMultiPartParser
 from videoprocessor.serializers import VideoUploadSerializer
 from videoprocessor.services import VideoUploadService
 from videoprocessor.errors import VideoForUploadTooLargeError, VideoWrongFormatError
@@ -20,7 +21,7 @@ logger: logging.Logger = logging.getLogger(__name__)
 
 
 class VideoUploadView(APIView):
-    parser_classes = (MultiPartParser, FormParser)
+    parser_classes = (HashingMultiPartParser, FormParser)
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = VideoUploadSerializer
 
@@ -61,8 +62,9 @@ class VideoUploadView(APIView):
 
             return Response(
                 {
-                    "message": "Video processed and analysis started.",
+                    "message": "Video uploaded, thumbnail and analysis queued.",
                     "analysis_id": analysis.id,
+                    "status": analysis.status,
                 },
                 status=status.HTTP_201_CREATED,
             )
@@ -0,0 +1,103 @@
+import logging
+
+from rest_framework import status
+from rest_framework.response import Response
+
+from patients.errors import (
+    PatientInvalidUUIDError,
+    PatientNotFoundError,
+    PatientServiceUnavailableError,
+    PatientServiceResponseError,
+)
+from videoprocessor.services.chunk_store import ChunkReadError
+from videoprocessor.errors import (
+    ChunkedUploadNotSupportedError,
+    DirectUploadInvalidTokenError,
+    DirectUploadNotFoundError,
+    DirectUploadNotReceivedError,
+    DirectUploadNotSupportedError,
+    UploadChunkOffsetMismatchError,
+    UploadIncompleteError,
+    UploadInvalidContentRangeError,
+    UploadSessionClosedError,
+    UploadSessionNotFoundError,
+    VideoForUploadTooLargeError,
+    VideoNoFilenameError,
+    VideoWrongFormatError,
+)
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+def upload_error_response(error: Exception) -> Response:
+    """Map chunked and direct upload errors to API responses."""
+    if isinstance(error, UploadSessionNotFoundError):
+        return Response(
+            {"error": "Upload session not found."}, status=status.HTTP_404_NOT_FOUND
+        )
+    if isinstance(error, DirectUploadNotFoundError):
+        return Response({"error": str(error)}, status=status.HTTP_404_NOT_FOUND)
+    if isinstance(error, DirectUploadNotReceivedError):
+        return Response({"error": error.message}, status=status.HTTP_409_CONFLICT)
+    if isinstance(error, DirectUploadInvalidTokenError):
+        return Response({"error": error.message}, status=status.HTTP_403_FORBIDDEN)
+    if isinstance(error, UploadChunkOffsetMismatchError):
+        return Response(
+            {"error": str(error), "offset": error.expected_offset},
+            status=status.HTTP_409_CONFLICT,
+        )
+    if isinstance(error, UploadIncompleteError):
+        return Response(
+            {"error": str(error), "offset": error.received_bytes},
+            status=status.HTTP_409_CONFLICT,
+        )
+    if isinstance(error, UploadSessionClosedError):
+        return Response({"error": error.message}, status=status.HTTP_409_CONFLICT)
+    if isinstance(
+        error,
+        (
+            ChunkReadError,
+            UploadInvalidContentRangeError,
+            VideoNoFilenameError,
+            VideoWrongFormatError,
+        ),
+    ):
+        return Response({"error": str(error)}, status=status.HTTP_400_BAD_REQUEST)
+    if isinstance(error, VideoForUploadTooLargeError):
+        return Response(
+            {
+                "error": f"Video file is too large ({error.file_size} GB). Maximum allowed size is {error.max_size} GB."
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    if isinstance(error, PatientInvalidUUIDError):
+        return Response(
+            {"error": "Invalid Patient GUID format."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    if isinstance(error, PatientNotFoundError):
+        return Response({"error": str(error)}, status=status.HTTP_404_NOT_FOUND)
+    if isinstance(error, PatientServiceUnavailableError):
+        return Response(
+            {
+                "error": "Patient service is currently unavailable. Please try again later."
+            },
+            status=status.HTTP_503_SERVICE_UNAVAILABLE,
+        )
+    if isinstance(error, PatientServiceResponseError):
+        return Response(
+            {"error": f"Error processing patient data: {str(error)}"},
+            status=status.HTTP_502_BAD_GATEWAY,
+        )
+    if isinstance(
+        error, (ChunkedUploadNotSupportedError, DirectUploadNotSupportedError)
+    ):
+        return Response(
+            {"error": error.message}, status=status.HTTP_501_NOT_IMPLEMENTED
+        )
+
+    logger.error(f"Unexpected error during upload: {error}")
+    return Response(
+        {"error": "An unexpected error occurred. Please try again later."},
+        status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+    )